@@ -0,0 +1,302 @@
+import math
+import tkinter as tk
+import tkinter.font as tkfont
+from array import array
+from bisect import bisect_right
+from tkinter import ttk
+from modern_ui import ModernUI
+from quiz_engine import OPTION_LETTERS, answer_text, option_text
+from virtual_list import VirtualList
+
+HEADER_HEIGHT = 44  # 章节标题行的高度
+ROW_PADDING = 16  # 题目行上下内边距之和 (与行控件的 padding 一致)
+LINE_GAP = 2  # 题目行内各行之间的间距
+WRAP_MARGIN = 60  # 行宽减去左右内边距和滚动条后才是换行宽度
+SLOTS = 1 + len(OPTION_LETTERS)  # 每道题缓存的文字宽度个数 (题干和四个选项)
+ASCII_SAMPLE = "abcdefghijklmnopqrstuvwxyz ABCDEFGHIJKLMNOPQRSTUVWXYZ 0123456789.,()"
+
+
+class TextMeasure:
+    """按字符类别缓存的文字宽度估计
+
+    Font.measure 每次都是一次 Tcl 调用，逐条测量十万道题需要数秒。这里每种字体
+    只测量一次全角字符 (汉字、全角标点) 和半角字符的平均宽度，之后按 UTF-8
+    编码多出的字节数估算全角字符的个数 (ASCII 一个字节，汉字三个字节)，
+    计算都在 C 中完成。
+    """
+
+    def __init__(self, font):
+        self.wide = font.measure("汉字宽度") / 4
+        self.narrow = font.measure(ASCII_SAMPLE) / len(ASCII_SAMPLE)
+        self.linespace = font.metrics("linespace")
+
+    def width(self, text):
+        wide = min((len(text.encode("utf-8")) - len(text)) // 2, len(text))
+        return wide * self.wide + (len(text) - wide) * self.narrow
+
+
+class BankBrowser:
+    """题库浏览窗口：按章节列出全部题目、选项和答案 (虚拟化，只创建可见行)
+
+    每章一个标题行 (标题取自题目的 chapter 字段)，之后每题一行。打开时遍历一次
+    题库，缓存每道题题干和选项的估计宽度；行高由缓存的宽度和当前换行宽度算出，
+    窗口改变宽度时只需重算行高，不再测量文字。行号到 (章节, 题目) 的映射用每章
+    首行的行号二分查找，额外内存与章节数成正比。
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.question_font = tkfont.Font(family="微软雅黑", size=11)
+        self.option_font = tkfont.Font(family="微软雅黑", size=10)
+        self.question_measure = TextMeasure(self.question_font)
+        self.option_measure = TextMeasure(self.option_font)
+        self.wrap = 0  # 当前换行宽度 (像素)
+        self.resize_job = None
+
+        self.window = tk.Toplevel(app.root)
+        self.window.title("浏览题库")
+        self.window.geometry("760x640")
+        self.window.configure(bg=ModernUI.get_theme_color("bg"))
+        self.window.minsize(480, 360)
+
+        # --- 标题栏 ---
+        title_bar = ttk.Frame(self.window, style="Title.TFrame", padding="0 5")
+        title_bar.pack(fill=tk.X)
+        ttk.Label(
+            title_bar,
+            text="浏览题库",
+            style="Title.TLabel",
+            padding=8,
+        ).pack()
+
+        info_frame = ttk.Frame(self.window, style="TFrame", padding="15 10 15 5")
+        info_frame.pack(fill=tk.X)
+        self.bank_label = ttk.Label(
+            info_frame, style="TLabel", font=("微软雅黑", 11, "bold")
+        )
+        self.bank_label.pack(anchor=tk.W)
+
+        # --- 题目列表 (虚拟化，行高各不相同) ---
+        self.question_list = VirtualList(
+            self.window,
+            create_row=self._create_row,
+            bind_row=self._bind_row,
+        )
+        self.question_list.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        self.window.bind("<MouseWheel>", self._on_mousewheel)  # Windows/macOS
+        self.window.bind("<Button-4>", self._on_mousewheel)  # Linux 上滚
+        self.window.bind("<Button-5>", self._on_mousewheel)  # Linux 下滚
+        self.window.bind("<Prior>", lambda e: self.question_list.scroll_units(-10))
+        self.window.bind("<Next>", lambda e: self.question_list.scroll_units(10))
+        self.window.bind("<Escape>", lambda e: self.close())
+        self.question_list.canvas.bind("<Configure>", self._on_resize, add="+")
+        self.window.bind("<<ThemeChanged>>", self._on_theme_changed)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.reload()
+        self.window.focus_set()
+
+    # --- 数据 ---
+    def reload(self):
+        """遍历题库，重新缓存章节目录和文字宽度 (题库切换或重新加载时调用)"""
+        bank = self.app.question_bank
+        self.bank = bank
+        self.bank_label.configure(text=f"题库: {bank.title if bank else 'N/A'}")
+        self.starts = []  # 每章标题行的行号
+        self.titles = []
+        self.widths = array("f")  # 每题 SLOTS 个宽度，没有的选项为 0
+        chapters = bank.chapters if bank else []
+        total = sum(len(questions) for questions in chapters)
+
+        # 题号和题型前缀 (“123. 【单选题】”) 按最长题号估计，选项前缀为“A. ”
+        measure = self.question_measure
+        prefix = {}
+        number_width = (len(str(total)) + 2) * measure.narrow
+        option_prefix = 3 * self.option_measure.narrow
+        q_wide, q_narrow = measure.wide, measure.narrow
+        o_wide, o_narrow = self.option_measure.wide, self.option_measure.narrow
+        extend = self.widths.extend
+        row = 0
+        for chapter_index, questions in enumerate(chapters):
+            self.starts.append(row)
+            title = None
+            for question in questions:
+                if title is None:
+                    title = question.get("chapter")
+                q_type = question["type"]
+                if q_type not in prefix:
+                    prefix[q_type] = number_width + measure.width(f"【{q_type}】")
+                # 与 TextMeasure.width 相同的估计，展开以免十万次方法调用
+                text = question["question"]
+                n = len(text)
+                wide = (len(text.encode("utf-8")) - n) >> 1
+                slots = [prefix[q_type] + wide * q_wide + (n - wide) * q_narrow]
+                for option in question.get("options") or ():
+                    n = len(option)
+                    wide = (len(option.encode("utf-8")) - n) >> 1
+                    slots.append(option_prefix + wide * o_wide + (n - wide) * o_narrow)
+                slots.extend((0.0,) * (SLOTS - len(slots)))
+                extend(slots[:SLOTS])
+            self.titles.append(title or f"第{chapter_index + 1}章")
+            row += 1 + len(questions)
+        self.row_count = row
+        self.relayout()
+
+    def relayout(self):
+        """按当前换行宽度重算全部行高 (只用缓存的宽度，不测量文字)"""
+        top = self.question_list.index_at(self.question_list.canvas.canvasy(0))
+        width = max(self.question_list.canvas.winfo_width(), 200)
+        self.wrap = wrap = max(width - WRAP_MARGIN, 100)
+        q_line = self.question_measure.linespace + LINE_GAP
+        o_line = self.option_measure.linespace + LINE_GAP
+        ceil = math.ceil
+        widths = self.widths
+        heights = []
+        append = heights.append
+        ends = self.starts[1:] + [self.row_count]
+        slot = 0
+        for start, end in zip(self.starts, ends):
+            append(HEADER_HEIGHT)
+            stop = slot + (end - start - 1) * SLOTS
+            while slot < stop:
+                # 每段文字至少一行；最后一行为答案
+                height = ROW_PADDING + o_line
+                height += max(1, ceil(widths[slot] / wrap)) * q_line
+                for w in widths[slot + 1 : slot + SLOTS]:
+                    if w:
+                        height += max(1, ceil(w / wrap)) * o_line
+                append(height)
+                slot += SLOTS
+        self.question_list.set_count(self.row_count, heights)
+        if self.row_count:
+            self.question_list.scroll_to(min(top, self.row_count - 1))
+
+    def locate(self, row):
+        """行号对应的 (章节索引, 题目索引)，章节标题行的题目索引为 -1"""
+        chapter_index = bisect_right(self.starts, row) - 1
+        return chapter_index, row - self.starts[chapter_index] - 1
+
+    # --- 行控件 ---
+    def _create_row(self, parent):
+        """创建一个可复用的行控件 (章节标题行和题目行共用，按需显示其中一部分)"""
+        row = ttk.Frame(parent, style="Card.TFrame", padding="15 8")
+        row.columnconfigure(0, weight=1)
+        row.kind = None
+        row.wrap = 0
+        row.title = ttk.Label(row, style="StatsHeader.TLabel", anchor="w")
+        row.count = ttk.Label(row, style="StatsMuted.TLabel", anchor="e")
+        row.question = ttk.Label(
+            row, style="Option.TLabel", font=self.question_font, justify=tk.LEFT
+        )
+        row.options = [
+            ttk.Label(row, font=self.option_font, justify=tk.LEFT)
+            for _ in OPTION_LETTERS
+        ]
+        row.answer = ttk.Label(row, style="StatsCorrect.TLabel", font=self.option_font)
+        return row
+
+    def _show_kind(self, row, kind):
+        """切换行控件显示的部分 (标题行或题目行)"""
+        if row.kind == kind:
+            return
+        row.kind = kind
+        if kind == "header":
+            for widget in [row.question, row.answer] + row.options:
+                widget.grid_remove()
+            row.title.grid(row=0, column=0, sticky="w")
+            row.count.grid(row=0, column=1, sticky="e")
+        else:
+            row.title.grid_remove()
+            row.count.grid_remove()
+            row.question.grid(row=0, column=0, columnspan=2, sticky="w")
+            row.answer.grid(row=5, column=0, columnspan=2, sticky="w")
+
+    def _bind_row(self, row, index):
+        chapter_index, question_index = self.locate(index)
+        if question_index < 0:
+            self._show_kind(row, "header")
+            row.title.configure(text=self.titles[chapter_index])
+            size = len(self.bank.chapters[chapter_index])
+            row.count.configure(text=f"共 {size} 题")
+            return
+
+        self._show_kind(row, "question")
+        if row.wrap != self.wrap:
+            row.wrap = self.wrap
+            for label in [row.question] + row.options:
+                label.configure(wraplength=self.wrap)
+        question = self.bank.chapters[chapter_index][question_index]
+        number = index - chapter_index  # 全书连续编号
+        row.question.configure(
+            text=f"{number}. 【{question['type']}】{question['question']}"
+        )
+        options = question.get("options") or ()
+        answer = question.get("answer") or ""
+        for i, label in enumerate(row.options):
+            if i < len(options):
+                letter = OPTION_LETTERS[i]
+                label.configure(
+                    text=option_text(question, letter),
+                    # 正确选项高亮
+                    style=(
+                        "StatsCorrect.TLabel" if letter in answer else "Option.TLabel"
+                    ),
+                )
+                label.grid(row=1 + i, column=0, columnspan=2, sticky="w")
+            else:
+                label.grid_remove()
+        row.answer.configure(text=f"答案: {answer_text(question['type'], answer)}")
+
+    # --- 事件 ---
+    def _on_resize(self, event):
+        """窗口宽度变化后 (合并连续的调整) 重算行高"""
+        if abs(event.width - WRAP_MARGIN - self.wrap) < 1:
+            return
+        if self.resize_job is not None:
+            self.window.after_cancel(self.resize_job)
+        self.resize_job = self.window.after(100, self._apply_resize)
+
+    def _apply_resize(self):
+        self.resize_job = None
+        self.relayout()
+
+    def _on_mousewheel(self, event):
+        delta = 0
+        if event.num == 4:
+            delta = -1  # Linux 上滚
+        elif event.num == 5:
+            delta = 1  # Linux 下滚
+        elif event.delta > 0:
+            delta = -1  # Windows/macOS 上滚
+        elif event.delta < 0:
+            delta = 1  # Windows/macOS 下滚
+        if delta != 0:
+            self.question_list.scroll_units(delta)
+
+    def _on_theme_changed(self, event=None):
+        if event is not None and event.widget is not self.window:
+            return
+        self.window.configure(bg=ModernUI.get_theme_color("bg"))
+
+    # --- 窗口 ---
+    def exists(self):
+        """窗口是否仍然打开"""
+        try:
+            return bool(self.window.winfo_exists())
+        except tk.TclError:
+            return False
+
+    def show(self):
+        """把已打开的窗口提到最前"""
+        self.window.deiconify()
+        self.window.lift()
+        self.window.focus_set()
+
+    def close(self):
+        """关闭窗口并通知应用"""
+        if self.resize_job is not None:
+            self.window.after_cancel(self.resize_job)
+        if self.app.bank_browser is self:
+            self.app.bank_browser = None
+        self.window.destroy()
@@ -0,0 +1,452 @@
+"""题库格式转换：.txt 文本题库与 JSONL、SQLite 之间逐题流式读写
+
+格式按扩展名识别：.txt 文本题库、.jsonl 每行一道题、.sqlite/.sqlite3/.db SQLite 数据库。
+读取得到 (题库标题, 条目迭代器)，条目为 (章节序号, 题目)，题目与 parse_chapter 的输出
+结构相同。JSONL 与 SQLite 逐题读写，内存占用与题库大小无关；文本格式的题型按段落
+分组，读写时以章为单位缓冲。
+
+JSONL：可选的首行 {"title": 题库标题}，之后每行一道题
+    {"chapter": 章节标题, "type": 题型, "question": 题干, "options": [A, B, C, D], "answer": 答案}
+相邻且章节标题相同的题目属于同一章。
+
+用法: python bank_formats.py 输入文件 输出文件 (如 题库.txt 题库.sqlite)
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+
+from question_bank import QuestionBank
+from quiz_engine import QUESTION_TYPES
+
+EXTENSIONS = {
+    ".txt": "txt",
+    ".jsonl": "jsonl",
+    ".sqlite": "sqlite",
+    ".sqlite3": "sqlite",
+    ".db": "sqlite",
+}
+BATCH_SIZE = 5000  # SQLite 每批插入的题目数
+DEFAULT_CHAPTER = "未分章节"
+
+CHAPTER_LINE = re.compile(r"第[一二三四五六七八九十]+章")
+CHINESE_DIGITS = "十一二三四五六七八九"  # 超过99章时逐位书写 (0 写作十)
+SECTION_HEADERS = {
+    "判断题": "判断题",
+    "单选题": "单项选择题",
+    "多选题": "多项选择题",
+}
+SECTION_NUMBERS = "一二三"
+
+SQLITE_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE chapters (
+    chapter INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    hash BLOB NOT NULL
+);
+CREATE TABLE questions (
+    chapter INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    question TEXT NOT NULL,
+    options TEXT,
+    answer TEXT,
+    PRIMARY KEY (chapter, position)
+) WITHOUT ROWID;
+"""
+# 导入完成后再建索引，比逐行维护索引快
+SQLITE_INDEX = "CREATE INDEX questions_chapter_type ON questions (chapter, type)"
+
+
+def format_of(path):
+    """根据扩展名返回格式名称 (txt / jsonl / sqlite)，不支持时抛出 ValueError"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in EXTENSIONS:
+        raise ValueError(f"不支持的题库格式: {extension or path}")
+    return EXTENSIONS[extension]
+
+
+def is_structured(path):
+    """是否为无需正则解析的结构化格式 (JSONL / SQLite)"""
+    return os.path.splitext(path)[1].lower() in EXTENSIONS and format_of(path) != "txt"
+
+
+def chapter_digest():
+    """逐题累加的章节哈希对象 (与 question_bank.chapter_hash 长度相同)"""
+    return hashlib.blake2b(digest_size=16)
+
+
+def update_digest(digest, question):
+    digest.update(json.dumps(question, ensure_ascii=False, sort_keys=True).encode())
+    digest.update(b"\n")
+
+
+def structured_chapter_hash(questions):
+    """结构化格式章节的哈希 (用于热重载时判断章节是否变化)"""
+    digest = chapter_digest()
+    for question in questions:
+        update_digest(digest, question)
+    return digest.digest()
+
+
+def question_from_row(chapter_title, q_type, text, options, answer):
+    """SQLite 题目行转换为与 parse_chapter 输出结构相同的题目"""
+    question = {"type": q_type, "question": text}
+    if options is not None:
+        question["options"] = json.loads(options)
+    question["answer"] = answer
+    question["chapter"] = chapter_title
+    return question
+
+
+def iter_chapters(entries):
+    """把 (章节序号, 题目) 条目按章分组，逐章产出题目列表"""
+    for _, group in itertools.groupby(entries, key=lambda entry: entry[0]):
+        yield [question for _, question in group]
+
+
+# --- 读取 ---
+def read_bank(path, on_error=None):
+    """打开题库文件，返回 (题库标题, 条目迭代器)"""
+    kind = format_of(path)
+    if kind == "jsonl":
+        return read_jsonl(path)
+    if kind == "sqlite":
+        return read_sqlite(path)
+    return read_txt(path, on_error)
+
+
+def read_txt(path, on_error=None):
+    """逐章读取文本题库 (每次只在内存中保留一章的原文)"""
+    f = open(path, "r", encoding="utf-8")
+    bank = QuestionBank(on_error=on_error)
+    bank.file_path = path
+    # 第一行不以“第”开头时作为题库标题，否则使用文件名
+    first_line = ""
+    for line in f:
+        if line.strip():
+            first_line = line.strip()
+            break
+    if first_line.startswith("第"):
+        bank.title = os.path.splitext(os.path.basename(path))[0]
+        pending = [first_line]
+    else:
+        bank.title = first_line
+        pending = []
+
+    def entries():
+        chapter_index = 0
+        lines = pending
+        previous_blank = False
+        try:
+            for line in itertools.chain(f, [None]):
+                # 空行后以“第X章”开头的行开始新的一章 (与 split_content 的规则一致)
+                boundary = line is None or (
+                    previous_blank and CHAPTER_LINE.match(line) is not None
+                )
+                if boundary:
+                    text = "\n".join(lines).strip()
+                    match = CHAPTER_LINE.search(text)
+                    if match:
+                        questions = bank.parse_chapter(text[match.start() :])
+                        if questions:
+                            for question in questions:
+                                yield chapter_index, question
+                            chapter_index += 1
+                    lines = []
+                    if line is None:
+                        break
+                line = line.rstrip("\n")
+                previous_blank = line == ""
+                lines.append(line)
+        finally:
+            f.close()
+
+    return bank.title, entries()
+
+
+def parse_line(line, number):
+    try:
+        record = json.loads(line)
+    except ValueError as e:
+        raise ValueError(f"第 {number} 行不是有效的 JSON：{e}") from None
+    if not isinstance(record, dict):
+        raise ValueError(f"第 {number} 行不是 JSON 对象")
+    return record
+
+
+def read_jsonl(path):
+    """逐行读取 JSONL 题库"""
+    f = open(path, "r", encoding="utf-8")
+    first = f.readline()
+    line_number = 1
+    header = parse_line(first, line_number) if first.strip() else {}
+    if "question" in header:
+        title = os.path.splitext(os.path.basename(path))[0]
+        pending = [(line_number, header)]
+    else:
+        title = header.get("title") or os.path.splitext(os.path.basename(path))[0]
+        pending = []
+
+    def records():
+        yield from pending
+        for number, line in enumerate(f, line_number + 1):
+            if line.strip():
+                yield number, parse_line(line, number)
+
+    def entries():
+        chapter_index = -1
+        chapter_title = None
+        try:
+            for number, record in records():
+                if record.get("type") not in QUESTION_TYPES or not record.get(
+                    "question"
+                ):
+                    raise ValueError(f"第 {number} 行缺少有效的题型或题干")
+                question = {
+                    "type": record["type"],
+                    "question": record["question"],
+                    "answer": record.get("answer"),
+                    "chapter": record.get("chapter") or DEFAULT_CHAPTER,
+                }
+                if record["type"] != "判断题":
+                    question["options"] = list(record.get("options") or [])
+                if question["chapter"] != chapter_title:
+                    chapter_title = question["chapter"]
+                    chapter_index += 1
+                yield chapter_index, question
+        finally:
+            f.close()
+
+    return title, entries()
+
+
+def read_sqlite(path):
+    """按章节和题目顺序逐行读取 SQLite 题库"""
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+    connection = sqlite3.connect(path)
+    row = connection.execute("SELECT value FROM meta WHERE key = 'title'").fetchone()
+    title = row[0] if row else os.path.splitext(os.path.basename(path))[0]
+
+    def entries():
+        try:
+            rows = connection.execute(
+                "SELECT q.chapter, c.title, q.type, q.question, q.options, q.answer"
+                " FROM questions q JOIN chapters c ON c.chapter = q.chapter"
+                " ORDER BY q.chapter, q.position"
+            )
+            for chapter, chapter_title, *row in rows:
+                yield chapter, question_from_row(chapter_title, *row)
+        finally:
+            connection.close()
+
+    return title, entries()
+
+
+# --- 写出 ---
+def write_bank(path, title, entries):
+    """把条目写出为 path 扩展名对应的格式，返回写出的题目数
+
+    先写临时文件，全部写完后再替换目标文件，读取中途出错时不会留下不完整的题库。
+    """
+    writer = {"jsonl": write_jsonl, "sqlite": write_sqlite, "txt": write_txt}[
+        format_of(path)
+    ]
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        count = writer(temp_path, title, entries)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return count
+
+
+def write_jsonl(path, title, entries):
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"title": title}, ensure_ascii=False) + "\n")
+        for _, question in entries:
+            f.write(json.dumps(question, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+def write_sqlite(path, title, entries):
+    if os.path.exists(path):
+        os.remove(path)
+    connection = sqlite3.connect(path)
+    try:
+        # 批量导入时关闭日志和同步 (写的是临时文件，失败时删除即可)
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+        connection.executescript(SQLITE_SCHEMA)
+        connection.execute("INSERT INTO meta VALUES ('title', ?)", (title,))
+
+        count = 0
+        batch = []
+        chapters = []  # [[章节序号, 标题, 题数, 哈希对象]]
+        last_chapter = None
+        position = 0
+        for chapter_index, question in entries:
+            if chapter_index != last_chapter:
+                # 章节序号重新编号为连续的 0, 1, 2, ...
+                chapters.append(
+                    [len(chapters), question.get("chapter", ""), 0, chapter_digest()]
+                )
+                last_chapter = chapter_index
+                position = 0
+            chapter = chapters[-1]
+            update_digest(chapter[3], question)
+            options = question.get("options")
+            batch.append(
+                (
+                    chapter[0],
+                    position,
+                    question["type"],
+                    question["question"],
+                    (
+                        None
+                        if options is None
+                        else json.dumps(options, ensure_ascii=False)
+                    ),
+                    question.get("answer"),
+                )
+            )
+            chapter[2] += 1
+            position += 1
+            count += 1
+            if len(batch) >= BATCH_SIZE:
+                connection.executemany(
+                    "INSERT INTO questions VALUES (?, ?, ?, ?, ?, ?)", batch
+                )
+                batch = []
+        if batch:
+            connection.executemany(
+                "INSERT INTO questions VALUES (?, ?, ?, ?, ?, ?)", batch
+            )
+        connection.executemany(
+            "INSERT INTO chapters VALUES (?, ?, ?, ?)",
+            (
+                (index, chapter_title, size, digest.digest())
+                for index, chapter_title, size, digest in chapters
+            ),
+        )
+        connection.execute(SQLITE_INDEX)
+        connection.commit()
+    finally:
+        connection.close()
+    return count
+
+
+def chapter_heading(title, number):
+    """文本格式的章节标题行 (标题不以“第X章”开头时补上章节编号)"""
+    if CHAPTER_LINE.match(title):
+        return title
+    if number < 100:
+        tens, ones = divmod(number, 10)
+        numeral = ("" if tens <= 1 else CHINESE_DIGITS[tens]) + ("十" if tens else "")
+        numeral += CHINESE_DIGITS[ones] if ones else ""
+    else:
+        numeral = "".join(CHINESE_DIGITS[int(digit)] for digit in str(number))
+    return f"第{numeral}章 {title}"
+
+
+def question_lines(number, question):
+    """一道题的文本格式 (答案写在题干末尾或空括号中)"""
+    answer = question.get("answer") or ""
+    text = question["question"]
+    if answer:
+        if "（）" in text:
+            text = text.replace("（）", f"（{answer}）", 1)
+        else:
+            text = f"{text}（{answer}）"
+    lines = [f"{number}. {text}"]
+    for letter, option in zip("ABCD", question.get("options") or []):
+        lines.append(f"{letter}. {option}")
+    return lines
+
+
+def write_txt(path, title, entries):
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"{title}\n")
+        for number, questions in enumerate(iter_chapters(entries), 1):
+            heading = chapter_heading(questions[0].get("chapter", ""), number)
+            lines = ["", heading]
+            section = 0
+            for q_type in QUESTION_TYPES:
+                typed = [q for q in questions if q["type"] == q_type]
+                if not typed:
+                    continue
+                lines.append(f"{SECTION_NUMBERS[section]}、{SECTION_HEADERS[q_type]}")
+                section += 1
+                for index, question in enumerate(typed, 1):
+                    lines += question_lines(index, question)
+            f.write("\n".join(lines) + "\n")
+            count += len(questions)
+    return count
+
+
+# --- 题库对象 ---
+def load_into(question_bank, path):
+    """把 JSONL / SQLite 题库直接读入 QuestionBank (不经过正则解析)，返回是否有题目"""
+    title, entries = read_bank(path)
+    question_bank.title = title
+    for questions in iter_chapters(entries):
+        question_bank.chapters.append(questions)
+        question_bank.chapter_hashes.append(structured_chapter_hash(questions))
+    return bool(question_bank.chapters)
+
+
+def export_bank(question_bank, path):
+    """把 QuestionBank 写出为 path 扩展名对应的格式，返回写出的题目数"""
+    entries = (
+        (chapter_index, question)
+        for chapter_index, questions in enumerate(question_bank.chapters)
+        for question in questions
+    )
+    return write_bank(path, question_bank.title, entries)
+
+
+def convert(source, target):
+    """格式转换，返回写出的题目数"""
+    if os.path.abspath(source) == os.path.abspath(target):
+        raise ValueError("输入和输出不能是同一个文件")
+    format_of(target)
+    title, entries = read_bank(
+        source, on_error=lambda title, message: print(message, file=sys.stderr)
+    )
+    return write_bank(target, title, entries)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="题库格式转换 (.txt / .jsonl / .sqlite)"
+    )
+    parser.add_argument("source", help="输入题库文件")
+    parser.add_argument("target", help="输出题库文件 (格式由扩展名决定)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        count = convert(args.source, args.target)
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"转换失败: {e}", file=sys.stderr)
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(args.source) / 1024 / 1024
+    print(f"已转换 {count} 道题，耗时 {elapsed:.2f} 秒 ({size / elapsed:.1f} MB/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""题库解析快照：把解析好的题库以 marshal 格式缓存，文件未变化时跳过文本解析
+
+快照按题库文件的绝对路径命名，保存在程序目录下的 quizup_cache/。
+快照头记录格式版本、文件路径、修改时间和大小，任一项不符即视为失效；
+修改 QuestionBank 的解析规则后需要增大 FORMAT_VERSION，使旧快照失效。
+"""
+
+import hashlib
+import marshal
+import os
+
+FORMAT_VERSION = 3
+CACHE_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "quizup_cache")
+
+
+def file_signature(file_path):
+    """题库文件的快照标识 (格式版本, 绝对路径, 修改时间, 大小)"""
+    path = os.path.abspath(file_path)
+    info = os.stat(path)
+    return (FORMAT_VERSION, path, info.st_mtime_ns, info.st_size)
+
+
+def snapshot_path(file_path, folder=None):
+    name = hashlib.blake2b(
+        os.path.abspath(file_path).encode("utf-8"), digest_size=12
+    ).hexdigest()
+    return os.path.join(folder or CACHE_FOLDER, f"{name}.snap")
+
+
+def load_snapshot(file_path, folder=None):
+    """读取有效的快照，返回 (标题, 章节列表, 章节哈希列表)；没有快照或已失效时返回 None"""
+    try:
+        signature = file_signature(file_path)
+        with open(snapshot_path(file_path, folder), "rb") as f:
+            # 整体读入后再反序列化 (marshal.load 直接读文件对象时分多次小块读取，慢得多)
+            header, title, chapters, hashes = marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if header != signature:
+        return None
+    return title, chapters, hashes
+
+
+def save_snapshot(file_path, title, chapters, hashes, folder=None):
+    """写出快照 (先写临时文件再替换，避免读到写了一半的快照)，失败时返回 False"""
+    path = snapshot_path(file_path, folder)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        data = marshal.dumps((file_signature(file_path), title, chapters, hashes))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+        return True
+    except (OSError, ValueError):
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        return False
@@ -0,0 +1,115 @@
+"""同时打开多个题库：每个标签页有自己的题库、答题会话和文件监视
+
+BankTab 只保存数据 (题库、QuizEngine、文件监视和已保存的会话版本)，不创建任何
+控件。答题界面只有一套，切换标签页时换入该标签页的会话并显示它的当前题目，
+因此切换不需要重新解析，也不会丢失进度；后台标签页只占用题库数据本身，文件
+监视也只在标签页显示时运行 (切回时再检查文件是否修改)。
+
+StringPool 在所有标签页之间共享：题型、章节标题、答案、选项等较短的重复字符串
+只保留一份；内容相同的章节 (按章节哈希) 只保留一份题目列表，新打开的题库在
+子进程解析时也直接复用其他标签页中已解析的章节。按需读取的 SQLite 题库题目
+不常驻内存，不参与共享。
+
+驻留表持有其中字符串的强引用 (str 不支持弱引用)，不会随题目释放而自动缩小；
+关闭标签页或题库重新加载后由 rebuild() 按仍打开的题库重建，期间最多多占用
+已关闭或已替换题库中独有的那部分短字符串。
+"""
+
+import os
+
+INTERN_MAX_LEN = 40  # 只驻留不超过此长度的字符串 (长字符串很少重复)
+INTERN_KEYS = ("type", "chapter", "answer")  # 驻留的题目字段 (另有各选项)
+
+
+class BankTab:
+    """一个打开的题库 (标签页) 的会话数据"""
+
+    def __init__(self, question_bank, engine):
+        self.question_bank = question_bank
+        self.engine = engine
+        self.bank_watcher = None  # 监视题库文件 (仅在标签页显示时运行)
+        self.saved_revision = engine.revision  # 已保存的会话状态版本
+
+    @property
+    def file_path(self):
+        return self.question_bank.file_path
+
+    @property
+    def title(self):
+        return self.question_bank.title or os.path.basename(self.file_path)
+
+    def is_file(self, file_path):
+        """是否为 file_path 对应的题库"""
+        return os.path.abspath(self.file_path) == os.path.abspath(file_path)
+
+
+class StringPool:
+    """各标签页共享的字符串驻留和已解析章节"""
+
+    def __init__(self):
+        self.strings = {}
+
+    def intern(self, text):
+        if len(text) > INTERN_MAX_LEN:
+            return text
+        return self.strings.setdefault(text, text)
+
+    @staticmethod
+    def known_chapters(banks):
+        """已打开题库中的 {章节哈希: 题目列表} (用于解析时复用)"""
+        known = {}
+        for bank in banks:
+            if bank.store is None:
+                known.update(zip(bank.chapter_hashes, bank.chapters))
+        return known
+
+    def adopt(self, bank, banks):
+        """把新加载的题库并入共享存储
+
+        与 banks 中内容相同的章节换成同一个题目列表；其余章节中的短字符串驻留。
+        """
+        if bank.store is not None:
+            return
+        known = self.known_chapters(banks)
+        for index, digest in enumerate(bank.chapter_hashes[: len(bank.chapters)]):
+            shared = known.get(digest)
+            if shared is not None:
+                bank.chapters[index] = shared
+            else:
+                self.intern_chapter(bank.chapters[index])
+                known[digest] = bank.chapters[index]
+
+    def rebuild(self, banks):
+        """只保留 banks 中仍在使用的字符串 (关闭标签页或题库重新加载后调用)
+
+        这些题库的字符串已经驻留过，只需登记，不必改写题目。
+        """
+        strings = {}
+        seen = set()  # 已登记的章节 (相同的章节在多个题库中共用一个列表)
+        for bank in banks:
+            if bank.store is not None:
+                continue
+            for questions in bank.chapters:
+                if id(questions) in seen:
+                    continue
+                seen.add(id(questions))
+                for question in questions:
+                    for key in INTERN_KEYS:
+                        value = question.get(key)
+                        if value and len(value) <= INTERN_MAX_LEN:
+                            strings.setdefault(value, value)
+                    for option in question.get("options") or ():
+                        if len(option) <= INTERN_MAX_LEN:
+                            strings.setdefault(option, option)
+        self.strings = strings
+
+    def intern_chapter(self, questions):
+        intern = self.intern
+        for question in questions:
+            for key in INTERN_KEYS:
+                value = question.get(key)
+                if value:
+                    question[key] = intern(value)
+            options = question.get("options")
+            if options:
+                question["options"] = [intern(option) for option in options]
@@ -0,0 +1,117 @@
+"""题库热重载：轮询题库文件的修改时间和大小，变化后只重新解析原文有改动的章节
+
+文件变化后等到连续两次轮询签名相同 (编辑器写完) 再开始解析。解析在受限的子进程中
+进行 (见 parse_worker)，结果组装成一个全新的 QuestionBank，旧题库对象不做任何修改；
+解析完成后由 Tk 线程通过 on_reloaded(新题库, 章节映射, 错误列表) 一次性换入。
+按需读取的 SQLite 题库不需要解析，直接重新打开 (只读取章节目录)。
+"""
+
+import os
+
+from parse_worker import ParseJob
+from question_bank import QuestionBank
+
+POLL_MS = 1000  # 轮询间隔
+JOB_POLL_MS = 50  # 解析进行中的轮询间隔
+
+
+def file_state(file_path):
+    """文件的 (修改时间, 大小)，文件不存在时返回 None"""
+    try:
+        info = os.stat(file_path)
+    except OSError:
+        return None
+    return info.st_mtime_ns, info.st_size
+
+
+def chapter_mapping(old_hashes, new_hashes):
+    """按章节哈希匹配新旧章节，返回 {旧章节索引: 新章节索引} (只含内容未变化的章节)"""
+    new_positions = {}
+    for index, digest in enumerate(new_hashes):
+        new_positions.setdefault(digest, []).append(index)
+    mapping = {}
+    for index, digest in enumerate(old_hashes):
+        positions = new_positions.get(digest)
+        if positions:
+            # 内容相同的重复章节按出现顺序一一对应
+            mapping[index] = positions.pop(0)
+    return mapping
+
+
+class BankWatcher:
+    """监视当前题库文件，变化时增量重新加载"""
+
+    def __init__(self, root, bank, on_reloaded, poll_ms=POLL_MS):
+        self.root = root
+        self.bank = bank  # 当前使用的题库 (换入新题库后更新)
+        self.on_reloaded = on_reloaded
+        self.poll_ms = poll_ms
+        self.state = file_state(bank.file_path)  # 当前题库对应的文件签名
+        self.changed_state = None  # 检测到变化后的文件签名 (等待稳定)
+        self.job = None  # 正在进行的解析
+        self.job_state = None  # 正在解析的文件签名
+        self.poll_job = None
+
+    def start(self):
+        if self.poll_job is None:
+            self.poll_job = self.root.after(self.poll_ms, self.poll)
+
+    def stop(self):
+        if self.poll_job is not None:
+            self.root.after_cancel(self.poll_job)
+            self.poll_job = None
+        if self.job is not None:
+            self.job.cancel()
+            self.job = None
+
+    def poll(self):
+        if self.job is not None:
+            if not self.job.poll():
+                self.poll_job = self.root.after(JOB_POLL_MS, self.poll)
+                return
+            job, self.job = self.job, None
+            self.finish(job)
+        self.poll_job = self.root.after(self.poll_ms, self.poll)
+
+        state = file_state(self.bank.file_path)
+        if state is None or state == self.state:
+            self.changed_state = None
+            return
+        if state != self.changed_state:
+            self.changed_state = state  # 刚发生变化，等下次轮询确认已写完
+            return
+        self.changed_state = None
+        if self.bank.store is not None:
+            self.state = state
+            self.reopen_store()
+            return
+        # 以当前题库为基础增量解析，原文未变化的章节不再解析
+        self.job = ParseJob(self.bank.file_path, previous=self.bank)
+        self.job_state = state
+        self.job.start()
+
+    def finish(self, job):
+        """换入新题库 (解析失败、不完整或报告过错误时保留旧题库，文件再次变化后重试)
+
+        部分解析的题库缺少后面的章节，换入后这些章节的进度和统计会被丢弃，
+        所以只要子进程报告过错误就不换入。
+        """
+        self.state = self.job_state
+        if job.bank is None or not job.complete or job.errors:
+            self.on_reloaded(None, None, job.diagnostics)
+            return
+        self.swap(job.bank, job.diagnostics)
+
+    def reopen_store(self):
+        """重新打开 SQLite 题库 (打开失败时保留旧题库)"""
+        errors = []
+        bank = QuestionBank(on_error=lambda title, message: errors.append(message))
+        if not bank.load_question_bank(self.bank.file_path):
+            self.on_reloaded(None, None, errors or ["题库中没有题目。"])
+            return
+        self.swap(bank, errors)
+
+    def swap(self, bank, errors):
+        mapping = chapter_mapping(self.bank.chapter_hashes, bank.chapter_hashes)
+        self.bank = bank
+        self.on_reloaded(bank, mapping, errors)
@@ -0,0 +1,59 @@
+"""QuizEngine 无界面会话基准：模拟答题，统计每秒作答数
+
+用法: python benchmarks/bench_engine.py [作答次数] [章节数] [每章题数]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import quiz_engine  # noqa: E402
+from quiz_engine import QuizEngine  # noqa: E402
+from synthetic import make_bank  # noqa: E402
+
+
+def simulate(engine, answers, rng):
+    """驱动会话完成 answers 次作答 (章节完成后进入下一章，全部完成后重新开始)"""
+    done = 0
+    choices = ["A", "B", "C", "D", "AB", "ACD"]
+    while done < answers:
+        event = engine.draw()
+        kind = event.kind
+        if kind == quiz_engine.QUESTION:
+            engine.answer(choices[rng.randrange(6)])
+            done += 1
+        elif kind == quiz_engine.CHAPTER_DONE or kind == quiz_engine.CHAPTER_EMPTY:
+            if not engine.next_chapter():
+                engine.restart(keep_stats=True)
+        else:
+            engine.restart(keep_stats=True)
+    return done
+
+
+def main():
+    answers = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    chapters = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    per_chapter = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+
+    bank = make_bank(chapters, per_chapter)
+    engine = QuizEngine(bank, rng=random.Random(1))
+    rng = random.Random(2)
+
+    start = time.perf_counter()
+    done = simulate(engine, answers, rng)
+    elapsed = time.perf_counter() - start
+
+    total = sum(s["answered"] for c in engine.stats.values() for s in c.values())
+    assert total == done
+    print(
+        f"{done} 次作答，用时 {elapsed:.2f} s，{done / elapsed:,.0f} 次/秒 "
+        f"({chapters} 章 × {per_chapter} 题)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""批量阅卷基准：生成随机答题卡 CSV，测量读取和计分耗时
+
+用法: python benchmarks/bench_grading.py [答题卡数] [题数]
+"""
+
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import grading  # noqa: E402
+from synthetic import make_bank  # noqa: E402
+
+
+def write_sheets(path, paper, count, rng):
+    """写出随机答题卡 (约六成作答与答案相同)"""
+    choices = ["A", "B", "C", "D", "AB", "BCD", ""]
+    answers = [q["answer"] for q in paper.questions]
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["学号"] + [f"Q{i + 1}" for i in range(paper.size)])
+        for student in range(count):
+            writer.writerow(
+                [f"S{student:06d}"]
+                + [a if rng.random() < 0.6 else rng.choice(choices) for a in answers]
+            )
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    rng = random.Random(0)
+
+    questions = [q for chapter in make_bank(10, size).chapters for q in chapter]
+    paper = grading.Paper(rng.sample(questions, size), "合成试卷")
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "sheets.csv")
+        write_sheets(path, paper, count, rng)
+
+        start = time.perf_counter()
+        sheets = grading.AnswerSheets.load(path, paper.size)
+        loaded = time.perf_counter()
+        for partial in grading.PARTIAL_MODES:
+            begin = time.perf_counter()
+            report = grading.grade(paper, sheets, partial)
+            elapsed = time.perf_counter() - begin
+            print(
+                f"计分 ({partial:<10}) {elapsed * 1000:8.1f} ms   "
+                f"平均分 {report.scores.mean():.2f} / {report.full_marks:g}"
+            )
+        print(f"读取 {count} 份答题卡 × {size} 题: {loaded - start:.2f} s")
+
+        begin = time.perf_counter()
+        report.write_scores(os.path.join(folder, "scores.csv"))
+        report.write_items(os.path.join(folder, "items.csv"))
+        print(f"写出成绩和逐题统计: {time.perf_counter() - begin:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""现场答题主持基准：N 个 WebSocket 参与者同时作答，测量推送扇出和成批计分耗时
+
+用法: python benchmarks/bench_live.py [参与者数] [题目数]
+不需要图形环境：主持端的 drain 在本脚本的事件循环中按界面轮询间隔调用。
+"""
+
+import asyncio
+import base64
+import json
+import os
+import random
+import struct
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from live_host import LiveHost  # noqa: E402
+from synthetic import make_bank  # noqa: E402
+
+POLL_MS = 100  # 与 HostWindow.POLL_MS 相同
+
+
+class Participant:
+    """最小的 WebSocket 客户端 (发送的帧按协议加掩码)"""
+
+    def __init__(self, port):
+        self.port = port
+
+    async def connect(self, name):
+        self.reader, self.writer = await asyncio.open_connection("127.0.0.1", self.port)
+        key = base64.b64encode(os.urandom(16)).decode()
+        self.writer.write(
+            (
+                "GET /ws HTTP/1.1\r\nHost: 127.0.0.1\r\nUpgrade: websocket\r\n"
+                f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\n"
+                "Sec-WebSocket-Version: 13\r\n\r\n"
+            ).encode()
+        )
+        await self.reader.readuntil(b"\r\n\r\n")
+        self.send({"type": "join", "name": name})
+
+    def send(self, data):
+        payload = json.dumps(data).encode()
+        mask = os.urandom(4)
+        masked = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+        self.writer.write(struct.pack("!BB", 0x81, 0x80 | len(payload)) + mask + masked)
+
+    async def receive(self):
+        first, second = await self.reader.readexactly(2)
+        length = second & 0x7F
+        if length == 126:
+            (length,) = struct.unpack("!H", await self.reader.readexactly(2))
+        elif length == 127:
+            (length,) = struct.unpack("!Q", await self.reader.readexactly(8))
+        return json.loads(await self.reader.readexactly(length))
+
+    async def receive_type(self, kind):
+        while True:
+            data = await self.receive()
+            if data["type"] == kind:
+                return data
+
+
+async def host_poll(host, drain_times, stop):
+    """模拟界面线程的定时轮询"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        if host.drain():
+            drain_times.append(time.perf_counter() - start)
+        await asyncio.sleep(POLL_MS / 1000)
+
+
+async def run(host, count, rounds):
+    questions = [q for chapter in make_bank(5, 20).chapters for q in chapter]
+    rng = random.Random(0)
+    participants = [Participant(host.port) for _ in range(count)]
+    await asyncio.gather(*(p.connect(f"玩家{i}") for i, p in enumerate(participants)))
+
+    drain_times = []
+    stop = asyncio.Event()
+    poller = asyncio.create_task(host_poll(host, drain_times, stop))
+    while host.connected_count < count:
+        await asyncio.sleep(0.01)
+
+    fanout_times = []
+    round_times = []
+    for _ in range(rounds):
+        question = rng.choice(questions)
+        start = time.perf_counter()
+        host.push_question(question)
+        received = await asyncio.gather(
+            *(p.receive_type("question") for p in participants)
+        )
+        fanout_times.append(time.perf_counter() - start)
+
+        # 所有参与者同时作答
+        for p, data in zip(participants, received):
+            p.send({"type": "answer", "id": data["id"], "answer": rng.choice("ABCD")})
+        await asyncio.gather(*(p.receive_type("result") for p in participants))
+        round_times.append(time.perf_counter() - start)
+
+    stop.set()
+    await poller
+    for p in participants:
+        p.writer.close()
+    return fanout_times, round_times, drain_times
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    host = LiveHost(host="127.0.0.1", port=0)
+    if not host.start():
+        print(f"无法启动主持服务器: {host.error}", file=sys.stderr)
+        sys.exit(1)
+    try:
+        fanout, rounds_done, drains = asyncio.run(run(host, count, rounds))
+    finally:
+        host.stop()
+
+    def ms(values):
+        values = sorted(values)
+        return f"中位数 {values[len(values) // 2] * 1000:7.2f} ms   最大 {values[-1] * 1000:7.2f} ms"
+
+    print(f"{count} 个参与者，{rounds} 道题")
+    print(f"推送到全部参与者  {ms(fanout)}")
+    print(f"作答到全部收到结果 {ms(rounds_done)} (含 {POLL_MS} ms 轮询间隔)")
+    print(f"单次 drain (界面线程) {ms(drains)}")
+    print(f"排行榜前三: {[(p.name, p.score) for p in host.leaderboard(3)]}")
+
+
+if __name__ == "__main__":
+    main()
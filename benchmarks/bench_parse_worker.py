@@ -0,0 +1,76 @@
+"""子进程解析基准：完整题库的子进程解析耗时，以及出错题库不写出快照的检查
+
+用法: python benchmarks/bench_parse_worker.py [章节数(<=99)] [每种题型题数]
+出错的题库 (JSONL 中间有一行无效) 不能被当作完整题库，也不能留下解析快照，
+否则下次打开时会静默读取不完整的快照；结构化题库出错时整个题库不加载。
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bank_formats  # noqa: E402
+import bank_snapshot  # noqa: E402
+from parse_worker import ParseJob  # noqa: E402
+from synthetic import make_bank, write_text_bank  # noqa: E402
+
+
+def parse(path):
+    """在子进程中解析题库，返回 (ParseJob, 耗时毫秒)"""
+    start = time.perf_counter()
+    job = ParseJob(path)
+    job.start()
+    job.wait(interval=0.005)
+    return job, (time.perf_counter() - start) * 1000
+
+
+def write_broken_jsonl(path, chapters=3, per_chapter=5):
+    """写出第一章之后有一行无效 JSON 的题库"""
+    bank = make_bank(chapters, per_chapter)
+    bank_formats.export_bank(bank, path)
+    with open(path, encoding="utf-8") as f:
+        lines = f.readlines()
+    lines.insert(1 + per_chapter, "{不是 JSON\n")  # 标题行和第一章之后
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+
+
+def check_broken(path):
+    """出错的题库：不算完整解析，不写出快照"""
+    snapshot = bank_snapshot.snapshot_path(path)
+    job, _ = parse(path)
+    assert job.errors, "应报告无效的行"
+    assert not job.complete, "出错的题库不能算完整解析"
+    assert job.bank is None, "结构化题库有无效行时整个题库加载失败"
+    assert not os.path.exists(snapshot), "出错的题库不能写出解析快照"
+    print(f"出错题库: {job.diagnostics[0]}")
+    print("  未写出快照")
+
+
+def main():
+    chapters = int(sys.argv[1]) if len(sys.argv) > 1 else 99
+    per_type = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "bench_bank.txt")
+        write_text_bank(path, chapters, per_type)
+        job, elapsed = parse(path)
+        snapshot = bank_snapshot.snapshot_path(path)
+        assert job.complete and not job.errors
+        assert os.path.exists(snapshot), "完整解析的题库应写出快照"
+        total = sum(len(chapter) for chapter in job.bank.chapters)
+        print(f"题库: {len(job.bank.chapters)} 章 {total} 题")
+        print(f"子进程解析           {elapsed:8.1f} ms")
+        os.remove(snapshot)  # 清理本次生成的快照
+
+        broken = os.path.join(folder, "broken.jsonl")
+        write_broken_jsonl(broken)
+        check_broken(broken)
+
+
+if __name__ == "__main__":
+    main()
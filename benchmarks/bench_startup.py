@@ -0,0 +1,84 @@
+"""冷启动基准：导入耗时、题库文本解析与快照读取耗时 (无界面部分)
+
+用法: python benchmarks/bench_startup.py [章节数(<=99)] [每种题型题数]
+Tk 窗口创建和首次绘制需要图形界面，可设置 QUIZUP_STARTUP=1 运行 main.py --resume 查看。
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_bank import QuestionBank  # noqa: E402
+from quiz_engine import QuizEngine  # noqa: E402
+from synthetic import write_text_bank  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_ms(module, runs=5):
+    """在新进程中导入模块的耗时 (取最小值，毫秒)"""
+    code = (
+        "import time; t = time.perf_counter(); import {}; "
+        "print((time.perf_counter() - t) * 1000)".format(module)
+    )
+    times = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        times.append(float(output))
+    return min(times)
+
+
+def load_ms(path, use_snapshot, runs=5):
+    """加载题库并抽出第一题的耗时 (取最小值，毫秒)"""
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        bank = QuestionBank()
+        bank.use_snapshot = use_snapshot
+        assert bank.load_question_bank(path)
+        QuizEngine(bank).draw()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best, bank
+
+
+def main():
+    chapters = int(sys.argv[1]) if len(sys.argv) > 1 else 99
+    per_type = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+
+    print(f"import tkinter      {import_ms('tkinter'):8.1f} ms")
+    print(f"import quiz_app     {import_ms('quiz_app'):8.1f} ms")
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "bench_bank.txt")
+        write_text_bank(path, chapters, per_type)
+        parse, bank = load_ms(path, use_snapshot=False)
+        total = sum(len(chapter) for chapter in bank.chapters)
+        print(f"题库: {len(bank.chapters)} 章 {total} 题")
+        print(f"文本解析 + 首题       {parse:8.1f} ms")
+
+        # 首次加载写出快照，之后读取快照
+        first = QuestionBank()
+        first.load_question_bank(path)
+        cached, bank = load_ms(path, use_snapshot=True)
+        assert bank.from_snapshot
+        print(f"快照读取 + 首题       {cached:8.1f} ms ({parse / cached:.0f}x)")
+
+        # 清理本次生成的快照
+        import bank_snapshot
+
+        os.remove(bank_snapshot.snapshot_path(path))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""SQLite 按需读取与整体载入内存的对比：题库对象占用的内存和抽题答题耗时
+
+用法: python benchmarks/bench_store.py [章节数] [每章题数]
+按需读取时常驻内存只有章节目录和缓存的页，与题库大小基本无关。
+"""
+
+import gc
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bank_formats  # noqa: E402
+import quiz_engine  # noqa: E402
+from question_bank import QuestionBank  # noqa: E402
+from quiz_engine import QUESTION_TYPES, QuizEngine  # noqa: E402
+from synthetic import make_question  # noqa: E402
+
+
+def entries(chapters, per_chapter, seed=0):
+    """逐题生成合成题库的 (章节序号, 题目) 条目"""
+    rng = random.Random(seed)
+    for c in range(chapters):
+        title = f"第{c + 1}章 合成章节"
+        for i in range(per_chapter):
+            yield c, make_question(rng, title, rng.choice(QUESTION_TYPES), i + 1)
+
+
+def drill(bank, draws=5000, seed=0):
+    """逐章连续抽题、作答，返回每题平均耗时 (微秒)"""
+    engine = QuizEngine(bank, rng=random.Random(seed))
+    start = time.perf_counter()
+    for _ in range(draws):
+        event = engine.draw()
+        if event.kind == quiz_engine.QUESTION:
+            engine.answer(event.question.get("answer") or "A")
+        elif not engine.next_chapter():
+            engine.restart()
+    return (time.perf_counter() - start) / draws * 1e6
+
+
+def main():
+    chapters = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    per_chapter = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "bench_bank.sqlite")
+        start = time.perf_counter()
+        count = bank_formats.write_bank(
+            path, "合成题库", entries(chapters, per_chapter)
+        )
+        print(
+            f"题库: {chapters} 章 {count} 题，写出 SQLite "
+            f"{time.perf_counter() - start:.2f} 秒，"
+            f"{os.path.getsize(path) / 1024 / 1024:.1f} MB"
+        )
+
+        def load_all():
+            bank = QuestionBank()
+            bank.file_path = path
+            bank_formats.load_into(bank, path)
+            return bank
+
+        def open_store():
+            bank = QuestionBank()
+            assert bank.load_question_bank(path)
+            return bank
+
+        for name, load in (("整体载入", load_all), ("按需读取", open_store)):
+            gc.collect()  # 上一轮释放的题库不计入本轮
+            elapsed = float("inf")  # 打开耗时取三次中的最小值
+            for _ in range(3):
+                bank = None
+                start = time.perf_counter()
+                bank = load()
+                elapsed = min(elapsed, (time.perf_counter() - start) * 1000)
+            per_draw = drill(bank)
+            if bank.store is not None:
+                store = bank.store
+                hit_rate = store.hits / max(store.hits + store.misses, 1)
+                store.close()
+            del bank
+
+            # 内存：打开题库并答题后仍被引用的分配 (tracemalloc 会拖慢计时，单独运行)
+            tracemalloc.start()
+            bank = load()
+            drill(bank)
+            size = tracemalloc.get_traced_memory()[0] / 1024 / 1024
+            tracemalloc.stop()
+            print(
+                f"{name}  内存 {size:8.1f} MB  打开 {elapsed:8.1f} ms  "
+                f"每题 {per_draw:6.1f} us"
+            )
+            if bank.store is not None:
+                print(f"          缓存命中率 {hit_rate:.1%}")
+                bank.store.close()
+            del bank
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""主题切换耗时基准：逐条重配样式 (旧方式) 对比预编译ttk主题 (theme_use)
+
+用法: python benchmarks/bench_theme.py [切换次数]
+需要图形环境 (Tk 需要显示器)。
+"""
+
+import os
+import sys
+import time
+import tkinter as tk
+from tkinter import ttk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modern_ui import ModernUI  # noqa: E402
+from quiz_app import QuizApp  # noqa: E402
+
+
+def legacy_apply(root, palette_name):
+    """模拟旧的 style_widgets：在clam主题上重新执行全部 configure/map"""
+    style = ttk.Style(root)
+    style.theme_use("clam")
+    settings = ModernUI.build_theme_settings(ModernUI.THEMES[palette_name])
+    for style_name, spec in settings.items():
+        if "configure" in spec:
+            style.configure(style_name, **spec["configure"])
+        if "map" in spec:
+            style.map(style_name, **spec["map"])
+    root.configure(bg=ModernUI.THEMES[palette_name]["bg"])
+
+
+def measure(root, switch, rounds):
+    """执行 rounds 次切换 (含界面刷新)，返回每次耗时列表 (毫秒)"""
+    timings = []
+    for i in range(rounds):
+        start = time.perf_counter()
+        switch(i)
+        root.update()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def summarize(name, timings):
+    timings = sorted(timings)
+    median = timings[len(timings) // 2]
+    print(f"{name:<10} 中位数 {median:7.2f} ms   最大 {timings[-1]:7.2f} ms")
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    root = tk.Tk()
+    app = QuizApp(root)
+    root.update()
+
+    palettes = ["dark", "light"]
+    legacy = measure(root, lambda i: legacy_apply(root, palettes[i % 2]), rounds)
+
+    # 预热：确保两个调色板都已编译，只测量 theme_use 路径
+    for _ in range(2):
+        ModernUI.toggle_theme(root)
+    root.update()
+    compiled = measure(root, lambda i: ModernUI.toggle_theme(root), rounds)
+
+    summarize("旧方式", legacy)
+    summarize("theme_use", compiled)
+    root.destroy()
+    del app
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""答题服务器压力测试：多个长连接客户端循环请求 下一题/作答，统计吞吐量和延迟
+
+用法: python benchmarks/load_server.py [--clients 50] [--duration 10] [--port 8765]
+默认在子进程中用合成题库启动服务器；指定 --external 时压测已运行的服务器。
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic import make_bank  # noqa: E402
+
+
+def serve_synthetic(host, port, chapters, per_chapter):
+    """子进程入口：用合成题库运行服务器"""
+    import server
+
+    server.run_server(make_bank(chapters, per_chapter), host, port)
+
+
+class Client:
+    """单个长连接HTTP客户端"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def request(self, method, path, body=None):
+        payload = json.dumps(body).encode("utf-8") if body is not None else b""
+        self.writer.write(
+            (
+                f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                f"Content-Length: {len(payload)}\r\n\r\n"
+            ).encode("latin-1")
+            + payload
+        )
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        status = int(head.split(b" ", 2)[1])
+        length = 0
+        for line in head.split(b"\r\n")[1:]:
+            if line.lower().startswith(b"content-length:"):
+                length = int(line.split(b":", 1)[1])
+        data = await self.reader.readexactly(length)
+        if status != 200:
+            raise RuntimeError(f"{method} {path} -> {status}: {data!r}")
+        return json.loads(data)
+
+    def close(self):
+        if self.writer:
+            self.writer.close()
+
+
+async def run_client(host, port, deadline, latencies, rng):
+    client = Client(host, port)
+    await client.connect()
+    count = 0
+    try:
+        bank = await client.request("GET", "/api/bank")
+        chapters = len(bank["chapters"])
+        session = (await client.request("POST", "/api/session", {"chapter": 0}))[
+            "session"
+        ]
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            data = await client.request("POST", "/api/next", {"session": session})
+            latencies.append(time.perf_counter() - start)
+            count += 1
+            if data.get("done"):
+                await client.request(
+                    "POST",
+                    "/api/chapter",
+                    {"session": session, "chapter": rng.randrange(chapters)},
+                )
+                count += 1
+                continue
+            start = time.perf_counter()
+            await client.request(
+                "POST",
+                "/api/answer",
+                {"session": session, "answer": rng.choice("ABCD")},
+            )
+            latencies.append(time.perf_counter() - start)
+            count += 1
+        await client.request("GET", f"/api/stats?session={session}")
+        count += 1
+    finally:
+        client.close()
+    return count
+
+
+async def run_load(host, port, clients, duration):
+    deadline = time.perf_counter() + duration
+    latencies = []
+    rng = random.Random(0)
+    start = time.perf_counter()
+    counts = await asyncio.gather(
+        *(run_client(host, port, deadline, latencies, rng) for _ in range(clients))
+    )
+    elapsed = time.perf_counter() - start
+    return sum(counts), elapsed, sorted(latencies)
+
+
+def wait_for_port(host, port, timeout=10):
+    """等待服务器开始监听"""
+
+    async def probe():
+        end = time.monotonic() + timeout
+        while time.monotonic() < end:
+            try:
+                _, writer = await asyncio.open_connection(host, port)
+                writer.close()
+                return True
+            except OSError:
+                await asyncio.sleep(0.1)
+        return False
+
+    return asyncio.run(probe())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="答题服务器压力测试")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--clients", type=int, default=50, help="并发连接数")
+    parser.add_argument("--duration", type=float, default=10, help="持续秒数")
+    parser.add_argument("--chapters", type=int, default=20)
+    parser.add_argument("--per-chapter", type=int, default=200)
+    parser.add_argument(
+        "--external", action="store_true", help="压测已运行的服务器，不启动子进程"
+    )
+    args = parser.parse_args()
+
+    process = None
+    if not args.external:
+        process = multiprocessing.Process(
+            target=serve_synthetic,
+            args=(args.host, args.port, args.chapters, args.per_chapter),
+            daemon=True,
+        )
+        process.start()
+    try:
+        if not wait_for_port(args.host, args.port):
+            print("服务器未能启动", file=sys.stderr)
+            sys.exit(1)
+        total, elapsed, latencies = asyncio.run(
+            run_load(args.host, args.port, args.clients, args.duration)
+        )
+    finally:
+        if process:
+            process.terminate()
+            process.join()
+
+    def quantile(q):
+        return latencies[min(int(q * len(latencies)), len(latencies) - 1)] * 1000
+
+    print(
+        f"{args.clients} 个连接，{total} 次请求，用时 {elapsed:.1f} s，"
+        f"{total / elapsed:,.0f} 次/秒"
+    )
+    if latencies:
+        print(
+            f"延迟 p50 {quantile(0.5):.2f} ms   p99 {quantile(0.99):.2f} ms   "
+            f"最大 {latencies[-1] * 1000:.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
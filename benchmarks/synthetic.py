@@ -0,0 +1,85 @@
+"""基准测试用的合成题库"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_bank import QuestionBank  # noqa: E402
+
+CHINESE_NUMERALS = "一二三四五六七八九十"
+
+
+def make_question(rng, chapter_title, q_type, number):
+    """生成一道随机题目 (与 parse_chapter 的输出结构相同)"""
+    question = {
+        "type": q_type,
+        "question": f"第{number}题 合成题干 {rng.random():.6f}",
+        "chapter": chapter_title,
+    }
+    if q_type == "判断题":
+        question["answer"] = rng.choice("AB")
+    else:
+        question["options"] = [f"选项{c}{number}" for c in "ABCD"]
+        if q_type == "单选题":
+            question["answer"] = rng.choice("ABCD")
+        else:
+            question["answer"] = "".join(sorted(rng.sample("ABCD", rng.randint(2, 4))))
+    return question
+
+
+def make_bank(chapters=20, per_chapter=50, seed=0):
+    """生成包含 chapters 章、每章 per_chapter 题的题库对象"""
+    rng = random.Random(seed)
+    bank = QuestionBank()
+    bank.title = "合成题库"
+    for c in range(chapters):
+        title = f"第{c + 1}章 合成章节"
+        bank.chapters.append(
+            [
+                make_question(
+                    rng, title, rng.choice(["判断题", "单选题", "多选题"]), i + 1
+                )
+                for i in range(per_chapter)
+            ]
+        )
+    return bank
+
+
+def chinese_numeral(n):
+    """1-99 的中文数字 (题库章节标题只支持一到十组成的数字)"""
+    tens, ones = divmod(n, 10)
+    text = ""
+    if tens:
+        text = ("" if tens == 1 else CHINESE_NUMERALS[tens - 1]) + "十"
+    if ones:
+        text += CHINESE_NUMERALS[ones - 1]
+    return text
+
+
+def write_text_bank(path, chapters=99, per_type=30, seed=0):
+    """写出 .txt 格式的合成题库 (每章判断题、单选题、多选题各 per_type 道)"""
+    rng = random.Random(seed)
+    lines = ["合成题库"]
+    for c in range(1, chapters + 1):
+        lines += ["", f"第{chinese_numeral(c)}章 合成章节{c}"]
+        lines.append("一、判断题")
+        for i in range(1, per_type + 1):
+            lines.append(
+                f"{i}. 判断题干 {c}-{i} {rng.random():.6f}（{rng.choice('AB')}）"
+            )
+        for header, q_type in (
+            ("二、单项选择题", "单选题"),
+            ("三、多项选择题", "多选题"),
+        ):
+            lines.append(header)
+            for i in range(1, per_type + 1):
+                question = make_question(rng, "", q_type, i)
+                lines.append(f"{i}. {question['question']}（{question['answer']}）")
+                lines += [
+                    f"{letter}. {text}"
+                    for letter, text in zip("ABCD", question["options"])
+                ]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
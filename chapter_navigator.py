@@ -0,0 +1,227 @@
+import tkinter as tk
+from tkinter import ttk
+from modern_ui import ModernUI
+from quiz_engine import QUESTION_TYPES
+from virtual_list import VirtualList
+
+
+class ChapterNavigator:
+    """章节列表窗口：显示每章标题、各题型题数和进度，输入文字筛选，单击跳转
+
+    列表是虚拟化的，只为可见行创建控件；各题型题数在行首次可见时统计并缓存，
+    打开窗口时只读取章节标题。跳转由 QuizEngine.go_to_chapter 完成，耗时与
+    章节数无关。
+    """
+
+    ROW_HEIGHT = 58
+
+    def __init__(self, app):
+        self.app = app
+        self.engine = app.engine
+        self.type_counts = {}  # 已统计的各章题型题数 {章节索引: {题型: 题数}}
+        self.matches = []  # 符合筛选条件的章节索引 (列表的第 i 行为 matches[i])
+        self.selected = 0  # 选中行 (键盘上下移动，回车跳转)
+        self.filter_job = None
+
+        self.window = tk.Toplevel(app.root)
+        self.window.title("章节列表")
+        self.window.geometry("560x600")
+        self.window.configure(bg=ModernUI.get_theme_color("bg"))
+        self.window.minsize(420, 360)
+
+        # --- 标题栏 ---
+        title_bar = ttk.Frame(self.window, style="Title.TFrame", padding="0 5")
+        title_bar.pack(fill=tk.X)
+        ttk.Label(
+            title_bar,
+            text="章节列表",
+            style="Title.TLabel",
+            padding=8,
+        ).pack()
+
+        # --- 筛选框 ---
+        filter_frame = ttk.Frame(self.window, style="TFrame", padding="15 10 15 5")
+        filter_frame.pack(fill=tk.X)
+        ttk.Label(filter_frame, text="筛选:", style="TLabel").pack(side=tk.LEFT)
+        self.filter_var = tk.StringVar()
+        self.filter_entry = ttk.Entry(filter_frame, textvariable=self.filter_var)
+        self.filter_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(8, 8))
+        self.count_label = ttk.Label(filter_frame, style="Secondary.TLabel")
+        self.count_label.pack(side=tk.RIGHT)
+
+        # --- 章节列表 (虚拟化，只创建可见行) ---
+        self.chapter_list = VirtualList(
+            self.window,
+            create_row=self._create_row,
+            bind_row=self._bind_row,
+            row_height=self.ROW_HEIGHT,
+        )
+        self.chapter_list.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        self.filter_var.trace_add("write", lambda *args: self.schedule_filter())
+        self.filter_entry.bind("<Down>", lambda e: self.move_selection(1))
+        self.filter_entry.bind("<Up>", lambda e: self.move_selection(-1))
+        self.filter_entry.bind("<Next>", lambda e: self.move_selection(10))
+        self.filter_entry.bind("<Prior>", lambda e: self.move_selection(-10))
+        self.filter_entry.bind("<Return>", lambda e: self.jump(self.selected))
+        self.window.bind("<MouseWheel>", self._on_mousewheel)  # Windows/macOS
+        self.window.bind("<Button-4>", self._on_mousewheel)  # Linux 上滚
+        self.window.bind("<Button-5>", self._on_mousewheel)  # Linux 下滚
+        self.window.bind("<Escape>", lambda e: self.close())
+        self.window.bind("<<ThemeChanged>>", self._on_theme_changed)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.reload()
+        self.filter_entry.focus_set()
+
+    # --- 数据 ---
+    def reload(self):
+        """重新读取章节标题 (题库切换或重新加载时调用)"""
+        self.engine = self.app.engine
+        self.type_counts = {}
+        count = self.engine.chapter_count if self.engine else 0
+        # 筛选用的小写文本：章节序号和标题
+        self.keys = [
+            f"{i + 1} {self.engine.chapter_title(i)}".lower() for i in range(count)
+        ]
+        self.apply_filter()
+        # 选中并显示当前章节
+        current = self.engine.chapter_index if self.engine else 0
+        if current in self.matches:
+            self.selected = self.matches.index(current)
+            self.chapter_list.scroll_to(max(self.selected - 2, 0))
+            self.chapter_list.refresh_row(self.selected)
+
+    def schedule_filter(self):
+        """合并连续输入，空闲时再筛选"""
+        if self.filter_job is None:
+            self.filter_job = self.window.after_idle(self.apply_filter)
+
+    def apply_filter(self):
+        """按筛选文字 (空格分隔的多个词都须出现) 重新计算列表"""
+        self.filter_job = None
+        words = self.filter_var.get().lower().split()
+        if words:
+            self.matches = [
+                i
+                for i, key in enumerate(self.keys)
+                if all(word in key for word in words)
+            ]
+        else:
+            self.matches = list(range(len(self.keys)))
+        self.selected = 0
+        self.count_label.configure(text=f"{len(self.matches)} / {len(self.keys)} 章")
+        self.chapter_list.set_count(len(self.matches))
+        self.chapter_list.scroll_to(0)
+
+    def chapter_type_counts(self, chapter_index):
+        """一章各题型的题数 (首次需要时统计并缓存)"""
+        counts = self.type_counts.get(chapter_index)
+        if counts is None:
+            counts = dict.fromkeys(QUESTION_TYPES, 0)
+            for question in self.engine.bank.chapters[chapter_index]:
+                counts[question["type"]] = counts.get(question["type"], 0) + 1
+            self.type_counts[chapter_index] = counts
+        return counts
+
+    # --- 选择和跳转 ---
+    def move_selection(self, delta):
+        if not self.matches:
+            return "break"
+        previous = self.selected
+        self.selected = max(0, min(self.selected + delta, len(self.matches) - 1))
+        self.chapter_list.refresh_row(previous)
+        self.chapter_list.refresh_row(self.selected)
+        # 选中行滚出视野时滚动列表
+        canvas = self.chapter_list.canvas
+        top = self.chapter_list.index_at(canvas.canvasy(0))
+        bottom = self.chapter_list.index_at(canvas.canvasy(canvas.winfo_height()) - 1)
+        if self.selected < top:
+            self.chapter_list.scroll_to(self.selected)
+        elif self.selected > bottom:
+            self.chapter_list.scroll_to(self.selected - (bottom - top))
+        return "break"
+
+    def jump(self, row):
+        """跳转到列表第 row 行的章节并关闭窗口"""
+        if 0 <= row < len(self.matches):
+            chapter_index = self.matches[row]
+            self.close()
+            self.app.go_to_chapter(chapter_index)
+        return "break"
+
+    # --- 行控件 ---
+    def _create_row(self, parent):
+        """创建一个可复用的章节行控件"""
+        row = ttk.Frame(parent, style="Card.TFrame", padding="15 6")
+        row.columnconfigure(0, weight=1)
+        row.index = 0
+        row.title = ttk.Label(row, style="StatsHeader.TLabel", anchor="w")
+        row.title.grid(row=0, column=0, sticky="ew")
+        row.progress = ttk.Label(row, style="StatsRate.TLabel", anchor="e")
+        row.progress.grid(row=0, column=1, sticky="e")
+        row.detail = ttk.Label(row, style="StatsMuted.TLabel", anchor="w")
+        row.detail.grid(row=1, column=0, columnspan=2, sticky="ew", pady=(2, 0))
+        for widget in (row, row.title, row.progress, row.detail):
+            widget.bind("<Button-1>", lambda e, r=row: self.jump(r.index))
+            widget.configure(cursor="hand2")
+        return row
+
+    def _bind_row(self, row, index):
+        """把筛选结果第 index 行的章节信息填入行控件"""
+        row.index = index
+        chapter_index = self.matches[index]
+        marker = "▶ " if index == self.selected else ""
+        current = "  (当前)" if chapter_index == self.engine.chapter_index else ""
+        row.title.configure(
+            text=f"{marker}{chapter_index + 1}. "
+            f"{self.engine.chapter_title(chapter_index)}{current}"
+        )
+        shown, total = self.engine.chapter_progress(chapter_index)
+        row.progress.configure(text=f"已做 {shown} / {total}")
+        counts = self.chapter_type_counts(chapter_index)
+        row.detail.configure(
+            text="    ".join(f"{q_type} {counts[q_type]}" for q_type in QUESTION_TYPES)
+        )
+
+    # --- 事件 ---
+    def _on_mousewheel(self, event):
+        delta = 0
+        if event.num == 4:
+            delta = -1  # Linux 上滚
+        elif event.num == 5:
+            delta = 1  # Linux 下滚
+        elif event.delta > 0:
+            delta = -1  # Windows/macOS 上滚
+        elif event.delta < 0:
+            delta = 1  # Windows/macOS 下滚
+        if delta != 0:
+            self.chapter_list.scroll_units(delta)
+
+    def _on_theme_changed(self, event=None):
+        if event is not None and event.widget is not self.window:
+            return
+        self.window.configure(bg=ModernUI.get_theme_color("bg"))
+
+    # --- 窗口 ---
+    def exists(self):
+        """窗口是否仍然打开"""
+        try:
+            return bool(self.window.winfo_exists())
+        except tk.TclError:
+            return False
+
+    def show(self):
+        """把已打开的窗口提到最前"""
+        self.window.deiconify()
+        self.window.lift()
+        self.filter_entry.focus_set()
+
+    def close(self):
+        """关闭窗口并通知应用"""
+        if self.filter_job is not None:
+            self.window.after_cancel(self.filter_job)
+            self.filter_job = None
+        if self.app.chapter_navigator is self:
+            self.app.chapter_navigator = None
+        self.window.destroy()
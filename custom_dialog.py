@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk
 from modern_ui import ModernUI
+import metrics
 
 
 class CustomDialog:
@@ -16,6 +17,8 @@ class CustomDialog:
         show_no=True,
     ):
         self.result = None  # 用于存储对话框结果 (True/False)
+        # 计时：从创建到对话框内容完整显示
+        self.open_started = metrics.registry.start()
 
         # 创建对话框窗口 (Toplevel)
         self.dialog = tk.Toplevel(parent)
@@ -112,9 +115,18 @@ class CustomDialog:
         # 禁止调整窗口大小
         self.dialog.resizable(False, False)
 
+        if self.open_started:
+            # 排在已挂起的重绘之后执行，此时对话框内容已完整显示
+            metrics.registry.incr("dialogs")
+            self.dialog.after_idle(self.on_shown)
+
         # 等待窗口关闭 (阻塞父窗口直到此对话框关闭)
         self.dialog.wait_window()
 
+    def on_shown(self):
+        """记录对话框打开耗时"""
+        metrics.registry.stop("dialog_open_ms", self.open_started)
+
     def yes_clicked(self):
         """“是”按钮点击事件"""
         self.result = True
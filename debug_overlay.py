@@ -0,0 +1,80 @@
+import tkinter as tk
+from modern_ui import ModernUI
+
+
+class DebugOverlay:
+    """调试浮层：在主窗口右上角显示各项延迟指标 (点击浮层导出 JSON)"""
+
+    REFRESH_MS = 500
+
+    def __init__(self, root, metrics):
+        self.root = root
+        self.metrics = metrics
+        self.refresh_job = None
+        self.label = tk.Label(
+            root,
+            font=("Consolas", 9),
+            justify=tk.LEFT,
+            anchor="nw",
+            bd=1,
+            relief=tk.SOLID,
+            padx=6,
+            pady=4,
+            cursor="hand2",
+        )
+        self.label.bind("<Button-1>", self.dump)
+        self.notice = ""  # 导出后短暂显示的提示
+
+    @property
+    def visible(self):
+        return self.refresh_job is not None
+
+    def toggle(self):
+        if self.visible:
+            self.hide()
+        else:
+            self.show()
+
+    def show(self):
+        self.metrics.enable()
+        self.label.place(relx=1.0, x=-10, y=10, anchor="ne")
+        self.label.lift()
+        self.refresh()
+
+    def hide(self):
+        if self.refresh_job is not None:
+            self.root.after_cancel(self.refresh_job)
+            self.refresh_job = None
+        self.label.place_forget()
+
+    def refresh(self):
+        lines = [f"{'指标 (ms)':<22}{'次数':>6}{'p50':>8}{'p95':>8}{'最大':>8}"]
+        for name, histogram in sorted(self.metrics.histograms.items()):
+            lines.append(
+                f"{name:<24}{histogram.count:>6}{histogram.quantile(0.5):>8.1f}"
+                f"{histogram.quantile(0.95):>8.1f}{histogram.maximum:>8.1f}"
+            )
+        if self.metrics.counters:
+            lines.append(
+                "  ".join(f"{k}={v}" for k, v in sorted(self.metrics.counters.items()))
+            )
+        lines.append(self.notice or "点击导出 JSON")
+        # 每次刷新时取当前主题颜色，切换主题后无需单独处理
+        self.label.configure(
+            text="\n".join(lines),
+            bg=ModernUI.get_theme_color("card_bg"),
+            fg=ModernUI.get_theme_color("text"),
+        )
+        self.label.lift()
+        self.refresh_job = self.root.after(self.REFRESH_MS, self.refresh)
+
+    def dump(self, event=None):
+        try:
+            path = self.metrics.dump()
+            self.notice = f"已导出: {path}"
+        except OSError as e:
+            self.notice = f"导出失败: {e}"
+        self.root.after(3000, self.clear_notice)
+
+    def clear_notice(self):
+        self.notice = ""
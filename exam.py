@@ -0,0 +1,216 @@
+"""模拟考试：从题库抽题组成一份试卷，限时作答，交卷后统一判分
+
+考试期间只记录作答，不判分；交卷 (手动或超时自动交卷) 时对整份试卷一次性判分，
+作答过程中每题只需保存选项，在较慢的机器上也不会因判分和统计刷新而卡顿。
+
+时间限制分两种：全卷限时 (到时自动交卷) 和可选的每题限时 (到时保留已选答案并
+自动进入下一题，最后一题到时交卷)。设置了每题限时时只能依次向后作答。
+Exam 不依赖 Tk，由界面按共享时钟 (scheduler.Ticker) 传入当前时刻调用 tick()。
+"""
+
+import math
+import random
+from collections import namedtuple
+
+from quiz_engine import QUESTION_TYPES, normalize_answer
+
+# 各题型分值 (与 grading.DEFAULT_POINTS 相同，这里不为此导入 numpy)
+POINTS = {"判断题": 1.0, "单选题": 1.0, "多选题": 2.0}
+DEFAULT_COUNTS = {"判断题": 10, "单选题": 20, "多选题": 10}
+DEFAULT_TIME_LIMIT = 30 * 60  # 全卷限时 (秒)
+
+# tick() 返回的事件
+QUESTION_TIMEOUT = "question_timeout"  # 本题时间到，已进入下一题
+TIME_UP = "time_up"  # 全卷时间到 (或最后一题时间到)，需要交卷
+
+Answer = namedtuple(
+    "Answer", "question user_answer correct_answer is_correct points timed_out"
+)
+
+
+def sample_questions(question_bank, counts, rng=None):
+    """按题型从整个题库中随机抽题，返回按 QUESTION_TYPES 顺序排列的题目列表
+
+    每种题型用蓄水池抽样，只顺序遍历题库一次，额外内存只有抽中的题目；
+    某题型题目不足时全部选入。
+    """
+    rng = rng or random.Random()
+    reservoirs = {q_type: [] for q_type in QUESTION_TYPES}
+    seen = dict.fromkeys(QUESTION_TYPES, 0)
+    for questions in question_bank.chapters:
+        for question in questions:
+            q_type = question["type"]
+            want = counts.get(q_type, 0)
+            if want <= 0:
+                continue
+            seen[q_type] += 1
+            reservoir = reservoirs[q_type]
+            if len(reservoir) < want:
+                reservoir.append(question)
+            else:
+                slot = rng.randrange(seen[q_type])
+                if slot < want:
+                    reservoir[slot] = question
+    paper = []
+    for q_type in QUESTION_TYPES:
+        rng.shuffle(reservoirs[q_type])
+        paper.extend(reservoirs[q_type])
+    return paper
+
+
+def format_clock(seconds):
+    """倒计时显示 (如 29:59、1:05:00)，秒数向上取整"""
+    seconds = math.ceil(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes:02d}:{seconds:02d}"
+
+
+def grade_exam(questions, answers, timed_out=None):
+    """对整份试卷判分，返回 ExamResult"""
+    timed_out = timed_out or [False] * len(questions)
+    results = []
+    for question, user_answer, timeout in zip(questions, answers, timed_out):
+        correct_answer = normalize_answer(question)
+        is_correct = bool(user_answer) and user_answer == correct_answer
+        points = POINTS.get(question["type"], 1.0)
+        results.append(
+            Answer(
+                question,
+                user_answer,
+                correct_answer,
+                is_correct,
+                points if is_correct else 0.0,
+                timeout,
+            )
+        )
+    return ExamResult(results)
+
+
+class ExamResult:
+    """考试结果：得分、各题型正确数和错题"""
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.score = sum(answer.points for answer in answers)
+        self.total = sum(POINTS.get(a.question["type"], 1.0) for a in answers)
+        self.elapsed = 0.0  # 实际用时 (秒)，由 Exam.finish() 填写
+        self.by_type = {}  # {题型: [正确数, 题数]}
+        for answer in answers:
+            counts = self.by_type.setdefault(answer.question["type"], [0, 0])
+            counts[0] += answer.is_correct
+            counts[1] += 1
+
+    @property
+    def correct(self):
+        return sum(answer.is_correct for answer in self.answers)
+
+    @property
+    def unanswered(self):
+        return sum(not answer.user_answer for answer in self.answers)
+
+    @property
+    def wrong(self):
+        """答错和未作答的题目"""
+        return [answer for answer in self.answers if not answer.is_correct]
+
+
+class Exam:
+    """一场模拟考试的作答状态和计时 (时刻均为 time.monotonic())"""
+
+    def __init__(self, questions, time_limit=DEFAULT_TIME_LIMIT, question_limit=None):
+        self.questions = questions
+        self.time_limit = time_limit or None  # 全卷限时 (秒)，None 表示不限时
+        self.question_limit = question_limit or None  # 每题限时 (秒)
+        self.answers = [""] * len(questions)
+        self.timed_out = [False] * len(questions)  # 是否因本题时间到而离开
+        self.index = 0
+        self.started = None
+        self.question_started = None
+        self.result = None
+
+    @property
+    def size(self):
+        return len(self.questions)
+
+    @property
+    def current_question(self):
+        return self.questions[self.index]
+
+    @property
+    def finished(self):
+        return self.result is not None
+
+    @property
+    def can_go_back(self):
+        return self.question_limit is None and self.index > 0
+
+    @property
+    def answered_count(self):
+        return sum(1 for answer in self.answers if answer)
+
+    def start(self, now):
+        self.started = now
+        self.question_started = now
+
+    def remaining(self, now):
+        """全卷剩余秒数 (不限时为 None)"""
+        if self.time_limit is None:
+            return None
+        return max(0.0, self.started + self.time_limit - now)
+
+    def question_remaining(self, now):
+        """本题剩余秒数 (不限时为 None)"""
+        if self.question_limit is None:
+            return None
+        return max(0.0, self.question_started + self.question_limit - now)
+
+    def record(self, answer):
+        """保存当前题目的作答 (不判分)"""
+        self.answers[self.index] = answer
+
+    def go_to(self, index, now):
+        """切换到第 index 题 (设置了每题限时时只能向后)"""
+        if not 0 <= index < self.size:
+            return False
+        if self.question_limit is not None and index < self.index:
+            return False
+        self.index = index
+        self.question_started = now
+        return True
+
+    def expired(self, now):
+        """全卷或本题的时间是否已到"""
+        remaining = self.remaining(now)
+        question_remaining = self.question_remaining(now)
+        return (remaining is not None and remaining <= 0) or (
+            question_remaining is not None and question_remaining <= 0
+        )
+
+    def tick(self, now):
+        """检查时间限制，返回 TIME_UP、QUESTION_TIMEOUT 或 None"""
+        if self.finished:
+            return None
+        remaining = self.remaining(now)
+        if remaining is not None and remaining <= 0:
+            return TIME_UP
+        question_remaining = self.question_remaining(now)
+        if question_remaining is not None and question_remaining <= 0:
+            self.timed_out[self.index] = True
+            if self.index + 1 >= self.size:
+                return TIME_UP
+            self.go_to(self.index + 1, now)
+            return QUESTION_TIMEOUT
+        return None
+
+    def finish(self, now):
+        """交卷：统一判分并返回 ExamResult (重复调用返回同一结果)"""
+        if self.result is None:
+            self.result = grade_exam(self.questions, self.answers, self.timed_out)
+            elapsed = now - self.started
+            if self.time_limit is not None:
+                elapsed = min(elapsed, self.time_limit)
+            self.result.elapsed = elapsed
+        return self.result
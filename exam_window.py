@@ -0,0 +1,415 @@
+import time
+import tkinter as tk
+from tkinter import ttk, messagebox
+from modern_ui import ModernUI
+from question_card import QuestionCard
+import exam
+from quiz_engine import OPTION_LETTERS, QUESTION_TYPES, answer_text, option_text
+
+
+class ExamWindow:
+    """模拟考试窗口 (设置、限时作答和成绩单三个页面)
+
+    倒计时由应用的共享时钟 (app.ticker) 驱动，只在显示的秒数变化时更新标签。
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.exam = None
+        self.auto_submitted = False
+        self.shown_clock = None  # 当前显示的倒计时文本 (变化时才更新标签)
+        self.buttons = []
+
+        self.window = tk.Toplevel(app.root)
+        self.window.title("模拟考试")
+        self.window.geometry("760x600")
+        self.window.configure(bg=ModernUI.get_theme_color("bg"))
+        self.window.minsize(600, 480)
+
+        # --- 标题栏 ---
+        title_bar = ttk.Frame(self.window, style="Title.TFrame", padding="0 5")
+        title_bar.pack(fill=tk.X)
+        self.title_label = ttk.Label(
+            title_bar,
+            text="模拟考试",
+            style="Title.TLabel",
+            padding=8,
+        )
+        self.title_label.pack()
+
+        self.setup_page = self._build_setup_page()
+        self.exam_page = self._build_exam_page()
+        self.result_page = self._build_result_page()
+        self.current_page = None
+        self._show_page(self.setup_page)
+
+        self.window.bind("<<ThemeChanged>>", self._on_theme_changed)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+    # --- 页面 ---
+    def _create_button(self, parent, text, command, color_role):
+        button = ModernUI.create_rounded_button(
+            parent,
+            text=text,
+            command=command,
+            width=100,
+            height=35,
+            corner_radius=17,
+            color_role=color_role,
+            fg="white",
+        )
+        self.buttons.append(button)
+        return button
+
+    def _build_setup_page(self):
+        page = ttk.Frame(self.window, style="TFrame")
+        settings = self.app.config.get("exam", {})
+        counts = settings.get("counts", exam.DEFAULT_COUNTS)
+
+        button_frame = ttk.Frame(page, style="TFrame", padding="0 10 10 10")
+        button_frame.pack(side=tk.BOTTOM, fill=tk.X)
+        button_frame.columnconfigure(0, weight=1)
+        self._create_button(button_frame, "开始考试", self.start, "primary").grid(
+            row=0, column=0, pady=5
+        )
+
+        form = ttk.Frame(page, style="Card.TFrame", padding="20 15")
+        form.pack(fill=tk.X, padx=10, pady=10)
+        form.columnconfigure(1, weight=1)
+        ttk.Label(form, text="试卷设置", style="SummaryHeader.TLabel").grid(
+            row=0, column=0, columnspan=2, sticky="w", pady=(0, 8)
+        )
+
+        # 各输入项的变量 {名称: StringVar}
+        self.setting_vars = {}
+        rows = [
+            (f"{q_type}题数", q_type, counts.get(q_type, 0))
+            for q_type in QUESTION_TYPES
+        ]
+        rows.append(
+            (
+                "全卷限时 (分钟，0 为不限时)",
+                "minutes",
+                settings.get("minutes", exam.DEFAULT_TIME_LIMIT // 60),
+            )
+        )
+        rows.append(
+            (
+                "每题限时 (秒，0 为不限时)",
+                "question_seconds",
+                settings.get("question_seconds", 0),
+            )
+        )
+        for row, (text, name, value) in enumerate(rows, 1):
+            ttk.Label(form, text=text, style="StatsHeader.TLabel").grid(
+                row=row, column=0, sticky="w", pady=4
+            )
+            var = tk.StringVar(value=str(value))
+            ttk.Spinbox(form, from_=0, to=999, textvariable=var, width=8).grid(
+                row=row, column=1, sticky="w", padx=(15, 0), pady=4
+            )
+            self.setting_vars[name] = var
+
+        ttk.Label(
+            page,
+            text="考试期间不显示对错，交卷或时间到后统一判分。设置了每题限时时，"
+            "本题时间到将保留已选答案并进入下一题，且不能返回修改。",
+            style="Secondary.TLabel",
+            wraplength=680,
+        ).pack(fill=tk.X, padx=15)
+        return page
+
+    def _build_exam_page(self):
+        page = ttk.Frame(self.window, style="TFrame")
+
+        status = ttk.Frame(page, style="TFrame", padding="15 10 15 5")
+        status.pack(fill=tk.X)
+        self.progress_label = ttk.Label(status, style="TLabel", font=("微软雅黑", 11))
+        self.progress_label.pack(side=tk.LEFT)
+        self.clock_label = ttk.Label(
+            status, style="TLabel", font=("微软雅黑", 12, "bold")
+        )
+        self.clock_label.pack(side=tk.RIGHT)
+
+        button_frame = ttk.Frame(page, style="TFrame", padding="0 10 10 10")
+        button_frame.pack(side=tk.BOTTOM, fill=tk.X)
+        for col in range(3):
+            button_frame.columnconfigure(col, weight=1)
+        self.prev_button = self._create_button(
+            button_frame, "上一题", lambda: self.move(-1), "neutral"
+        )
+        self.prev_button.grid(row=0, column=0, pady=5)
+        self.next_button = self._create_button(
+            button_frame, "下一题", lambda: self.move(1), "primary"
+        )
+        self.next_button.grid(row=0, column=1, pady=5)
+        self._create_button(button_frame, "交卷", self.confirm_submit, "danger").grid(
+            row=0, column=2, pady=5
+        )
+
+        card_frame = ttk.Frame(page, style="Card.TFrame", padding="20 15")
+        card_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        card_frame.rowconfigure(0, weight=1)
+        card_frame.columnconfigure(0, weight=1)
+        self.card = QuestionCard(
+            card_frame, self.app.question_font, self.app.option_font
+        )
+        self.card.grid(row=0, column=0, sticky="nsew")
+        return page
+
+    def _build_result_page(self):
+        page = ttk.Frame(self.window, style="TFrame")
+
+        button_frame = ttk.Frame(page, style="TFrame", padding="0 10 10 10")
+        button_frame.pack(side=tk.BOTTOM, fill=tk.X)
+        button_frame.columnconfigure(0, weight=1)
+        button_frame.columnconfigure(1, weight=1)
+        self._create_button(button_frame, "再考一次", self.restart, "primary").grid(
+            row=0, column=0, pady=5
+        )
+        self._create_button(button_frame, "关闭", self.close, "neutral").grid(
+            row=0, column=1, pady=5
+        )
+
+        summary = ttk.Frame(page, style="Summary.TFrame", padding="15 10")
+        summary.pack(fill=tk.X, padx=10, pady=(10, 5))
+        ttk.Label(summary, text="成绩", style="SummaryHeader.TLabel").pack(
+            anchor=tk.W, pady=(0, 8)
+        )
+        self.score_label = ttk.Label(
+            summary, style="Summary.TLabel", font=("微软雅黑", 14, "bold")
+        )
+        self.score_label.pack(anchor=tk.W)
+        self.detail_label = ttk.Label(summary, style="Summary.TLabel")
+        self.detail_label.pack(anchor=tk.W, pady=(4, 0))
+        self.type_label = ttk.Label(summary, style="Summary.TLabel")
+        self.type_label.pack(anchor=tk.W, pady=(4, 0))
+
+        # 错题列表 (只读文本，交卷时一次性填入)
+        list_frame = ttk.Frame(page, style="Card.TFrame", padding="10 5")
+        list_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        list_frame.rowconfigure(0, weight=1)
+        list_frame.columnconfigure(0, weight=1)
+        self.wrong_text = tk.Text(
+            list_frame,
+            wrap=tk.WORD,
+            font=("微软雅黑", 10),
+            bg=ModernUI.get_theme_color("card_bg"),
+            fg=ModernUI.get_theme_color("text"),
+            bd=0,
+            relief=tk.FLAT,
+            highlightthickness=0,
+            state="disabled",
+        )
+        self.wrong_text.grid(row=0, column=0, sticky="nsew")
+        scrollbar = ttk.Scrollbar(
+            list_frame, orient=tk.VERTICAL, command=self.wrong_text.yview
+        )
+        scrollbar.grid(row=0, column=1, sticky="ns")
+        self.wrong_text.configure(yscrollcommand=scrollbar.set)
+        return page
+
+    def _show_page(self, page):
+        if self.current_page is not None:
+            self.current_page.pack_forget()
+        page.pack(fill=tk.BOTH, expand=True)
+        self.current_page = page
+
+    # --- 考试 ---
+    def read_settings(self):
+        """读取并保存设置，返回 (各题型题数, 全卷限时秒数, 每题限时秒数)；无效时返回 None"""
+        values = {}
+        for name, var in self.setting_vars.items():
+            try:
+                values[name] = int(var.get().strip())
+            except ValueError:
+                values[name] = -1
+            if values[name] < 0:
+                messagebox.showerror(
+                    "错误", "题数和限时请输入非负整数。", parent=self.window
+                )
+                return None
+        counts = {q_type: values[q_type] for q_type in QUESTION_TYPES}
+        self.app.config["exam"] = {
+            "counts": counts,
+            "minutes": values["minutes"],
+            "question_seconds": values["question_seconds"],
+        }
+        self.app.save_config()
+        return counts, values["minutes"] * 60, values["question_seconds"]
+
+    def start(self):
+        """按设置抽题并开始计时"""
+        settings = self.read_settings()
+        if settings is None:
+            return
+        counts, time_limit, question_limit = settings
+        bank = self.app.question_bank  # 当前标签页的题库 (可能已全部关闭)
+        questions = exam.sample_questions(bank, counts) if bank else []
+        if not questions:
+            messagebox.showerror(
+                "错误", "题库中没有符合设置的题目。", parent=self.window
+            )
+            return
+
+        self.exam = exam.Exam(questions, time_limit, question_limit)
+        self.auto_submitted = False
+        self.shown_clock = None
+        self.exam.start(time.monotonic())
+        self._show_page(self.exam_page)
+        self.show_current()
+        self.app.ticker.add(self.on_tick)
+
+    def show_current(self):
+        """显示当前题目并恢复已保存的作答"""
+        current = self.exam
+        self.card.layout(current.current_question)
+        for letter in current.answers[current.index]:
+            self.card.choose(letter)
+        self.progress_label.configure(
+            text=f"第 {current.index + 1} / {current.size} 题    "
+            f"已答 {current.answered_count}"
+        )
+        self.prev_button.set_state(tk.NORMAL if current.can_go_back else tk.DISABLED)
+        last = current.index + 1 >= current.size
+        self.next_button.set_state(tk.DISABLED if last else tk.NORMAL)
+
+    def move(self, delta):
+        if self.exam is None or self.exam.finished:
+            return
+        self.exam.record(self.card.get_answer())
+        if self.exam.go_to(self.exam.index + delta, time.monotonic()):
+            self.show_current()
+
+    def on_tick(self, now):
+        """共享时钟回调：检查时间限制，倒计时的秒数变化时刷新显示"""
+        current = self.exam
+        if current is None or current.finished or not self.exists():
+            return False
+        if current.expired(now):
+            current.record(self.card.get_answer())
+            event = current.tick(now)
+            if event == exam.TIME_UP:
+                self.auto_submitted = True
+                self.submit(now)
+                return False
+            if event == exam.QUESTION_TIMEOUT:
+                self.show_current()
+        self.update_clock(now)
+        return True
+
+    def update_clock(self, now):
+        current = self.exam
+        remaining = current.remaining(now)
+        if remaining is None:
+            text = f"已用 {exam.format_clock(now - current.started)}"
+        else:
+            text = f"剩余 {exam.format_clock(remaining)}"
+        question_remaining = current.question_remaining(now)
+        if question_remaining is not None:
+            text += f"    本题 {exam.format_clock(question_remaining)}"
+        if text != self.shown_clock:
+            self.clock_label.configure(text=text)
+            self.shown_clock = text
+
+    def confirm_submit(self):
+        if self.exam is None or self.exam.finished:
+            return
+        self.exam.record(self.card.get_answer())
+        unanswered = self.exam.size - self.exam.answered_count
+        if unanswered and not messagebox.askyesno(
+            "交卷", f"还有 {unanswered} 题未作答，确定交卷吗？", parent=self.window
+        ):
+            return
+        self.submit(time.monotonic())
+
+    def submit(self, now):
+        """交卷：停止计时，统一判分并显示成绩单"""
+        self.app.ticker.remove(self.on_tick)
+        self.show_result(self.exam.finish(now))
+
+    def show_result(self, result):
+        score = f"{result.score:g} / {result.total:g} 分"
+        if self.auto_submitted:
+            score += "  (时间到，已自动交卷)"
+        self.score_label.configure(text=score)
+        self.detail_label.configure(
+            text=f"答对 {result.correct} / {len(result.answers)} 题    "
+            f"未作答 {result.unanswered} 题    用时 {exam.format_clock(result.elapsed)}"
+        )
+        self.type_label.configure(
+            text="    ".join(
+                f"{q_type} {correct}/{total}"
+                for q_type, (correct, total) in result.by_type.items()
+            )
+        )
+
+        lines = []
+        for number, answer in enumerate(result.answers, 1):
+            if answer.is_correct:
+                continue
+            question = answer.question
+            lines.append(f"{number}. 【{question['type']}】{question['question']}")
+            options = question.get("options") or ()
+            for letter in OPTION_LETTERS[: len(options)]:
+                lines.append(f"    {option_text(question, letter)}")
+            q_type = question["type"]
+            mine = answer_text(q_type, answer.user_answer) or "未作答"
+            correct = answer_text(q_type, answer.correct_answer)
+            note = "  (本题超时)" if answer.timed_out else ""
+            lines.append(f"    你的答案: {mine}    正确答案: {correct}{note}")
+            lines.append("")
+        if not lines:
+            lines.append("全部答对！")
+        self.wrong_text.configure(state="normal")
+        self.wrong_text.delete("1.0", tk.END)
+        self.wrong_text.insert(tk.END, "\n".join(lines))
+        self.wrong_text.configure(state="disabled")
+        self._show_page(self.result_page)
+
+    def restart(self):
+        self.exam = None
+        self._show_page(self.setup_page)
+
+    # --- 窗口 ---
+    def exists(self):
+        """窗口是否仍然打开"""
+        try:
+            return bool(self.window.winfo_exists())
+        except tk.TclError:
+            return False
+
+    def show(self):
+        """把已打开的窗口提到最前"""
+        self.window.deiconify()
+        self.window.lift()
+
+    def close(self):
+        """关闭窗口 (考试进行中时先确认放弃)"""
+        if (
+            self.exam is not None
+            and not self.exam.finished
+            and not messagebox.askyesno(
+                "放弃考试", "考试尚未交卷，确定放弃吗？", parent=self.window
+            )
+        ):
+            return
+        self.app.ticker.remove(self.on_tick)
+        if self.app.exam_window is self:
+            self.app.exam_window = None
+        self.window.destroy()
+
+    def _on_theme_changed(self, event=None):
+        if event is not None and event.widget is not self.window:
+            return
+        self.window.configure(bg=ModernUI.get_theme_color("bg"))
+        self.card.apply_theme()
+        self.wrong_text.configure(
+            bg=ModernUI.get_theme_color("card_bg"),
+            fg=ModernUI.get_theme_color("text"),
+        )
+        for button in self.buttons:
+            state = tk.DISABLED if button.is_disabled else tk.NORMAL
+            button.configure(bg=ModernUI.get_theme_color("bg"))
+            button.itemconfig(button.shadow, fill=ModernUI.get_theme_color("bg"))
+            button.set_state(state)
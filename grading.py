@@ -0,0 +1,300 @@
+"""批量阅卷：按试卷定义为大量答题卡计分，输出学生成绩和逐题统计
+
+答案按位编码为掩码 (A=1, B=2, C=4, D=8)，全部答题卡组成一个
+(学生数, 题数) 的 uint8 矩阵，计分和统计都用 NumPy 整体运算完成。
+
+用法: python grading.py 试卷.json 答题卡.csv|.jsonl [--partial none|subset|per_option]
+      [--scores 成绩.csv] [--items 逐题统计.csv]
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+
+try:
+    import numpy as np
+except ImportError:  # 批量阅卷需要 numpy，答题程序本身不需要
+    np = None
+
+OPTION_LETTERS = "ABCD"
+DEFAULT_POINTS = {"判断题": 1.0, "单选题": 1.0, "多选题": 2.0}
+
+# 多选题部分得分规则
+PARTIAL_NONE = "none"  # 全对才得分
+PARTIAL_SUBSET = "subset"  # 少选 (无错选) 按选对比例得分
+PARTIAL_PER_OPTION = "per_option"  # 每个选项单独判对错，按判对的选项比例得分
+PARTIAL_MODES = (PARTIAL_NONE, PARTIAL_SUBSET, PARTIAL_PER_OPTION)
+
+
+def answer_to_mask(answer):
+    """把答案字母串转换为位掩码 ("AC" -> 5)，无法识别的字符忽略"""
+    mask = 0
+    for letter in (answer or "").upper():
+        index = OPTION_LETTERS.find(letter)
+        if index >= 0:
+            mask |= 1 << index
+    return mask
+
+
+def mask_to_answer(mask):
+    """把位掩码转换回答案字母串 (5 -> "AC")"""
+    return "".join(letter for i, letter in enumerate(OPTION_LETTERS) if mask & (1 << i))
+
+
+def require_numpy():
+    if np is None:
+        raise RuntimeError("批量阅卷需要安装 numpy (pip install numpy)")
+
+
+class Paper:
+    """试卷定义：题型、标准答案掩码和分值
+
+    标准答案为空 (或没有可识别的选项字母) 的题目无法判分 (未作答会与之相同而得分)，
+    这样的试卷在读取时拒绝，抛出 ValueError。
+    """
+
+    def __init__(self, questions, title=""):
+        require_numpy()
+        self.title = title
+        self.questions = questions
+        self.types = [q["type"] for q in questions]
+        self.key = np.array(
+            [answer_to_mask(q.get("answer")) for q in questions], dtype=np.uint8
+        )
+        blank = np.flatnonzero(self.key == 0)
+        if len(blank):
+            numbers = "、".join(str(i + 1) for i in blank[:10].tolist())
+            more = f"等 {len(blank)} 道题" if len(blank) > 10 else ""
+            raise ValueError(f"第 {numbers} 题{more}没有标准答案，无法判分")
+        self.points = np.array(
+            [float(q.get("points", DEFAULT_POINTS[q["type"]])) for q in questions],
+            dtype=np.float64,
+        )
+        self.is_multi = np.array([t == "多选题" for t in self.types], dtype=bool)
+
+    @property
+    def size(self):
+        return len(self.questions)
+
+    @classmethod
+    def load(cls, path):
+        """读取试卷 JSON ({"title": ..., "questions": [{"type", "answer", "points"}]})"""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["questions"], data.get("title", ""))
+
+
+class AnswerSheets:
+    """一批答题卡：学生编号列表和 (学生数, 题数) 的答案掩码矩阵"""
+
+    def __init__(self, student_ids, masks):
+        self.student_ids = student_ids
+        self.masks = masks
+
+    @classmethod
+    def from_rows(cls, rows, size):
+        """由 [(学生编号, [答案, ...]), ...] 构建；缺少的答案视为未作答"""
+        require_numpy()
+        student_ids = []
+        flat = []  # 全部掩码按行展开，最后一次性转换为矩阵
+        cache = {}  # 答案串 -> 掩码 (不同的答案串很少，避免重复解析)
+        padding = [0] * size
+        for student_id, answers in rows:
+            student_ids.append(student_id)
+            encoded = []
+            for answer in answers[:size]:
+                mask = cache.get(answer)
+                if mask is None:
+                    mask = cache[answer] = answer_to_mask(answer)
+                encoded.append(mask)
+            flat.extend(encoded)
+            if len(encoded) < size:
+                flat.extend(padding[len(encoded) :])
+        masks = np.array(flat, dtype=np.uint8).reshape(len(rows), size)
+        return cls(student_ids, masks)
+
+    @classmethod
+    def load(cls, path, size):
+        """读取 CSV (学生编号, 第1题, 第2题, ...；可有表头) 或 JSONL
+        ({"student": 编号, "answers": [...]}) 格式的答题卡"""
+        rows = []
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            if os.path.splitext(path)[1].lower() == ".jsonl":
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        record = json.loads(line)
+                        rows.append((str(record["student"]), list(record["answers"])))
+            else:
+                reader = csv.reader(f)
+                for row in reader:
+                    if not row:
+                        continue
+                    if not rows and row[0].strip() in ("student", "学生", "学号"):
+                        continue  # 跳过表头
+                    # 答案中的空白在转换掩码时会被忽略，不必逐格清理
+                    rows.append((row[0].strip(), row[1:]))
+        return cls.from_rows(rows, size)
+
+
+class GradeReport:
+    """阅卷结果：每名学生的总分和每道题的统计"""
+
+    def __init__(self, paper, sheets, item_scores):
+        self.paper = paper
+        self.student_ids = sheets.student_ids
+        self.item_scores = item_scores  # (学生数, 题数) 每题得分
+        self.scores = item_scores.sum(axis=1)
+        self.full_marks = float(paper.points.sum())
+
+        masks = sheets.masks
+        full = item_scores >= paper.points  # 每题是否得满分
+        self.discrimination = point_biserial(full, self.scores)
+        if len(masks):
+            self.correct_rate = full.mean(axis=0)
+            self.mean_score = item_scores.mean(axis=0)
+            self.blank_rate = (masks == 0).mean(axis=0)
+            # 每个选项被选择的比例 (题数, 4)
+            self.option_rates = np.stack(
+                [((masks >> i) & 1).mean(axis=0) for i in range(len(OPTION_LETTERS))],
+                axis=1,
+            )
+        else:
+            zeros = np.zeros(paper.size)
+            self.correct_rate = self.mean_score = self.blank_rate = zeros
+            self.option_rates = np.zeros((paper.size, len(OPTION_LETTERS)))
+
+    def write_scores(self, path):
+        """写出学生成绩 CSV (学号, 总分, 得分率, 每题得分...)"""
+        with open(path, "w", encoding="utf-8-sig", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(
+                ["学号", "总分", "得分率"]
+                + [f"第{i + 1}题" for i in range(self.paper.size)]
+            )
+            texts = {}  # 分值 -> 文本 (每题得分的取值很少，避免重复格式化)
+            for student_id, score, items in zip(
+                self.student_ids, self.scores.tolist(), self.item_scores.tolist()
+            ):
+                # 满分为 0 (所有题目分值都为 0) 时得分率记为 0
+                rate = score / self.full_marks if self.full_marks else 0.0
+                row = [student_id, f"{score:g}", f"{rate:.4f}"]
+                for s in items:
+                    text = texts.get(s)
+                    if text is None:
+                        text = texts[s] = f"{s:g}"
+                    row.append(text)
+                writer.writerow(row)
+
+    def write_items(self, path):
+        """写出逐题统计 CSV (题型, 答案, 分值, 正确率, 平均分, 区分度, 未答率, 各选项选择率)"""
+        with open(path, "w", encoding="utf-8-sig", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(
+                ["题号", "题型", "答案", "分值", "正确率", "平均分", "区分度", "未答率"]
+                + [f"选{letter}率" for letter in OPTION_LETTERS]
+            )
+            for i in range(self.paper.size):
+                writer.writerow(
+                    [
+                        i + 1,
+                        self.paper.types[i],
+                        mask_to_answer(int(self.paper.key[i])),
+                        f"{self.paper.points[i]:g}",
+                        f"{self.correct_rate[i]:.4f}",
+                        f"{self.mean_score[i]:.4f}",
+                        f"{self.discrimination[i]:.4f}",
+                        f"{self.blank_rate[i]:.4f}",
+                    ]
+                    + [f"{rate:.4f}" for rate in self.option_rates[i]]
+                )
+
+
+def point_biserial(correct, totals):
+    """每道题答对与否和总分的点二列相关系数 (题目区分度)"""
+    if len(totals) < 2:
+        return np.zeros(correct.shape[1])
+    x = correct.astype(np.float64)
+    x -= x.mean(axis=0)
+    y = totals - totals.mean()
+    denominator = np.sqrt((x * x).sum(axis=0) * (y * y).sum())
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = (x * y[:, None]).sum(axis=0) / denominator
+    return np.nan_to_num(r)
+
+
+# 每个掩码值中置位的个数 (选择的选项数)
+POPCOUNT = (
+    np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+    if np is not None
+    else None
+)
+
+
+def grade(paper, sheets, partial=PARTIAL_NONE):
+    """为所有答题卡计分，返回 GradeReport"""
+    require_numpy()
+    if partial not in PARTIAL_MODES:
+        raise ValueError(f"未知的部分得分规则: {partial}")
+    masks = sheets.masks
+    key = paper.key
+    points = paper.points
+
+    exact = masks == key  # (学生数, 题数)
+    item_scores = exact * points
+
+    if partial != PARTIAL_NONE and paper.is_multi.any():
+        multi = paper.is_multi
+        m = masks[:, multi]
+        k = key[multi]
+        p = points[multi]
+        key_bits = np.maximum(POPCOUNT[k], 1).astype(np.float64)
+        if partial == PARTIAL_SUBSET:
+            # 没有错选且至少选了一项：按选对的比例得分
+            no_wrong = (m & ~k) == 0
+            ratio = np.where(no_wrong & (m != 0), POPCOUNT[m] / key_bits, 0.0)
+        else:
+            # 每个选项判对 (该选/不该选) 即得 1/4；未作答不得分
+            wrong_bits = POPCOUNT[m ^ k]
+            ratio = np.where(
+                m != 0, (len(OPTION_LETTERS) - wrong_bits) / len(OPTION_LETTERS), 0.0
+            )
+        item_scores[:, multi] = ratio * p
+
+    return GradeReport(paper, sheets, item_scores)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="批量阅卷")
+    parser.add_argument("paper", help="试卷定义 (.json)")
+    parser.add_argument("sheets", help="答题卡 (.csv 或 .jsonl)")
+    parser.add_argument(
+        "--partial",
+        choices=PARTIAL_MODES,
+        default=PARTIAL_NONE,
+        help="多选题部分得分规则",
+    )
+    parser.add_argument("--scores", default="成绩.csv", help="学生成绩输出文件")
+    parser.add_argument("--items", default="逐题统计.csv", help="逐题统计输出文件")
+    args = parser.parse_args()
+
+    try:
+        paper = Paper.load(args.paper)
+        sheets = AnswerSheets.load(args.sheets, paper.size)
+        report = grade(paper, sheets, args.partial)
+    except (OSError, ValueError, KeyError, RuntimeError) as e:
+        print(f"阅卷失败: {e}", file=sys.stderr)
+        sys.exit(1)
+    report.write_scores(args.scores)
+    report.write_items(args.items)
+    mean = report.scores.mean() if len(report.scores) else 0
+    print(
+        f"已批改 {len(report.student_ids)} 份答题卡，满分 {report.full_marks:g}，"
+        f"平均分 {mean:.2f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+import tkinter as tk
+from tkinter import ttk
+from modern_ui import ModernUI
+from live_host import LEADERBOARD_SIZE
+
+
+class HostWindow:
+    """现场答题主持窗口 (参与者地址、作答进度和实时排行榜)"""
+
+    POLL_MS = 100  # 收件队列的处理间隔 (毫秒)
+
+    def __init__(self, app, host):
+        self.app = app
+        self.host = host  # 已启动的 LiveHost
+        self.poll_job = None
+
+        self.window = tk.Toplevel(app.root)
+        self.window.title("现场答题主持")
+        self.window.geometry("420x520")
+        self.window.configure(bg=ModernUI.get_theme_color("bg"))
+        self.window.minsize(360, 420)
+
+        # --- 标题栏 ---
+        title_bar = ttk.Frame(self.window, style="Title.TFrame", padding="0 5")
+        title_bar.pack(fill=tk.X)
+        ttk.Label(
+            title_bar,
+            text="现场答题主持",
+            style="Title.TLabel",
+            padding=8,
+        ).pack()
+
+        # --- 连接信息 ---
+        info_frame = ttk.Frame(self.window, style="TFrame", padding="15 10 15 5")
+        info_frame.pack(fill=tk.X)
+        ttk.Label(
+            info_frame,
+            text=f"参与者打开: {host.url}",
+            style="TLabel",
+            font=("微软雅黑", 11, "bold"),
+        ).pack(anchor=tk.W, pady=(0, 5))
+        self.status_label = ttk.Label(
+            info_frame, style="Secondary.TLabel", font=("微软雅黑", 9)
+        )
+        self.status_label.pack(anchor=tk.W)
+
+        # --- 底部按钮 (先于排行榜打包，保证窗口缩小时仍然可见) ---
+        button_frame = ttk.Frame(self.window, style="TFrame", padding="0 10 10 10")
+        button_frame.pack(side=tk.BOTTOM, fill=tk.X)
+        button_frame.columnconfigure(0, weight=1)
+        button_frame.columnconfigure(1, weight=1)
+        self.push_button = ModernUI.create_rounded_button(
+            button_frame,
+            text="推送当前题",
+            command=self.push_current,
+            width=120,
+            height=35,
+            corner_radius=17,
+            color_role="primary",
+            fg="white",
+        )
+        self.push_button.grid(row=0, column=0, pady=5)
+        self.stop_button = ModernUI.create_rounded_button(
+            button_frame,
+            text="结束主持",
+            command=self.close,
+            width=120,
+            height=35,
+            corner_radius=17,
+            color_role="danger",
+            fg="white",
+        )
+        self.stop_button.grid(row=0, column=1, pady=5)
+
+        # --- 排行榜 (固定行数，只更新文本) ---
+        board = ttk.Frame(self.window, style="Card.TFrame", padding="15 10")
+        board.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        board.columnconfigure(1, weight=1)
+        ttk.Label(board, text="排行榜", style="SummaryHeader.TLabel").grid(
+            row=0, column=0, columnspan=3, sticky="w", pady=(0, 8)
+        )
+        self.board_rows = []
+        for rank in range(LEADERBOARD_SIZE):
+            labels = (
+                ttk.Label(board, text=f"{rank + 1}.", style="StatsMuted.TLabel"),
+                ttk.Label(board, style="StatsHeader.TLabel", anchor="w"),
+                ttk.Label(board, style="StatsValue.TLabel", anchor="e"),
+            )
+            for col, label in enumerate(labels):
+                label.grid(row=rank + 1, column=col, sticky="ew", padx=4, pady=1)
+            self.board_rows.append(labels)
+
+        self.window.bind("<<ThemeChanged>>", self._on_theme_changed)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.update_view()
+        self.poll()
+
+    # --- 主持 ---
+    def push_question(self, question):
+        """把题目推送给参与者"""
+        self.host.push_question(question)
+        self.update_view()
+
+    def push_current(self):
+        """重新推送当前显示的题目 (作答从零开始计)"""
+        if self.app.current_question:
+            self.push_question(self.app.current_question)
+
+    def poll(self):
+        """成批处理参与者消息，有变化时才刷新界面"""
+        self.poll_job = None
+        if self.host.drain():
+            self.update_view()
+        self.poll_job = self.window.after(self.POLL_MS, self.poll)
+
+    def update_view(self):
+        connected = self.host.connected_count
+        if self.host.current_id:
+            status = (
+                f"在线 {connected} 人    第 {self.host.current_id} 题已作答 "
+                f"{self.host.answer_count} 人"
+            )
+        else:
+            status = f"在线 {connected} 人    尚未推送题目"
+        self.status_label.configure(text=status)
+
+        top = self.host.leaderboard()
+        for i, (_, name_label, score_label) in enumerate(self.board_rows):
+            if i < len(top):
+                player = top[i]
+                name = player.name if player.connected else f"{player.name} (离线)"
+                name_label.configure(text=name)
+                score_label.configure(text=str(player.score))
+            else:
+                name_label.configure(text="")
+                score_label.configure(text="")
+
+    # --- 窗口 ---
+    def exists(self):
+        """窗口是否仍然打开"""
+        try:
+            return bool(self.window.winfo_exists())
+        except tk.TclError:
+            return False
+
+    def show(self):
+        """把已打开的窗口提到最前"""
+        self.window.deiconify()
+        self.window.lift()
+
+    def close(self):
+        """结束主持：关闭服务器和窗口"""
+        if self.poll_job is not None:
+            self.window.after_cancel(self.poll_job)
+            self.poll_job = None
+        self.host.stop()
+        if self.app.host_window is self:
+            self.app.host_window = None
+        self.window.destroy()
+
+    def _on_theme_changed(self, event=None):
+        if event is not None and event.widget is not self.window:
+            return
+        self.window.configure(bg=ModernUI.get_theme_color("bg"))
+        for button in (self.push_button, self.stop_button):
+            button.configure(bg=ModernUI.get_theme_color("bg"))
+            button.itemconfig(button.shadow, fill=ModernUI.get_theme_color("bg"))
+            button.set_state(tk.NORMAL)
@@ -0,0 +1,500 @@
+"""现场答题主持：通过局域网 WebSocket 把当前题目推送给所有参与者并收集作答 (不依赖Tk)
+
+网络部分运行在后台线程的 asyncio 事件循环中；主持端 (界面线程) 只通过
+push_question / drain 与其交互：
+    - 推送的题目只序列化一次，同一份帧字节写给每个连接；
+    - 参与者的加入、作答、离开都进入同一个收件队列，由界面线程定时成批取出，
+      大量同时作答也只触发一次计分和一次排行榜刷新。
+"""
+
+import asyncio
+import base64
+import hashlib
+import heapq
+import json
+import socket
+import struct
+import threading
+import time
+from collections import deque
+
+from quiz_engine import normalize_answer
+
+DEFAULT_PORT = 8766
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC11B85"
+MAX_MESSAGE = 4096  # 参与者消息的最大字节数
+MAX_BUFFERED = 256 * 1024  # 单个连接积压超过此字节数时断开 (网络过慢的参与者)
+ANSWER_WINDOW_MS = 20000  # 速度加分的计时窗口
+LEADERBOARD_SIZE = 10
+
+# 收件队列中的消息类型
+JOIN = "join"
+ANSWER = "answer"
+LEAVE = "leave"
+
+# WebSocket 操作码
+OP_TEXT = 0x1
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+
+def encode_frame(payload, opcode=OP_TEXT):
+    """编码服务器发出的 (不加掩码) WebSocket 帧"""
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < 65536:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    return header + payload
+
+
+def encode_message(data):
+    """把消息编码为文本帧 (调用一次即可发给任意多个连接)"""
+    return encode_frame(
+        json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    )
+
+
+def unmask(payload, mask):
+    """按 RFC 6455 还原客户端帧的掩码 (整数异或，避免逐字节循环)"""
+    length = len(payload)
+    if not length:
+        return payload
+    key = (mask * (length // 4 + 1))[:length]
+    return (int.from_bytes(payload, "big") ^ int.from_bytes(key, "big")).to_bytes(
+        length, "big"
+    )
+
+
+async def read_frame(reader):
+    """读取一个客户端帧，返回 (opcode, payload)"""
+    first, second = await reader.readexactly(2)
+    opcode = first & 0x0F
+    length = second & 0x7F
+    if length == 126:
+        (length,) = struct.unpack("!H", await reader.readexactly(2))
+    elif length == 127:
+        (length,) = struct.unpack("!Q", await reader.readexactly(8))
+    if length > MAX_MESSAGE:
+        raise ValueError("消息过大")
+    if not second & 0x80:
+        raise ValueError("客户端帧必须加掩码")
+    mask = await reader.readexactly(4)
+    return opcode, unmask(await reader.readexactly(length), mask)
+
+
+def local_address():
+    """返回本机的局域网地址 (无法确定时返回 127.0.0.1)"""
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.connect(("10.255.255.255", 1))  # 不会真正发送数据
+            return s.getsockname()[0]
+    except OSError:
+        return "127.0.0.1"
+
+
+class Player:
+    """参与者的得分记录 (只在主持端线程中修改)"""
+
+    __slots__ = ("name", "score", "correct", "answered", "connected")
+
+    def __init__(self, name):
+        self.name = name
+        self.score = 0
+        self.correct = 0
+        self.answered = 0
+        self.connected = True
+
+
+class LiveHost:
+    """现场答题主持端"""
+
+    def __init__(self, host="0.0.0.0", port=DEFAULT_PORT):
+        self.host = host
+        self.port = port
+        self.loop = None
+        self.thread = None
+        self.server = None
+        self.error = None  # 启动失败时的异常
+
+        # --- 网络线程状态 (只在事件循环中访问) ---
+        self.clients = {}  # {client_id: StreamWriter}
+        self.next_client_id = 1
+        self.question_id = 0
+        self.question_sent_at = 0.0  # 当前题目的推送时间 (monotonic)
+        self.question_frame = None  # 当前题目帧 (新加入的参与者也会收到)
+
+        # 网络线程 -> 主持端 的收件队列 (deque 的 append/popleft 是线程安全的)
+        self.inbox = deque()
+
+        # --- 主持端状态 (只在界面线程中访问) ---
+        self.players = {}  # {client_id: Player}
+        self.current_id = 0  # 当前题目编号
+        self.current_answer = None  # 当前题目的标准答案
+        self.answered_ids = set()  # 已作答当前题目的参与者
+        self.answer_count = 0
+
+    # --- 生命周期 ---
+    def start(self, timeout=5):
+        """在后台线程中启动服务器，返回是否成功"""
+        started = threading.Event()
+        self.thread = threading.Thread(
+            target=self._run, args=(started,), name="live-host", daemon=True
+        )
+        self.thread.start()
+        started.wait(timeout)
+        return self.server is not None
+
+    def stop(self):
+        """关闭服务器和所有连接"""
+        if self.loop and self.loop.is_running():
+            self.loop.call_soon_threadsafe(self._shutdown)
+        if self.thread:
+            self.thread.join(timeout=2)
+        self.thread = None
+
+    @property
+    def url(self):
+        host = local_address() if self.host in ("0.0.0.0", "") else self.host
+        return f"http://{host}:{self.port}/"
+
+    def _run(self, started):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.server = self.loop.run_until_complete(
+                asyncio.start_server(self._handle_connection, self.host, self.port)
+            )
+            if not self.port:
+                self.port = self.server.sockets[0].getsockname()[1]
+        except OSError as e:
+            self.error = e
+            started.set()
+            self.loop.close()
+            return
+        started.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            # 取消仍在等待参与者消息的连接任务
+            tasks = asyncio.all_tasks(self.loop)
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                self.loop.run_until_complete(
+                    asyncio.gather(*tasks, return_exceptions=True)
+                )
+            self.loop.close()
+
+    def _shutdown(self):
+        self.server.close()
+        for writer in self.clients.values():
+            writer.close()
+        self.clients.clear()
+        self.loop.stop()
+
+    # --- 主持端接口 (界面线程调用) ---
+    def push_question(self, question):
+        """推送新题目给所有参与者 (不含答案)，之后的作答按此题计分"""
+        self.current_id += 1
+        self.current_answer = normalize_answer(question)
+        self.answered_ids = set()
+        self.answer_count = 0
+        frame = encode_message(
+            {
+                "type": "question",
+                "id": self.current_id,
+                "question_type": question["type"],
+                "question": question["question"],
+                "options": question.get("options", []),
+            }
+        )
+        self.loop.call_soon_threadsafe(self._broadcast_question, self.current_id, frame)
+
+    def drain(self):
+        """取出收件队列中的全部消息并计分，返回是否处理了消息"""
+        if not self.inbox:
+            return False
+        changed = False  # 排行榜是否变化
+        results = []  # [(client_id, 帧)]
+        inbox = self.inbox
+        while inbox:
+            message = inbox.popleft()
+            kind, client_id = message[0], message[1]
+            if kind == ANSWER:
+                _, _, question_id, answer, elapsed_ms = message
+                player = self.players.get(client_id)
+                if (
+                    player is None
+                    or question_id != self.current_id
+                    or client_id in self.answered_ids
+                ):
+                    continue
+                self.answered_ids.add(client_id)
+                self.answer_count += 1
+                is_correct = self.grade(answer)
+                points = self.points_for(is_correct, elapsed_ms)
+                player.answered += 1
+                if is_correct:
+                    player.correct += 1
+                    player.score += points
+                    changed = True
+                results.append(
+                    (
+                        client_id,
+                        {
+                            "type": "result",
+                            "id": question_id,
+                            "correct": is_correct,
+                            "points": points,
+                            "score": player.score,
+                        },
+                    )
+                )
+            elif kind == JOIN:
+                self.players[client_id] = Player(message[2])
+                changed = True
+            elif kind == LEAVE:
+                player = self.players.get(client_id)
+                if player:
+                    player.connected = False
+                    changed = True
+        if results:
+            frames = [(cid, encode_message(data)) for cid, data in results]
+            self.loop.call_soon_threadsafe(self._send_each, frames)
+        if changed:
+            frame = encode_message(
+                {
+                    "type": "leaderboard",
+                    "top": [[p.name, p.score] for p in self.leaderboard()],
+                }
+            )
+            self.loop.call_soon_threadsafe(self._broadcast, frame)
+        return True
+
+    def grade(self, answer):
+        if not isinstance(answer, str) or not answer:
+            return False
+        return "".join(sorted(answer.upper())) == self.current_answer
+
+    @staticmethod
+    def points_for(is_correct, elapsed_ms):
+        """答对得 500 分，越快作答额外加分 (最多 500 分)"""
+        if not is_correct:
+            return 0
+        remaining = max(0.0, 1.0 - elapsed_ms / ANSWER_WINDOW_MS)
+        return 500 + int(500 * remaining)
+
+    def leaderboard(self, size=LEADERBOARD_SIZE):
+        """返回得分最高的参与者"""
+        return heapq.nlargest(size, self.players.values(), key=lambda p: p.score)
+
+    @property
+    def connected_count(self):
+        return sum(1 for p in self.players.values() if p.connected)
+
+    # --- 网络线程 ---
+    def _broadcast_question(self, question_id, frame):
+        self.question_id = question_id
+        self.question_frame = frame
+        self.question_sent_at = time.monotonic()
+        self._broadcast(frame)
+
+    def _broadcast(self, frame):
+        for client_id, writer in list(self.clients.items()):
+            self._send(client_id, writer, frame)
+
+    def _send_each(self, frames):
+        for client_id, frame in frames:
+            writer = self.clients.get(client_id)
+            if writer:
+                self._send(client_id, writer, frame)
+
+    def _send(self, client_id, writer, frame):
+        transport = writer.transport
+        if transport.is_closing():
+            return
+        if transport.get_write_buffer_size() > MAX_BUFFERED:
+            # 跟不上推送速度的连接直接断开，避免内存无限增长
+            transport.abort()
+            return
+        writer.write(frame)
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            writer.close()
+            return
+        headers = {}
+        for line in head.decode("latin-1").split("\r\n")[1:]:
+            name, sep, value = line.partition(":")
+            if sep:
+                headers[name.strip().lower()] = value.strip()
+
+        key = headers.get("sec-websocket-key")
+        if headers.get("upgrade", "").lower() != "websocket" or not key:
+            # 普通HTTP请求：返回参与者网页
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: text/html; charset=utf-8\r\n"
+                b"Content-Length: %d\r\nConnection: close\r\n\r\n" % len(CLIENT_HTML)
+                + CLIENT_HTML
+            )
+            await writer.drain()
+            writer.close()
+            return
+
+        accept = base64.b64encode(
+            hashlib.sha1((key + WS_GUID).encode("latin-1")).digest()
+        ).decode("latin-1")
+        writer.write(
+            (
+                "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+                f"Connection: Upgrade\r\nSec-WebSocket-Accept: {accept}\r\n\r\n"
+            ).encode("latin-1")
+        )
+        client_id = self.next_client_id
+        self.next_client_id += 1
+        joined = False
+        try:
+            while True:
+                opcode, payload = await read_frame(reader)
+                if opcode == OP_CLOSE:
+                    writer.write(encode_frame(b"", OP_CLOSE))
+                    break
+                if opcode == OP_PING:
+                    writer.write(encode_frame(payload, OP_PONG))
+                    continue
+                if opcode != OP_TEXT:
+                    continue
+                received_at = time.monotonic()
+                message = json.loads(payload)
+                if not isinstance(message, dict):
+                    continue
+                kind = message.get("type")
+                if kind == JOIN and not joined:
+                    joined = True
+                    name = str(message.get("name") or f"玩家{client_id}")[:20]
+                    self.clients[client_id] = writer
+                    self.inbox.append((JOIN, client_id, name))
+                    if self.question_frame is not None:
+                        writer.write(self.question_frame)
+                elif kind == ANSWER and joined:
+                    elapsed_ms = (received_at - self.question_sent_at) * 1000
+                    self.inbox.append(
+                        (
+                            ANSWER,
+                            client_id,
+                            message.get("id"),
+                            message.get("answer"),
+                            elapsed_ms,
+                        )
+                    )
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            if joined:
+                self.clients.pop(client_id, None)
+                self.inbox.append((LEAVE, client_id))
+            writer.close()
+
+
+CLIENT_HTML = """<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>QuizUp 现场答题</title>
+<style>
+body { font-family: sans-serif; max-width: 640px; margin: 2em auto; padding: 0 1em;
+       background: #f5f6fa; color: #2d3436; }
+.card { background: #fff; border-radius: 10px; padding: 1.2em; margin: 1em 0; }
+button { display: block; width: 100%; margin: .4em 0; padding: .7em; border: 0;
+         border-radius: 6px; background: #0984e3; color: #fff; font-size: 1em;
+         text-align: left; cursor: pointer; }
+button.selected { background: #6c5ce7; }
+#result.correct { color: #00b894; } #result.wrong { color: #d63031; }
+</style>
+</head>
+<body>
+<div id="join" class="card">
+  <input id="name" placeholder="输入昵称" maxlength="20">
+  <button id="join-button">加入</button>
+</div>
+<div id="game" class="card" hidden>
+  <p id="status">等待主持人出题…</p>
+  <p><b id="type"></b> <span id="question"></span></p>
+  <div id="options"></div>
+  <button id="submit" hidden>提交</button>
+  <p id="result"></p>
+  <ol id="leaderboard"></ol>
+</div>
+<script>
+let ws = null, current = null, selected = new Set();
+function send(data) { ws.send(JSON.stringify(data)); }
+function render(q) {
+  current = q; selected = new Set();
+  document.getElementById("status").textContent = "第 " + q.id + " 题";
+  document.getElementById("type").textContent = "【" + q.question_type + "】";
+  document.getElementById("question").textContent = q.question;
+  document.getElementById("result").textContent = "";
+  const options = document.getElementById("options");
+  options.innerHTML = "";
+  const labels = q.question_type === "判断题" ? ["对", "错"] : q.options;
+  labels.forEach((text, i) => {
+    const letter = String.fromCharCode(65 + i);
+    const button = document.createElement("button");
+    button.textContent = letter + ". " + text;
+    button.onclick = () => {
+      if (q.question_type === "多选题") {
+        selected.has(letter) ? selected.delete(letter) : selected.add(letter);
+        button.classList.toggle("selected");
+      } else {
+        send({type: "answer", id: q.id, answer: letter});
+        options.innerHTML = "";
+      }
+    };
+    options.append(button);
+  });
+  document.getElementById("submit").hidden = q.question_type !== "多选题";
+}
+document.getElementById("submit").onclick = () => {
+  if (!current || !selected.size) return;
+  send({type: "answer", id: current.id, answer: [...selected].join("")});
+  document.getElementById("options").innerHTML = "";
+  document.getElementById("submit").hidden = true;
+};
+document.getElementById("join-button").onclick = () => {
+  ws = new WebSocket("ws://" + location.host + "/ws");
+  ws.onopen = () => {
+    send({type: "join", name: document.getElementById("name").value});
+    document.getElementById("join").hidden = true;
+    document.getElementById("game").hidden = false;
+  };
+  ws.onclose = () => { document.getElementById("status").textContent = "连接已断开"; };
+  ws.onmessage = (event) => {
+    const data = JSON.parse(event.data);
+    if (data.type === "question") render(data);
+    else if (data.type === "result") {
+      const result = document.getElementById("result");
+      result.className = data.correct ? "correct" : "wrong";
+      result.textContent = (data.correct ? "回答正确 +" + data.points : "回答错误")
+        + "，总分 " + data.score;
+    } else if (data.type === "leaderboard") {
+      const list = document.getElementById("leaderboard");
+      list.innerHTML = "";
+      data.top.forEach(([name, score]) => {
+        const item = document.createElement("li");
+        item.textContent = name + "  " + score;
+        list.append(item);
+      });
+    }
+  };
+};
+</script>
+</body>
+</html>
+""".encode("utf-8")
@@ -1,8 +1,15 @@
+import startup  # 最先导入，记录启动计时起点
+import multiprocessing
+import sys
 import tkinter as tk
 from quiz_app import QuizApp
 
-
 if __name__ == "__main__":
+    # 打包后题库解析子进程 (parse_worker) 需要
+    multiprocessing.freeze_support()
+    startup.phase("imports")
     root = tk.Tk()
-    app = QuizApp(root)
+    startup.phase("tk_root")
+    # --resume：直接继续上次的题库 (也可在 quiz_config.json 中设置 "auto_resume": true)
+    app = QuizApp(root, resume="--resume" in sys.argv[1:])
     root.mainloop()
@@ -0,0 +1,174 @@
+"""热点操作的延迟指标：计数器和直方图 (基于单调时钟)，可导出为 JSON
+
+默认关闭，关闭时每个埋点只有一次布尔判断。开启方式：环境变量 QUIZUP_METRICS=1，
+或在程序中按 Ctrl+Shift+D 打开调试浮层。开启后程序退出时写出 quizup_metrics.json。
+
+埋点方式：
+    started = registry.start()               # 关闭时返回 0
+    ...
+    registry.stop("bank_parse_ms", started)
+跨回调的耗时 (如点击“下一题”到新题完全显示) 用 mark(name) / measure(name)。
+"""
+
+import atexit
+import bisect
+import json
+import os
+import time
+
+ENV_METRICS = "QUIZUP_METRICS"
+DEFAULT_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "quizup_metrics.json"
+)
+
+# 直方图桶上界 (毫秒)，最后一个桶收纳更大的值
+BUCKET_BOUNDS = (0.5, 1, 2, 5, 10, 16, 25, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+class Histogram:
+    """固定桶的延迟直方图 (毫秒)"""
+
+    __slots__ = ("count", "total", "minimum", "maximum", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.minimum = float("inf")
+        self.maximum = 0.0
+        self.buckets = [0] * (len(BUCKET_BOUNDS) + 1)
+
+    def observe(self, value):
+        self.count += 1
+        self.total += value
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+        self.buckets[bisect.bisect_left(BUCKET_BOUNDS, value)] += 1
+
+    def quantile(self, q):
+        """按桶内线性插值估计分位数"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            if n and seen + n >= rank:
+                low = BUCKET_BOUNDS[i - 1] if i > 0 else 0.0
+                high = BUCKET_BOUNDS[i] if i < len(BUCKET_BOUNDS) else self.maximum
+                low, high = max(low, self.minimum), min(high, self.maximum)
+                return low + (high - low) * (rank - seen) / n
+            seen += n
+        return self.maximum
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.minimum if self.count else 0.0,
+            "max": self.maximum,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": {
+                (f"<={bound}" if i < len(BUCKET_BOUNDS) else f">{BUCKET_BOUNDS[-1]}"): n
+                for i, (bound, n) in enumerate(
+                    zip(BUCKET_BOUNDS + (BUCKET_BOUNDS[-1],), self.buckets)
+                )
+                if n
+            },
+        }
+
+
+class Metrics:
+    """指标注册表"""
+
+    def __init__(self):
+        self.enabled = False
+        self.counters = {}
+        self.histograms = {}
+        self.marks = {}  # 进行中的跨回调计时 {名称: 开始时间}
+        self.started_at = time.time()
+
+    def enable(self):
+        self.enabled = True
+
+    def reset(self):
+        self.counters = {}
+        self.histograms = {}
+        self.marks = {}
+        self.started_at = time.time()
+
+    # --- 埋点 ---
+    def incr(self, name, amount=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name, value_ms):
+        if self.enabled:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(value_ms)
+
+    def start(self):
+        """返回计时起点 (关闭时返回 0，配合 stop 使用)"""
+        return time.perf_counter() if self.enabled else 0
+
+    def stop(self, name, started):
+        """记录从 start() 到现在的耗时"""
+        if started:
+            self.observe(name, (time.perf_counter() - started) * 1000)
+
+    def mark(self, name):
+        """开始一段跨回调的计时"""
+        if self.enabled:
+            self.marks[name] = time.perf_counter()
+
+    def measure(self, name):
+        """结束 mark(name) 开始的计时 (没有对应的 mark 时忽略)"""
+        started = self.marks.pop(name, None)
+        if started is not None:
+            self.observe(name, (time.perf_counter() - started) * 1000)
+
+    # --- 导出 ---
+    def to_dict(self):
+        return {
+            "started_at": time.strftime(
+                "%Y-%m-%d %H:%M:%S", time.localtime(self.started_at)
+            ),
+            "dumped_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "counters": dict(self.counters),
+            "histograms": {
+                name: histogram.to_dict()
+                for name, histogram in sorted(self.histograms.items())
+            },
+        }
+
+    def dump(self, path=None):
+        """写出 JSON 文件，返回文件路径"""
+        path = path or DEFAULT_PATH
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        return path
+
+
+registry = Metrics()
+
+
+def enable_from_environment():
+    """环境变量 QUIZUP_METRICS 非空且不为 0 时开启指标"""
+    if os.environ.get(ENV_METRICS, "").strip() not in ("", "0"):
+        registry.enable()
+    return registry.enabled
+
+
+def _dump_at_exit():
+    if registry.enabled and (registry.counters or registry.histograms):
+        try:
+            registry.dump()
+        except OSError:
+            pass
+
+
+atexit.register(_dump_at_exit)
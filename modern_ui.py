@@ -1,5 +1,8 @@
+import time
 import tkinter as tk
 from tkinter import ttk
+import metrics
+from profiling import profiled
 
 
 class ModernUI:
@@ -50,6 +53,9 @@ class ModernUI:
     # 当前主题
     current_theme = "light"
 
+    # 最近一次主题切换耗时 (毫秒)
+    last_switch_ms = 0.0
+
     @staticmethod
     def get_theme_color(color_name):
         """获取当前主题的指定颜色"""
@@ -67,39 +73,23 @@ class ModernUI:
 
     @staticmethod
     def apply_theme(root):
-        """应用当前主题到根窗口及更新ttk样式"""
+        """应用当前主题到根窗口并切换到对应的ttk主题"""
         theme = ModernUI.THEMES[ModernUI.current_theme]
         root.configure(bg=theme["bg"])
 
-        # 更新ttk样式
-        ModernUI.style_widgets(root)  # 调用样式更新函数
+        # 切换到预编译的ttk主题 (首次使用时编译，之后仅需 theme_use)
+        ModernUI.style_widgets(root)
 
     @staticmethod
     def set_theme(root):
         """设置并应用初始主题"""
-        style = ttk.Style()
-
-        # 尝试使用系统主题以获得更好的原生观感
-        try:
-            style.theme_use("vista")  # Windows
-        except tk.TclError:
-            try:
-                style.theme_use("clam")  # 通用跨平台主题
-            except tk.TclError:
-                pass  # 使用默认主题
-
         # 获取当前主题色
         theme = ModernUI.THEMES[ModernUI.current_theme]
 
-        # 配置基础样式
-        style.configure("TButton", font=("微软雅黑", 10))
-        style.configure("TLabel", font=("微软雅黑", 10))
-        style.configure("TFrame", background=theme["bg"])
-
         # 设置应用根窗口背景色
         root.configure(bg=theme["bg"])
 
-        # 应用详细的控件样式
+        # 编译并启用当前调色板对应的ttk主题
         ModernUI.style_widgets(root)
 
     @staticmethod
@@ -158,207 +148,284 @@ class ModernUI:
         return button
 
     @staticmethod
+    @profiled("toggle_theme")
     def toggle_theme(root):
         """切换主题并应用"""
+        start = time.perf_counter()
         ModernUI.switch_theme()
         ModernUI.apply_theme(root)
 
         # 触发自定义事件，通知应用主题已更改 (例如更新非ttk控件)
         root.event_generate("<<ThemeChanged>>")
+        ModernUI.last_switch_ms = (time.perf_counter() - start) * 1000
+        metrics.registry.observe("theme_switch_ms", ModernUI.last_switch_ms)
 
     @staticmethod
-    def style_widgets(root):
-        """配置ttk控件样式以匹配当前主题"""
-        style = ttk.Style(root)
-        # 确保使用一个支持自定义的主题，clam通常是好的选择
-        try:
-            style.theme_use("clam")
-        except tk.TclError:
-            pass  # 如果clam不可用，则使用默认主题
-
-        # 获取当前主题色
-        theme = ModernUI.THEMES[ModernUI.current_theme]
-
-        # --- 通用样式 ---
-        style.configure(
-            ".", font=("微软雅黑", 10), background=theme["bg"], foreground=theme["text"]
-        )
-
-        # --- Frame ---
-        style.configure("TFrame", background=theme["bg"])
-        style.configure(
-            "Card.TFrame",  # 用于问题卡片、统计卡片等
-            background=theme["card_bg"],
-            relief="solid",  # 给卡片一个边框
-            borderwidth=1,
-        )
-        style.configure(
-            "Title.TFrame", background=theme["primary"]
-        )  # 统计窗口标题栏背景
-        style.configure("Summary.TFrame", background=theme["bg"])  # 统计窗口总结栏背景
-
-        # --- Label ---
-        style.configure("TLabel", background=theme["bg"], foreground=theme["text"])
-        style.configure(
-            "Header.TLabel",
-            font=("微软雅黑", 16, "bold"),
-            background=theme["bg"],
-            foreground=theme["text"],
-        )
-        style.configure(
-            "Chapter.TLabel",
-            font=("微软雅黑", 14, "bold"),
-            background=theme["bg"],
-            foreground=theme["text"],
-        )
-        style.configure(
-            "QuestionType.TLabel",
-            font=("微软雅黑", 12, "bold"),
-            background=theme["card_bg"],  # 背景应为卡片背景
-            foreground=theme["primary"],
-        )
-        style.configure(
-            "Option.TLabel",
-            background=theme["card_bg"],
-            foreground=theme["text"],
-            anchor="w",
-            justify="left",
-        )
-        # 统计窗口标签样式
-        style.configure(
-            "StatsHeader.TLabel",
-            font=("微软雅黑", 11, "bold"),
-            background=theme["card_bg"],  # 章节标题和统计表头背景应为卡片背景
-            foreground=theme["text"],
-        )
-        style.configure(
-            "StatsValue.TLabel",
-            font=("微软雅黑", 10),
-            background=theme["card_bg"],  # 统计数值背景应为卡片背景
-            foreground=theme["text"],
-        )
-        style.configure(
-            "StatsCorrect.TLabel",
-            background=theme["card_bg"],  # 正确数背景
-            foreground=theme["success"],
-        )
-        style.configure(
-            "StatsWrong.TLabel",
-            background=theme["card_bg"],  # 错误数背景
-            foreground=theme["danger"],
-        )
-        style.configure(
-            "StatsRate.TLabel",
-            background=theme["card_bg"],  # 正确率背景
-            foreground=theme["secondary"],
-        )
-        style.configure(
-            "Title.TLabel",  # 统计窗口标题栏文字
-            background=theme["primary"],
-            foreground="white",
-            font=("微软雅黑", 14, "bold"),
-        )
-        style.configure(
-            "Summary.TLabel",  # 统计窗口总结栏文字
-            background=theme["bg"],  # 总结栏背景应为窗口主背景
-            foreground=theme["text"],
-        )
-        # 为总结栏的特殊颜色标签创建或修改样式
-        style.configure(
-            "SummaryCorrect.TLabel", background=theme["bg"], foreground=theme["success"]
-        )
-        style.configure(
-            "SummaryWrong.TLabel", background=theme["bg"], foreground=theme["danger"]
-        )
-        style.configure(
-            "SummaryRate.TLabel",
-            background=theme["bg"],
-            foreground=theme["secondary"],
-            font=("微软雅黑", 10, "bold"),  # 保持字体加粗
-        )
+    def ttk_theme_name(theme_name):
+        """返回调色板对应的ttk主题名称"""
+        return f"quizup_{theme_name}"
 
-        # --- Button (主要使用RoundedButton, ttk.Button作为备用) ---
-        style.configure(
-            "TButton",
-            padding=5,
-            relief="flat",
-            background=theme["primary"],
-            foreground="white",
-            font=("微软雅黑", 10),  # 确保字体一致
-        )
-        style.map(
-            "TButton",
-            background=[
-                ("active", theme["primary_dark"]),
-                ("disabled", theme["neutral"]),
-            ],
-            foreground=[("disabled", theme["text_secondary"])],
-        )
+    @staticmethod
+    def compile_theme(root, theme_name):
+        """将调色板编译为ttk主题 (每个调色板只创建一次)"""
+        ttk_name = ModernUI.ttk_theme_name(theme_name)
+        style = ttk.Style(root)
+        if ttk_name in style.theme_names():
+            return ttk_name
 
-        # --- Radiobutton & Checkbutton ---
-        style.configure(
-            "TRadiobutton",
-            background=theme["card_bg"],  # 背景设为卡片背景
-            foreground=theme["text"],  # 设置文字颜色
-            padding=(10, 5),
-            font=("微软雅黑", 11),  # 移除 self.option_font 引用，直接使用默认字体
-        )
-        style.configure(
-            "TCheckbutton",
-            background=theme["card_bg"],  # 背景设为卡片背景
-            foreground=theme["text"],  # 设置文字颜色
-            padding=(10, 5),
-            font=("微软雅黑", 11),  # 移除 self.option_font 引用，直接使用默认字体
-        )
-        style.map(
-            "TRadiobutton",
-            background=[("active", theme["bg"])],  # 悬停时背景变为窗口背景
-            foreground=[("active", theme["text"])],  # 悬停时文字颜色
-            indicatorcolor=[  # 指示器颜色
-                ("selected", theme["primary"]),
-                ("!selected", theme["neutral"]),
-            ],
-        )
-        style.map(
-            "TCheckbutton",
-            background=[("active", theme["bg"])],  # 悬停时背景变为窗口背景
-            foreground=[("active", theme["text"])],  # 悬停时文字颜色
-            indicatorcolor=[  # 指示器颜色
-                ("selected", theme["primary"]),
-                ("!selected", theme["neutral"]),
-            ],
+        # 以clam为父主题，它支持自定义颜色；不可用时退回当前主题
+        parent = "clam" if "clam" in style.theme_names() else style.theme_use()
+        style.theme_create(
+            ttk_name,
+            parent=parent,
+            settings=ModernUI.build_theme_settings(ModernUI.THEMES[theme_name]),
         )
+        return ttk_name
 
-        # --- Text ---
-        style.configure(
-            "TText",  # 虽然我们用的是tk.Text，这里配置一下以防万一
-            background=theme["card_bg"],
-            foreground=theme["text"],  # 添加文字颜色
-            borderwidth=0,
-            font=("微软雅黑", 13),
-            padx=10,
-            pady=10,
-            relief="flat",
-        )
+    @staticmethod
+    def style_widgets(root):
+        """启用当前调色板对应的ttk主题 (未编译时先编译)"""
+        ttk_name = ModernUI.compile_theme(root, ModernUI.current_theme)
+        style = ttk.Style(root)
+        if style.theme_use() != ttk_name:
+            style.theme_use(ttk_name)
 
-        # --- Scrollbar ---
-        style.configure(
-            "Vertical.TScrollbar",
-            background=theme["neutral"],
-            troughcolor=theme["bg"],
-            borderwidth=0,
-            arrowsize=14,
-        )
-        style.map("Vertical.TScrollbar", background=[("active", theme["neutral_dark"])])
-
-        # --- Progressbar ---
-        style.configure(
-            "TProgressbar",
-            thickness=8,
-            background=theme["primary"],  # 进度条颜色
-            troughcolor=theme["bg"],  # 进度条背景槽颜色
-            borderwidth=0,
-        )
+    @staticmethod
+    def build_theme_settings(theme):
+        """根据调色板生成 theme_create 所需的样式设置"""
+        return {
+            # --- 通用样式 ---
+            ".": {
+                "configure": {
+                    "font": ("微软雅黑", 10),
+                    "background": theme["bg"],
+                    "foreground": theme["text"],
+                }
+            },
+            # --- Frame ---
+            "TFrame": {"configure": {"background": theme["bg"]}},
+            "Card.TFrame": {  # 用于问题卡片、统计卡片等
+                "configure": {
+                    "background": theme["card_bg"],
+                    "relief": "solid",  # 给卡片一个边框
+                    "borderwidth": 1,
+                }
+            },
+            "Title.TFrame": {  # 统计窗口标题栏背景
+                "configure": {"background": theme["primary"]}
+            },
+            "Summary.TFrame": {  # 统计窗口总结栏背景
+                "configure": {"background": theme["bg"]}
+            },
+            # --- Label ---
+            "TLabel": {
+                "configure": {
+                    "font": ("微软雅黑", 10),
+                    "background": theme["bg"],
+                    "foreground": theme["text"],
+                }
+            },
+            "Secondary.TLabel": {  # 次要文字 (开发者标签、进度标签、统计时间)
+                "configure": {
+                    "background": theme["bg"],
+                    "foreground": theme["text_secondary"],
+                }
+            },
+            "Header.TLabel": {
+                "configure": {
+                    "font": ("微软雅黑", 16, "bold"),
+                    "background": theme["bg"],
+                    "foreground": theme["text"],
+                }
+            },
+            "Chapter.TLabel": {
+                "configure": {
+                    "font": ("微软雅黑", 14, "bold"),
+                    "background": theme["bg"],
+                    "foreground": theme["text"],
+                }
+            },
+            "QuestionType.TLabel": {
+                "configure": {
+                    "font": ("微软雅黑", 12, "bold"),
+                    "background": theme["card_bg"],  # 背景应为卡片背景
+                    "foreground": theme["primary"],
+                }
+            },
+            "Option.TLabel": {
+                "configure": {
+                    "background": theme["card_bg"],
+                    "foreground": theme["text"],
+                    "anchor": "w",
+                    "justify": "left",
+                }
+            },
+            # 统计窗口标签样式
+            "StatsHeader.TLabel": {
+                "configure": {
+                    "font": ("微软雅黑", 11, "bold"),
+                    "background": theme["card_bg"],  # 章节标题和表头背景为卡片背景
+                    "foreground": theme["text"],
+                }
+            },
+            "StatsValue.TLabel": {
+                "configure": {
+                    "font": ("微软雅黑", 10),
+                    "background": theme["card_bg"],  # 统计数值背景应为卡片背景
+                    "foreground": theme["text"],
+                }
+            },
+            "StatsMuted.TLabel": {  # 卡片内的灰色提示文字
+                "configure": {
+                    "font": ("微软雅黑", 9),
+                    "background": theme["card_bg"],
+                    "foreground": theme["text_secondary"],
+                }
+            },
+            "StatsCorrect.TLabel": {
+                "configure": {
+                    "background": theme["card_bg"],  # 正确数背景
+                    "foreground": theme["success"],
+                }
+            },
+            "StatsWrong.TLabel": {
+                "configure": {
+                    "background": theme["card_bg"],  # 错误数背景
+                    "foreground": theme["danger"],
+                }
+            },
+            "StatsRate.TLabel": {
+                "configure": {
+                    "background": theme["card_bg"],  # 正确率背景
+                    "foreground": theme["secondary"],
+                }
+            },
+            "Title.TLabel": {  # 统计窗口标题栏文字
+                "configure": {
+                    "background": theme["primary"],
+                    "foreground": "white",
+                    "font": ("微软雅黑", 14, "bold"),
+                }
+            },
+            "Summary.TLabel": {  # 统计窗口总结栏文字
+                "configure": {
+                    "background": theme["bg"],  # 总结栏背景应为窗口主背景
+                    "foreground": theme["text"],
+                }
+            },
+            "SummaryHeader.TLabel": {  # 总结栏标题
+                "configure": {
+                    "font": ("微软雅黑", 11, "bold"),
+                    "background": theme["bg"],
+                    "foreground": theme["text"],
+                }
+            },
+            # 总结栏的特殊颜色标签
+            "SummaryCorrect.TLabel": {
+                "configure": {"background": theme["bg"], "foreground": theme["success"]}
+            },
+            "SummaryWrong.TLabel": {
+                "configure": {"background": theme["bg"], "foreground": theme["danger"]}
+            },
+            "SummaryRate.TLabel": {
+                "configure": {
+                    "background": theme["bg"],
+                    "foreground": theme["secondary"],
+                    "font": ("微软雅黑", 10, "bold"),  # 保持字体加粗
+                }
+            },
+            # 速刷模式的即时反馈 (位于卡片内)
+            "FeedbackCorrect.TLabel": {
+                "configure": {
+                    "font": ("微软雅黑", 11, "bold"),
+                    "background": theme["card_bg"],
+                    "foreground": theme["success"],
+                }
+            },
+            "FeedbackWrong.TLabel": {
+                "configure": {
+                    "font": ("微软雅黑", 11, "bold"),
+                    "background": theme["card_bg"],
+                    "foreground": theme["danger"],
+                }
+            },
+            "Speed.TLabel": {
+                "configure": {
+                    "font": ("微软雅黑", 10),
+                    "background": theme["card_bg"],
+                    "foreground": theme["secondary"],
+                }
+            },
+            # --- Button (主要使用RoundedButton, ttk.Button作为备用) ---
+            "TButton": {
+                "configure": {
+                    "padding": 5,
+                    "relief": "flat",
+                    "background": theme["primary"],
+                    "foreground": "white",
+                    "font": ("微软雅黑", 10),  # 确保字体一致
+                },
+                "map": {
+                    "background": [
+                        ("active", theme["primary_dark"]),
+                        ("disabled", theme["neutral"]),
+                    ],
+                    "foreground": [("disabled", theme["text_secondary"])],
+                },
+            },
+            # --- Radiobutton & Checkbutton ---
+            "TRadiobutton": {
+                "configure": {
+                    "background": theme["card_bg"],  # 背景设为卡片背景
+                    "foreground": theme["text"],  # 设置文字颜色
+                    "padding": (10, 5),
+                    "font": ("微软雅黑", 11),
+                },
+                "map": {
+                    "background": [("active", theme["bg"])],  # 悬停时背景变为窗口背景
+                    "foreground": [("active", theme["text"])],  # 悬停时文字颜色
+                    "indicatorcolor": [  # 指示器颜色
+                        ("selected", theme["primary"]),
+                        ("!selected", theme["neutral"]),
+                    ],
+                },
+            },
+            "TCheckbutton": {
+                "configure": {
+                    "background": theme["card_bg"],  # 背景设为卡片背景
+                    "foreground": theme["text"],  # 设置文字颜色
+                    "padding": (10, 5),
+                    "font": ("微软雅黑", 11),
+                },
+                "map": {
+                    "background": [("active", theme["bg"])],  # 悬停时背景变为窗口背景
+                    "foreground": [("active", theme["text"])],  # 悬停时文字颜色
+                    "indicatorcolor": [  # 指示器颜色
+                        ("selected", theme["primary"]),
+                        ("!selected", theme["neutral"]),
+                    ],
+                },
+            },
+            # --- Scrollbar ---
+            "Vertical.TScrollbar": {
+                "configure": {
+                    "background": theme["neutral"],
+                    "troughcolor": theme["bg"],
+                    "borderwidth": 0,
+                    "arrowsize": 14,
+                },
+                "map": {"background": [("active", theme["neutral_dark"])]},
+            },
+            # --- Progressbar ---
+            "TProgressbar": {
+                "configure": {
+                    "thickness": 8,
+                    "background": theme["primary"],  # 进度条颜色
+                    "troughcolor": theme["bg"],  # 进度条背景槽颜色
+                    "borderwidth": 0,
+                }
+            },
+        }
 
 
 class RoundedButton(tk.Canvas):
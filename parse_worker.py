@@ -0,0 +1,340 @@
+"""在子进程中解析题库文件，限制耗时和内存，防止异常输入使正则回溯失控而卡住程序
+
+子进程逐章把解析结果传回，超出限制时父进程结束子进程，已收到的章节作为部分结果，
+并给出停在哪一章的诊断信息。父进程通过 poll() 非阻塞地收取结果，可在 Tk 的 after
+回调中调用，界面线程不会等待解析。
+
+用法: python parse_worker.py 题库.txt [--timeout 秒] [--memory MB]
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+from profiling import profiler
+from question_bank import QuestionBank, chapter_hash
+
+TIME_LIMIT = 10.0  # 解析总耗时上限 (秒)
+MEMORY_LIMIT_MB = 1024  # 子进程常驻内存上限 (MB)
+
+# 子进程发送的消息类型
+TITLE = "title"  # (TITLE, 题库标题, 章节数)
+BEGIN = "begin"  # (BEGIN, 章节序号, 章节首行)：开始解析一章
+CHAPTER = "chapter"  # (CHAPTER, 章节哈希, 题目列表；哈希已知时为 None)
+ERROR = "error"  # (ERROR, 错误信息)
+DONE = "done"  # (DONE,)
+
+
+def process_rss(pid):
+    """返回进程的常驻内存字节数 (不支持的平台返回 None)"""
+    if sys.platform.startswith("linux"):
+        try:
+            with open(f"/proc/{pid}/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, IndexError):
+            return None
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class Counters(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        kernel32 = ctypes.windll.kernel32
+        # PROCESS_QUERY_LIMITED_INFORMATION | PROCESS_VM_READ
+        handle = kernel32.OpenProcess(0x1000 | 0x0010, False, pid)
+        if not handle:
+            return None
+        try:
+            counters = Counters()
+            counters.cb = ctypes.sizeof(counters)
+            if kernel32.K32GetProcessMemoryInfo(
+                handle, ctypes.byref(counters), counters.cb
+            ):
+                return counters.WorkingSetSize
+            return None
+        finally:
+            kernel32.CloseHandle(handle)
+    return None
+
+
+def limit_memory(memory_limit_mb):
+    """子进程中限制虚拟内存 (仅 POSIX，作为父进程监视之外的兜底)"""
+    try:
+        import resource
+    except ImportError:
+        return
+    # 虚拟内存比常驻内存大得多，留出余量
+    limit = memory_limit_mb * 2 * 1024 * 1024
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ValueError, OSError):
+        pass
+
+
+def run_worker(conn, file_path, known_hashes, memory_limit_mb, profile_path=None):
+    """子进程入口：逐章解析并发送结果 (哈希在 known_hashes 中的章节不再解析)
+
+    profile_path 不为空时 (主进程正在剖析) 用 cProfile 记录解析过程并写出到该文件。
+    """
+    import bank_formats
+
+    limit_memory(memory_limit_mb)
+    profile = None
+    if profile_path:
+        import cProfile
+
+        profile = cProfile.Profile()
+        profile.enable()
+    bank = QuestionBank(
+        on_error=lambda title, message: conn.send((ERROR, message)),
+    )
+    bank.file_path = file_path
+    try:
+        if bank_formats.is_structured(file_path):
+            send_structured(conn, file_path, known_hashes)
+            return
+        with open(file_path, "r", encoding="utf-8") as f:
+            content = f.read()
+        chapters = bank.split_content(content)
+        conn.send((TITLE, bank.title, len(chapters)))
+        for number, chapter_content in enumerate(chapters, 1):
+            digest = chapter_hash(chapter_content)
+            if digest in known_hashes:
+                conn.send((CHAPTER, digest, None))
+                continue
+            conn.send((BEGIN, number, chapter_content.split("\n", 1)[0][:40]))
+            conn.send((CHAPTER, digest, bank.parse_chapter(chapter_content)))
+    except MemoryError:
+        conn.send((ERROR, "内存不足"))
+    except Exception as e:
+        conn.send((ERROR, f"加载题库时出错：{str(e)}"))
+    finally:
+        if profile is not None:
+            profile.disable()
+            save_profile(profile, profile_path)
+        conn.send((DONE,))
+        conn.close()
+
+
+def save_profile(profile, path):
+    """写出子进程的剖析数据 (失败时忽略，不影响解析结果)"""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        profile.dump_stats(path)
+    except OSError:
+        pass
+
+
+def send_structured(conn, file_path, known_hashes):
+    """逐章发送 JSONL / SQLite 题库 (不经过正则解析)"""
+    import bank_formats
+
+    title, entries = bank_formats.read_bank(file_path)
+    conn.send((TITLE, title, 0))
+    for questions in bank_formats.iter_chapters(entries):
+        digest = bank_formats.structured_chapter_hash(questions)
+        conn.send((CHAPTER, digest, None if digest in known_hashes else questions))
+
+
+class ParseJob:
+    """一次子进程解析：start() 后反复调用 poll() 直到返回 True
+
+    结束后 bank 为组装好的题库 (没有任何章节时为 None)，complete 表示是否完整解析
+    (子进程报告过错误时不算完整)，errors 为子进程报告的错误，diagnostics 为全部错误和
+    超限说明；只有完整解析的题库才写出解析快照。previous 为之前加载的同一题库时，原文未变化的
+    章节直接复用 previous 的解析结果；known 为其他已打开题库的 {章节哈希: 题目列表}，
+    内容相同的章节同样不再解析。JSONL / SQLite 题库不经过正则解析，只限制内存；
+    其中有无效的行时整个题库加载失败 (bank 为 None)，不使用无效行之前的部分。
+    """
+
+    def __init__(
+        self,
+        file_path,
+        previous=None,
+        time_limit=TIME_LIMIT,
+        memory_limit_mb=MEMORY_LIMIT_MB,
+        known=None,
+    ):
+        # 格式转换模块 (及 sqlite3) 只在需要解析时导入，不拖慢启动
+        import bank_formats
+
+        self.file_path = file_path
+        self.previous = previous
+        self.structured = bank_formats.is_structured(file_path)
+        self.time_limit = None if self.structured else time_limit
+        self.memory_limit_mb = memory_limit_mb
+        self.known = dict(known or {})
+        if previous:
+            self.known.update(zip(previous.chapter_hashes, previous.chapters))
+        self.process = None
+        self.conn = None
+        self.started = 0.0
+        self.done = False
+        self.profile_path = None  # 剖析开启时子进程写出的剖析文件
+
+        self.bank = QuestionBank()
+        self.bank.file_path = file_path
+        self.title = None
+        self.chapter_total = 0
+        self.current = None  # 正在解析的章节 (序号, 首行)
+        self.complete = False
+        self.errors = []  # 子进程报告的错误 (解析出错的章节、内存不足、读取失败等)
+        self.diagnostics = []
+
+    def start(self):
+        if not os.path.exists(self.file_path):
+            name = os.path.basename(self.file_path)
+            self.finish(f"题库加载失败！请确保'{name}'文件存在。")
+            return
+        # spawn 在各平台行为一致，也不会复制父进程中的 Tk 状态
+        context = multiprocessing.get_context("spawn")
+        self.conn, child_conn = context.Pipe(duplex=False)
+        if profiler.active:
+            self.profile_path = profiler.external_path("parse_worker")
+        self.process = context.Process(
+            target=run_worker,
+            args=(
+                child_conn,
+                self.file_path,
+                set(self.known),
+                self.memory_limit_mb,
+                self.profile_path,
+            ),
+            daemon=True,
+        )
+        self.started = time.monotonic()
+        self.process.start()
+        child_conn.close()
+
+    def poll(self):
+        """收取已到达的结果并检查限制，返回解析是否已结束 (不阻塞)"""
+        if self.done:
+            return True
+        try:
+            while self.conn.poll():
+                if self.handle(self.conn.recv()):
+                    self.finish()
+                    return True
+        except (EOFError, OSError):
+            # 子进程意外退出 (如超出内存限制被系统结束)
+            self.finish(self.stopped_at("解析进程意外退出"))
+            return True
+
+        elapsed = time.monotonic() - self.started
+        if self.time_limit is not None and elapsed > self.time_limit:
+            self.finish(self.stopped_at(f"解析超时 (超过 {self.time_limit:g} 秒)"))
+            return True
+        rss = process_rss(self.process.pid)
+        if rss is not None and rss > self.memory_limit_mb * 1024 * 1024:
+            self.finish(self.stopped_at(f"解析占用内存超过 {self.memory_limit_mb} MB"))
+            return True
+        return False
+
+    def wait(self, interval=0.05):
+        """阻塞等待解析结束 (命令行使用)"""
+        while not self.poll():
+            time.sleep(interval)
+
+    def cancel(self):
+        if not self.done:
+            self.finish("已取消")
+
+    def handle(self, message):
+        """处理一条子进程消息，返回是否已结束"""
+        kind = message[0]
+        if kind == CHAPTER:
+            _, digest, questions = message
+            if questions is None:
+                questions = self.known[digest]
+            else:
+                self.bank.reparsed += 1
+            if questions:
+                self.bank.chapters.append(questions)
+                self.bank.chapter_hashes.append(digest)
+            self.current = None
+        elif kind == BEGIN:
+            self.current = message[1:]
+        elif kind == TITLE:
+            _, self.title, self.chapter_total = message
+            self.bank.title = self.title
+        elif kind == ERROR:
+            self.errors.append(message[1])
+            self.diagnostics.append(message[1])
+        elif kind == DONE:
+            # 出错后子进程仍会发送 DONE，此时已收到的只是部分章节
+            self.complete = self.title is not None and not self.errors
+            return True
+        return False
+
+    def stopped_at(self, reason):
+        """超限时的诊断信息 (说明停在哪一章)"""
+        if self.title is None:
+            return f"{reason}：分割章节时未能完成，请检查章节之间是否有空行。"
+        if self.current is not None:
+            number, first_line = self.current
+            return (
+                f"{reason}：停在第 {number}/{self.chapter_total} 章“{first_line}”，"
+                f"已加载前面的 {len(self.bank.chapters)} 章。"
+            )
+        return f"{reason}：已加载 {len(self.bank.chapters)} 章。"
+
+    def finish(self, diagnostic=None):
+        self.done = True
+        if diagnostic:
+            self.diagnostics.append(diagnostic)
+        if self.process is not None:
+            if self.process.is_alive():
+                self.process.kill()
+            self.process.join(1)
+            self.conn.close()
+            if self.profile_path and profiler.active:
+                profiler.record("parse_worker", time.monotonic() - self.started)
+        if not self.bank.chapters or (self.structured and self.errors):
+            # 结构化题库出错说明文件本身有误 (如某行不是有效的 JSON)，不加载其中一部分
+            self.bank = None
+        elif self.complete and self.bank.use_snapshot:
+            self.bank.save_snapshot()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="在受限的子进程中解析题库文件")
+    parser.add_argument("bank", help="题库文件 (.txt / .jsonl / .sqlite)")
+    parser.add_argument(
+        "--timeout", type=float, default=TIME_LIMIT, help="耗时上限 (秒)"
+    )
+    parser.add_argument(
+        "--memory", type=int, default=MEMORY_LIMIT_MB, help="内存上限 (MB)"
+    )
+    args = parser.parse_args()
+
+    job = ParseJob(args.bank, time_limit=args.timeout, memory_limit_mb=args.memory)
+    job.bank.use_snapshot = False
+    start = time.perf_counter()
+    job.start()
+    job.wait()
+    elapsed = time.perf_counter() - start
+    chapters = job.bank.chapters if job.bank else []
+    total = sum(len(questions) for questions in chapters)
+    status = "完整" if job.complete else "不完整"
+    print(f"{status}：{len(chapters)} 章 {total} 题，耗时 {elapsed:.2f} 秒")
+    for diagnostic in job.diagnostics:
+        print(f"  {diagnostic}")
+    sys.exit(0 if job.complete and not job.diagnostics else 1)
+
+
+if __name__ == "__main__":
+    main()
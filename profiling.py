@@ -0,0 +1,212 @@
+"""性能剖析开关：用 cProfile 记录关键操作，可选 tracemalloc 内存快照
+
+开启方式 (任选其一)：
+    - 环境变量 QUIZUP_PROFILE=1 (或设为输出目录路径)，QUIZUP_PROFILE_MEMORY=1 同时记录内存；
+    - 程序运行中按 Ctrl+Shift+P 开始/停止剖析 (Ctrl+Shift+M 开始时同时记录内存)。
+停止或退出程序时，结果写入输出目录下以时间命名的子目录：
+    每个操作一个 .pstats 文件、summary.txt (调用次数和耗时)、memory_*.txt (内存报告)。
+题库解析在子进程中进行 (见 parse_worker)，剖析开启时子进程自己记录 cProfile，
+写出 parse_worker_N.pstats，耗时计入 summary.txt 的 parse_worker 一行；
+子进程不记录内存快照。
+"""
+
+import atexit
+import cProfile
+import functools
+import os
+import time
+import tracemalloc
+
+ENV_PROFILE = "QUIZUP_PROFILE"
+ENV_MEMORY = "QUIZUP_PROFILE_MEMORY"
+DEFAULT_FOLDER = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "quizup_profiles"
+)
+TITLE_SUFFIX = " [剖析中]"  # 剖析期间附加在窗口标题后
+TOP_LINES = 40  # 报告中列出的函数/代码行数
+
+
+class Profiler:
+    """按操作名称累计 cProfile 数据和耗时"""
+
+    def __init__(self):
+        self.active = False
+        self.memory = False
+        self.folder = DEFAULT_FOLDER
+        self.profiles = {}  # {操作名称: cProfile.Profile}
+        self.timings = {}  # {操作名称: [次数, 总耗时, 最大耗时]}
+        self.running = None  # 正在剖析的操作 (嵌套调用计入外层)
+        self.baseline = None  # 开始时的内存快照
+        self.started_at = 0.0
+        self.external = 0  # 子进程写出的剖析文件数
+
+    def start(self, memory=False, folder=None):
+        if self.active:
+            return
+        self.active = True
+        self.memory = memory
+        self.folder = folder or DEFAULT_FOLDER
+        self.profiles = {}
+        self.timings = {}
+        self.external = 0
+        self.started_at = time.time()
+        if memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(10)  # 保留10层调用栈，便于定位分配来源
+            self.baseline = tracemalloc.take_snapshot()
+
+    def stop(self):
+        """停止剖析并写出报告，返回报告目录 (没有数据时返回 None)"""
+        if not self.active:
+            return None
+        self.active = False
+        path = self.dump()
+        if self.memory:
+            tracemalloc.stop()
+            self.baseline = None
+        return path
+
+    def call(self, name, func, args, kwargs):
+        """在剖析器下执行一次操作"""
+        if self.running is not None:
+            return func(*args, **kwargs)
+        profile = self.profiles.get(name)
+        if profile is None:
+            profile = self.profiles[name] = cProfile.Profile()
+        self.running = name
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile.disable()
+            self.running = None
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name, elapsed):
+        """累计一次操作的耗时 (秒)"""
+        timing = self.timings.setdefault(name, [0, 0.0, 0.0])
+        timing[0] += 1
+        timing[1] += elapsed
+        timing[2] = max(timing[2], elapsed)
+
+    def external_path(self, name):
+        """子进程写出剖析数据的文件路径 (子进程中的调用无法记录到本进程的剖析器)"""
+        self.external += 1
+        return os.path.join(self.report_folder(), f"{name}_{self.external}.pstats")
+
+    # --- 报告 ---
+    def report_folder(self):
+        """本次剖析的报告目录 (按开始时间命名)"""
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.started_at))
+        return os.path.join(self.folder, stamp)
+
+    def dump(self):
+        if not self.timings and not self.memory:
+            return None
+        # pstats 导入较慢，只在写报告时导入，避免拖慢程序启动
+        import io
+        import pstats
+
+        path = self.report_folder()
+        os.makedirs(path, exist_ok=True)
+
+        lines = [
+            f"{'操作':<28}{'次数':>8}{'总耗时(ms)':>14}{'平均(ms)':>12}{'最大(ms)':>12}"
+        ]
+        for name, (count, total, longest) in sorted(
+            self.timings.items(), key=lambda item: -item[1][1]
+        ):
+            lines.append(
+                f"{name:<28}{count:>8}{total * 1000:>14.1f}"
+                f"{total / count * 1000:>12.2f}{longest * 1000:>12.2f}"
+            )
+        for name, profile in self.profiles.items():
+            profile.dump_stats(os.path.join(path, f"{name}.pstats"))
+            stream = io.StringIO()
+            stats = pstats.Stats(profile, stream=stream)
+            stats.sort_stats("cumulative").print_stats(TOP_LINES)
+            lines += ["", f"===== {name} =====", stream.getvalue()]
+        with open(os.path.join(path, "summary.txt"), "w", encoding="utf-8") as f:
+            f.write("\n".join(lines))
+
+        if self.memory and tracemalloc.is_tracing():
+            self.dump_memory(path)
+        return path
+
+    def dump_memory(self, path):
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            ]
+        )
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [f"当前 {current / 1024:.1f} KiB，峰值 {peak / 1024:.1f} KiB", ""]
+        lines += [str(stat) for stat in snapshot.statistics("lineno")[:TOP_LINES]]
+        with open(os.path.join(path, "memory_top.txt"), "w", encoding="utf-8") as f:
+            f.write("\n".join(lines))
+        if self.baseline is not None:
+            diff = snapshot.compare_to(self.baseline, "lineno")
+            with open(
+                os.path.join(path, "memory_diff.txt"), "w", encoding="utf-8"
+            ) as f:
+                f.write("\n".join(str(stat) for stat in diff[:TOP_LINES]))
+        snapshot.dump(os.path.join(path, "memory.snapshot"))
+
+
+profiler = Profiler()
+atexit.register(profiler.stop)  # 退出程序时写出仍在进行的剖析
+
+
+def profiled(name):
+    """装饰器：剖析开启时记录被装饰函数的每次调用 (关闭时只多一次属性判断)"""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiler.active:
+                return func(*args, **kwargs)
+            return profiler.call(name, func, args, kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def start_from_environment():
+    """根据环境变量决定是否在启动时开启剖析"""
+    value = os.environ.get(ENV_PROFILE, "").strip()
+    if not value or value == "0":
+        return False
+    folder = value if value not in ("1", "true", "yes") else None
+    profiler.start(
+        memory=os.environ.get(ENV_MEMORY, "").strip() not in ("", "0"), folder=folder
+    )
+    return True
+
+
+def install(root, on_stopped=None):
+    """绑定隐藏快捷键 (Ctrl+Shift+P / Ctrl+Shift+M)；on_stopped(报告目录) 在停止后调用"""
+
+    # 标题在剖析期间会随打开的题库变化，每次都在当前标题上增删后缀
+    def mark_title(active):
+        title = root.title()
+        if title.endswith(TITLE_SUFFIX):
+            title = title[: -len(TITLE_SUFFIX)]
+        root.title(f"{title}{TITLE_SUFFIX}" if active else title)
+
+    def toggle(memory):
+        if profiler.active:
+            path = profiler.stop()
+            mark_title(False)
+            if on_stopped:
+                on_stopped(path)
+        else:
+            profiler.start(memory=memory)
+            mark_title(True)
+
+    root.bind_all("<Control-Shift-P>", lambda e: toggle(False))
+    root.bind_all("<Control-Shift-M>", lambda e: toggle(True))
+    if start_from_environment():
+        mark_title(True)
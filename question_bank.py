@@ -1,65 +1,163 @@
+import hashlib
 import os
 import re
-from tkinter import messagebox
+
+import bank_snapshot
+from profiling import profiled
+
+
+def show_error(title, message):
+    """默认的错误提示：弹出消息框 (延迟导入tkinter，无界面环境也能使用题库)"""
+    from tkinter import messagebox
+
+    messagebox.showerror(title, message)
+
+
+def question_key(question):
+    """题目的稳定标识 (题型和题干的哈希)，用于跨会话、跨题库文件关联答题记录"""
+    text = f"{question['type']}\n{question['question']}"
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def chapter_hash(chapter_content):
+    """章节原文的哈希，用于判断章节内容是否变化"""
+    return hashlib.blake2b(chapter_content.encode("utf-8"), digest_size=16).digest()
 
 
 class QuestionBank:
-    def __init__(self, file_path=None):
+    def __init__(self, file_path=None, on_error=None):
+        self.on_error = on_error or show_error  # on_error(title, message)
         self.current_chapter = 0
         self.chapters = []
+        self.chapter_hashes = []  # 每章原文的哈希 (与 chapters 一一对应)
+        self.store = None  # SQLite 题库按需读取时为 chapters 本身 (SqliteChapters)
         self.file_path = file_path
         self.title = "题库复习程序"  # 默认标题
+        self.use_snapshot = True  # 题库文件未变化时直接读取解析快照
+        self.from_snapshot = False  # 本次加载是否来自快照
+        self.reparsed = 0  # 本次加载实际解析的章节数
 
         if file_path:
             self.load_question_bank(file_path)
 
-    def load_question_bank(self, file_path):
-        """加载指定题库文件"""
+    @profiled("load_question_bank")
+    def load_question_bank(self, file_path, previous=None):
+        """加载指定题库文件 (previous 为之前加载的题库时，原文未变化的章节直接复用)"""
         self.file_path = file_path
         self.chapters = []
+        self.chapter_hashes = []
+        self.store = None
+        self.from_snapshot = False
+        self.reparsed = 0
 
         if not os.path.exists(file_path):
-            messagebox.showerror(
+            self.on_error(
                 "错误", f"题库加载失败！请确保'{os.path.basename(file_path)}'文件存在。"
             )
             return False
 
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-
-            # 获取题库标题（如果文件第一行是标题）
-            first_line = content.strip().split("\n")[0]
-            if not first_line.startswith(
-                "第"
-            ):  # 如果第一行不是以"第"开头，则认为是标题
-                self.title = first_line
-                content = "\n".join(content.strip().split("\n")[1:])  # 移除标题行
-            else:
-                # 使用文件名作为标题 (去除扩展名)
-                self.title = os.path.splitext(os.path.basename(file_path))[0]
+        # question_store 依赖 bank_formats (及本模块)，在此处导入以避免循环导入
+        import question_store
 
-            # 分割章节 (使用正则表达式)
-            chapter_pattern = r"第[一二三四五六七八九十]+章.*?(?=\n\n第[一二三四五六七八九十]+章|$)"  # 匹配章节标题直到下一个章节标题或文件末尾
-            chapters = re.findall(chapter_pattern, content, re.DOTALL)
+        if question_store.is_store_file(file_path):
+            return self.open_store(file_path)
 
-            for chapter_content in chapters:
-                chapter_content = chapter_content.strip()
-                if not chapter_content:
-                    continue
+        if self.use_snapshot and previous is None and self.load_snapshot(file_path):
+            return bool(self.chapters)
 
-                chapter_questions = self.parse_chapter(chapter_content)
-                if chapter_questions:
-                    self.chapters.append(chapter_questions)
+        try:
+            # bank_formats 依赖本模块，在此处导入以避免循环导入
+            import bank_formats
 
+            if bank_formats.is_structured(file_path):
+                # JSONL / SQLite 题库直接读取，不经过正则解析
+                self.load_structured(file_path)
+            else:
+                self.load_text(file_path, previous)
+
+            if self.chapters and self.use_snapshot:
+                self.save_snapshot()
             return bool(self.chapters)  # 如果成功加载了章节则返回True
 
         except Exception as e:
-            messagebox.showerror("错误", f"加载题库时出错：{str(e)}")
+            self.on_error("错误", f"加载题库时出错：{str(e)}")
             return False
 
         return True  # 理论上不会执行到这里，但保持函数完整性
 
+    def load_text(self, file_path, previous=None):
+        """解析文本题库 (previous 中原文相同的章节直接复用)"""
+        with open(file_path, "r", encoding="utf-8") as f:
+            content = f.read()
+
+        # 之前解析过的章节 {章节哈希: 题目列表}
+        parsed = (
+            dict(zip(previous.chapter_hashes, previous.chapters)) if previous else {}
+        )
+        for chapter_content in self.split_content(content):
+            digest = chapter_hash(chapter_content)
+            chapter_questions = parsed.get(digest)
+            if chapter_questions is None:
+                chapter_questions = self.parse_chapter(chapter_content)
+                self.reparsed += 1
+            if chapter_questions:
+                self.chapters.append(chapter_questions)
+                self.chapter_hashes.append(digest)
+
+    def load_structured(self, file_path):
+        """读取 JSONL / SQLite 题库"""
+        import bank_formats
+
+        bank_formats.load_into(self, file_path)
+        self.reparsed = len(self.chapters)
+
+    def open_store(self, file_path):
+        """打开 SQLite 题库，题目按需分页读取，不整体载入内存"""
+        import question_store
+
+        try:
+            store = question_store.SqliteChapters(file_path)
+        except Exception as e:
+            self.on_error("错误", f"打开题库时出错：{str(e)}")
+            return False
+        self.store = store
+        self.chapters = store
+        self.chapter_hashes = store.hashes
+        self.title = store.title or os.path.splitext(os.path.basename(file_path))[0]
+        return bool(store)
+
+    def load_snapshot(self, file_path):
+        """读取题库文件的解析快照 (文件未变化时有效)，返回是否成功"""
+        snapshot = bank_snapshot.load_snapshot(file_path)
+        if snapshot is None:
+            return False
+        self.file_path = file_path
+        self.title, self.chapters, self.chapter_hashes = snapshot
+        self.from_snapshot = True
+        return True
+
+    def save_snapshot(self):
+        """保存解析快照，供下次加载同一文件时使用"""
+        return bank_snapshot.save_snapshot(
+            self.file_path, self.title, self.chapters, self.chapter_hashes
+        )
+
+    def split_content(self, content):
+        """识别题库标题 (设置 self.title)，返回各章原文列表"""
+        # 获取题库标题（如果文件第一行是标题）
+        first_line = content.strip().split("\n")[0]
+        if not first_line.startswith("第"):  # 如果第一行不是以"第"开头，则认为是标题
+            self.title = first_line
+            content = "\n".join(content.strip().split("\n")[1:])  # 移除标题行
+        else:
+            # 使用文件名作为标题 (去除扩展名)
+            self.title = os.path.splitext(os.path.basename(self.file_path))[0]
+
+        # 分割章节 (使用正则表达式)
+        chapter_pattern = r"第[一二三四五六七八九十]+章.*?(?=\n\n第[一二三四五六七八九十]+章|$)"  # 匹配章节标题直到下一个章节标题或文件末尾
+        chapters = re.findall(chapter_pattern, content, re.DOTALL)
+        return [chapter.strip() for chapter in chapters if chapter.strip()]
+
     def parse_chapter(self, chapter_content):
         """解析章节内容，提取题目"""
         questions = []
@@ -239,5 +337,5 @@ class QuestionBank:
             return questions
 
         except Exception as e:
-            messagebox.showerror("错误", f"解析章节 '{chapter_title}' 时出错：{str(e)}")
+            self.on_error("错误", f"解析章节 '{chapter_title}' 时出错：{str(e)}")
             return []  # 返回空列表表示解析失败
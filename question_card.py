@@ -0,0 +1,272 @@
+import tkinter as tk
+from tkinter import ttk
+from modern_ui import ModernUI
+
+
+class QuestionCard(ttk.Frame):
+    """题目卡片 (题型标签、题干和选项)
+
+    答题界面叠放两张卡片：前台卡片显示当前题目，后台卡片预先布局下一题，
+    切题时只需交换两张卡片的叠放次序。
+    """
+
+    def __init__(self, parent, question_font, option_font):
+        super().__init__(parent, style="Card.TFrame", borderwidth=0)
+        self.option_font = option_font
+        self.question = None  # 卡片上当前布局的题目数据
+
+        # 每张卡片有自己的答案变量，后台布局不会影响前台作答
+        self.answer_var = tk.StringVar()  # 用于单选题和判断题
+        self.answer_vars = []  # 用于多选题 (存储BooleanVar)
+        self.choice_option_labels = []  # 单选题选项标签
+        self.multi_option_labels = []  # 多选题选项标签
+
+        # 各题型的选项框架在首次遇到该题型时才创建 (见 get_answer_frame)
+        self.answer_frames = {}
+        self.active_answer_frame = None
+
+        # 配置卡片内部行列权重
+        self.rowconfigure(0, weight=0)  # 题型标签 (固定高度)
+        self.rowconfigure(1, weight=3)  # 问题文本区域 (可扩展)
+        self.rowconfigure(2, weight=4)  # 选项框架 (可扩展，权重稍大)
+        self.columnconfigure(0, weight=1)  # 列宽占满
+
+        # 题目类型标签
+        self.type_label = ttk.Label(
+            self,
+            text="【题型】",
+            style="QuestionType.TLabel",  # 应用题型样式
+        )
+        self.type_label.grid(row=0, column=0, sticky="nw", pady=(0, 5))
+
+        # 题目显示区域 (使用tk.Text)
+        # 外部套一层Frame是为了更好地控制边距和样式一致性
+        text_frame = ttk.Frame(self, style="Card.TFrame", borderwidth=0)
+        text_frame.grid(row=1, column=0, sticky="nsew", pady=(0, 5))
+        text_frame.rowconfigure(0, weight=1)
+        text_frame.columnconfigure(0, weight=1)
+
+        # 题目文本控件 (tk.Text)
+        self.text = tk.Text(
+            text_frame,
+            wrap=tk.WORD,  # 自动换行
+            font=question_font,
+            bg=ModernUI.get_theme_color("card_bg"),  # 背景设为卡片背景
+            fg=ModernUI.get_theme_color("text"),  # 前景设为文本颜色
+            bd=0,  # 无边框
+            height=2.5,  # 初始高度 (大致行数)
+            relief=tk.FLAT,  # 扁平样式
+            state="disabled",  # 初始不可编辑
+            highlightthickness=0,  # 无焦点高亮边框
+            cursor="arrow",  # 使用箭头光标
+        )
+        self.text.grid(row=0, column=0, sticky="nsew")
+
+        # 选项框架 (用于容纳不同题型的选项)
+        self.options_frame = ttk.Frame(self, style="Card.TFrame", borderwidth=0)
+        self.options_frame.grid(row=2, column=0, sticky="nsew", pady=(0, 5))
+        self.options_frame.columnconfigure(0, weight=1)  # 使选项内容水平扩展
+
+    # --- 内容 ---
+    def layout(self, question):
+        """把题目内容填入卡片 (卡片可以处于后台)"""
+        self.question = question
+        q_type = question["type"]
+        options = question.get("options", [])  # 获取选项，可能为空
+
+        # 重置答案变量
+        self.answer_var.set("")  # 清空单选/判断题变量
+        for var in self.answer_vars:  # 清空多选题变量
+            var.set(False)
+
+        # 更新题型标签和题干
+        self.type_label.config(text=f"【{q_type}】")
+        self.text.config(state="normal")
+        self.text.delete(1.0, tk.END)  # 清空旧内容
+        self.text.insert(tk.END, question["question"])  # 插入新题干
+        self.text.config(state="disabled")  # 禁用文本控件，使其不可编辑
+        self.text.yview_moveto(0)  # 将文本滚动到顶部
+
+        # 切换选项框架：只有题型变化时才重新布局
+        answer_frame = self.get_answer_frame(q_type)
+        if answer_frame is not self.active_answer_frame:
+            if self.active_answer_frame is not None:
+                self.active_answer_frame.pack_forget()
+            if q_type == "判断题":
+                answer_frame.pack(fill=tk.X, pady=5, padx=10)
+            else:
+                answer_frame.pack(fill=tk.X, pady=5)
+            self.active_answer_frame = answer_frame
+
+        # 更新选项标签文本
+        labels = []
+        if q_type == "单选题":
+            labels = self.choice_option_labels
+        elif q_type == "多选题":
+            labels = self.multi_option_labels
+        for i, label in enumerate(labels):
+            label.config(text=options[i] if i < len(options) else "")
+
+        self.reset_content_color()
+
+    def get_answer(self):
+        """返回用户在本卡片上的作答 (多选题为排序后的字母串，如 "ACD")"""
+        if not self.question:
+            return ""
+        if self.question["type"] == "多选题":
+            answer = ""
+            for i, var in enumerate(self.answer_vars):
+                if var.get():  # 如果该选项被选中
+                    answer += chr(65 + i)  # 将索引转换为大写字母 (0->A, 1->B, ...)
+            return "".join(sorted(answer))
+        return self.answer_var.get()
+
+    def choose(self, letter):
+        """用键盘选择选项：单选/判断题选中该项，多选题切换该项"""
+        if not self.question:
+            return
+        q_type = self.question["type"]
+        index = ord(letter) - ord("A")
+        if q_type == "多选题":
+            if 0 <= index < len(self.answer_vars):
+                var = self.answer_vars[index]
+                var.set(not var.get())
+        elif q_type == "判断题":
+            if letter in ("A", "B"):
+                self.answer_var.set(letter)
+        elif 0 <= index < 4:
+            self.answer_var.set(letter)
+
+    # --- 颜色 ---
+    def set_content_color(self, color):
+        """设置题干和选项文字颜色 (用于淡入淡出动画)"""
+        self.text.configure(fg=color)
+        for label in self.choice_option_labels + self.multi_option_labels:
+            label.configure(foreground=color)
+
+    def reset_content_color(self):
+        """恢复题干颜色，并让选项标签重新跟随 Option.TLabel 样式"""
+        self.text.configure(fg=ModernUI.get_theme_color("text"))
+        for label in self.choice_option_labels + self.multi_option_labels:
+            label.configure(foreground="")
+
+    def apply_theme(self):
+        """更新非ttk控件 (tk.Text) 的颜色"""
+        self.text.configure(
+            bg=ModernUI.get_theme_color("card_bg"),
+            fg=ModernUI.get_theme_color("text"),
+        )
+
+    # --- 选项框架 ---
+    def get_answer_frame(self, q_type):
+        """返回指定题型的选项框架 (首次使用时才创建)"""
+        frame = self.answer_frames.get(q_type)
+        if frame is None:
+            frame = ttk.Frame(self.options_frame, style="Card.TFrame")
+            if q_type == "判断题":
+                self.build_judge_options(frame)
+            elif q_type == "单选题":
+                self.build_choice_options(frame)
+            else:
+                self.build_multi_options(frame)
+            self.answer_frames[q_type] = frame
+        return frame
+
+    def build_judge_options(self, frame):
+        """创建判断题选项 (A/B)"""
+        rb_true = ttk.Radiobutton(
+            frame,
+            text="对 (A)",
+            variable=self.answer_var,  # 绑定到单选变量
+            value="A",  # 选中时的值
+            style="TRadiobutton",
+        )
+        rb_true.pack(side=tk.LEFT, padx=30, pady=5, expand=True)  # 水平排列，扩展填充
+        # 绑定点击事件确保单击即选中 (有时ttk默认行为可能不符合预期)
+        rb_true.bind("<Button-1>", lambda e: self.answer_var.set("A"))
+
+        rb_false = ttk.Radiobutton(
+            frame,
+            text="错 (B)",
+            variable=self.answer_var,
+            value="B",
+            style="TRadiobutton",
+        )
+        rb_false.pack(side=tk.LEFT, padx=30, pady=5, expand=True)
+        rb_false.bind("<Button-1>", lambda e: self.answer_var.set("B"))
+
+    def build_choice_options(self, frame):
+        """创建单选题选项 (A/B/C/D)"""
+        for opt in ["A", "B", "C", "D"]:
+            # 每行一个选项，包含Radiobutton和Label
+            option_row = ttk.Frame(frame, style="Card.TFrame")
+            option_row.pack(fill=tk.X, pady=1, padx=10)  # 垂直排列，左右留边距
+
+            rb = ttk.Radiobutton(
+                option_row,
+                text=f"{opt}.",  # 显示 "A." "B." 等
+                variable=self.answer_var,  # 绑定到单选变量
+                value=opt,  # 选中时的值
+                style="TRadiobutton",
+            )
+            rb.grid(
+                row=0, column=0, sticky="w", padx=(15, 5), pady=5
+            )  # 左对齐，增加左内边距
+            # 绑定点击事件
+            rb.bind("<Button-1>", lambda e, v=opt: self.answer_var.set(v))
+
+            option_label = ttk.Label(
+                option_row,
+                text=f"选项 {opt}",  # 初始文本
+                wraplength=700,  # 自动换行宽度
+                style="Option.TLabel",
+                font=self.option_font,
+            )
+            option_label.grid(
+                row=0, column=1, sticky="w", pady=5
+            )  # 紧随Radiobutton之后，左对齐
+            # 点击标签也能选中对应的Radiobutton
+            option_label.bind("<Button-1>", lambda e, v=opt: self.answer_var.set(v))
+
+            self.choice_option_labels.append(
+                option_label
+            )  # 保存标签引用，以便后续更新文本
+            option_row.columnconfigure(1, weight=1)  # 让标签列可以扩展宽度
+
+    def build_multi_options(self, frame):
+        """创建多选题选项 (A/B/C/D)"""
+        for opt in ["A", "B", "C", "D"]:
+            var = tk.BooleanVar(value=False)  # 每个选项一个布尔变量
+            self.answer_vars.append(var)
+
+            # 每行一个选项，包含Checkbutton和Label
+            option_row = ttk.Frame(frame, style="Card.TFrame")
+            option_row.pack(fill=tk.X, pady=1, padx=10)
+
+            cb = ttk.Checkbutton(
+                option_row,
+                text=f"{opt}.",  # 显示 "A." "B." 等
+                variable=var,  # 绑定到对应的布尔变量
+                style="TCheckbutton",
+            )
+            cb.grid(
+                row=0, column=0, sticky="w", padx=(15, 5), pady=5
+            )  # 左对齐，增加左内边距
+
+            option_label = ttk.Label(
+                option_row,
+                text=f"选项 {opt}",  # 初始文本
+                wraplength=700,  # 自动换行宽度
+                style="Option.TLabel",
+                font=self.option_font,
+            )
+            option_label.grid(
+                row=0, column=1, sticky="w", pady=5
+            )  # 紧随Checkbutton之后，左对齐
+            # 点击标签也能切换对应的Checkbutton状态
+            option_label.bind(
+                "<Button-1>", lambda e, c=cb: c.invoke()
+            )  # invoke()模拟点击
+
+            self.multi_option_labels.append(option_label)  # 保存标签引用
+            option_row.columnconfigure(1, weight=1)  # 让标签列可以扩展宽度
@@ -0,0 +1,140 @@
+"""SQLite 题库按需读取：题目留在 SQLite 文件中，按页读取并缓存最近使用的页
+
+SqliteChapters 可直接作为 QuestionBank.chapters 使用：len()、下标和迭代的用法与
+章节列表相同。chapters[i] 返回 ChapterView，它的 len() 来自章节目录，不读取题目；
+chapters[i][j] 读取第 j 题所在的一页 (PAGE_SIZE 道题) 并放入最近使用缓存。常驻内存
+只有章节目录和至多 CACHE_PAGES 页题目，与题库大小无关。
+
+文件结构见 bank_formats.SQLITE_SCHEMA，可用 python bank_formats.py 题库.txt 题库.sqlite
+生成。题目表按 (章节, 序号) 聚簇存储，读取一页只需一次主键范围查询。
+"""
+
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import bank_formats
+
+PAGE_SIZE = 64  # 每页题目数
+CACHE_PAGES = 64  # 缓存的页数
+
+PAGE_QUERY = (
+    "SELECT type, question, options, answer FROM questions"
+    " WHERE chapter = ? AND position >= ? AND position < ? ORDER BY position"
+)
+
+
+def is_store_file(file_path):
+    """是否为按需读取的 SQLite 题库"""
+    return (
+        bank_formats.is_structured(file_path)
+        and bank_formats.format_of(file_path) == "sqlite"
+    )
+
+
+class ChapterView:
+    """一章题目的只读序列，题目按页从 SqliteChapters 读取"""
+
+    __slots__ = ("store", "chapter", "title", "size")
+
+    def __init__(self, store, chapter, title, size):
+        self.store = store
+        self.chapter = chapter  # 题目表中的章节编号
+        self.title = title
+        self.size = size
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(self.size))]
+        if position < 0:
+            position += self.size
+        if not 0 <= position < self.size:
+            raise IndexError("题目序号超出范围")
+        number, offset = divmod(position, self.store.page_size)
+        return self.store.page(self.chapter, number)[offset]
+
+    def __iter__(self):
+        # 顺序遍历 (导出、组卷等) 不放入缓存，以免挤掉答题时用到的页
+        pages = (self.size + self.store.page_size - 1) // self.store.page_size
+        for number in range(pages):
+            yield from self.store.page(self.chapter, number, cache=False)
+
+
+class SqliteChapters:
+    """SQLite 题库的章节序列 (可替代 QuestionBank.chapters)"""
+
+    def __init__(self, path, page_size=PAGE_SIZE, cache_pages=CACHE_PAGES):
+        self.path = path
+        self.page_size = page_size
+        self.cache_pages = cache_pages
+        self.cache = OrderedDict()  # 最近使用的页 {(章节编号, 页号): [题目, ...]}
+        self.hits = 0
+        self.misses = 0
+        # 界面线程和局域网服务器的请求线程都可能读取，查询和缓存由锁保护
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        try:
+            self.connection.execute("PRAGMA query_only = ON")
+            row = self.connection.execute(
+                "SELECT value FROM meta WHERE key = 'title'"
+            ).fetchone()
+            self.title = row[0] if row else None
+            self.views = []
+            self.hashes = []  # 每章的哈希 (热重载时判断章节是否变化)
+            for chapter, title, size, digest in self.connection.execute(
+                "SELECT chapter, title, size, hash FROM chapters"
+                " WHERE size > 0 ORDER BY chapter"
+            ):
+                self.views.append(ChapterView(self, chapter, title, size))
+                self.hashes.append(bytes(digest))
+        except sqlite3.Error:
+            self.connection.close()
+            raise
+
+    def __len__(self):
+        return len(self.views)
+
+    def __getitem__(self, chapter_index):
+        return self.views[chapter_index]
+
+    def __iter__(self):
+        return iter(self.views)
+
+    def page(self, chapter, number, cache=True):
+        """返回一页题目 (先查缓存；cache 为假时未命中的页不放入缓存)"""
+        key = (chapter, number)
+        with self.lock:
+            page = self.cache.get(key)
+            if page is not None:
+                self.cache.move_to_end(key)
+                self.hits += 1
+                return page
+            self.misses += 1
+            start = number * self.page_size
+            rows = self.connection.execute(
+                PAGE_QUERY, (chapter, start, start + self.page_size)
+            ).fetchall()
+            title = self.title_of(chapter)
+            page = [bank_formats.question_from_row(title, *row) for row in rows]
+            if cache:
+                self.cache[key] = page
+                if len(self.cache) > self.cache_pages:
+                    self.cache.popitem(last=False)
+            return page
+
+    def title_of(self, chapter):
+        # 章节编号由 bank_formats 写出时连续编号，通常与下标相同
+        if chapter < len(self.views) and self.views[chapter].chapter == chapter:
+            return self.views[chapter].title
+        for view in self.views:
+            if view.chapter == chapter:
+                return view.title
+        return ""
+
+    def close(self):
+        with self.lock:
+            self.cache.clear()
+            self.connection.close()
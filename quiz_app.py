@@ -3,17 +3,32 @@ from tkinter import ttk, filedialog, messagebox
 import os
 import sys
 import json
-import random
-from datetime import datetime
+import time
+from collections import deque
+import quiz_engine
+import session_store
+from bank_tabs import BankTab, StringPool
+from bank_watcher import BankWatcher
+from parse_worker import ParseJob
 from question_bank import QuestionBank
+from quiz_engine import QuizEngine
+from session_store import SessionSaver
 from modern_ui import ModernUI, RoundedButton
 from custom_dialog import CustomDialog
+from question_card import QuestionCard
+import metrics
+import profiling
+import ratings
+import startup
+from scheduler import Ticker
+from profiling import profiled
+from watchdog import start_watchdog
 
 
 class QuizApp:
     """主应用类"""
 
-    def __init__(self, root):
+    def __init__(self, root, resume=False):
         self.root = root
         self.root.title("QuizUp")  # 修改程序标题
 
@@ -23,17 +38,29 @@ class QuizApp:
         # 绑定主题切换事件，用于更新非ttk控件或特殊控件
         self.root.bind("<<ThemeChanged>>", self.on_theme_changed)
 
-        # 尝试设置应用图标
-        try:
-            # 获取资源路径 (适配打包)
-            base_dir = getattr(
-                sys, "_MEIPASS", os.path.dirname(os.path.abspath(__file__))
-            )
-            icon_path = os.path.join(base_dir, "QuizUp_icon.ico")
-            if os.path.exists(icon_path):
-                self.root.iconbitmap(icon_path)
-        except Exception:
-            pass  # 打包时忽略图标加载错误
+        # 性能剖析：环境变量或隐藏快捷键 Ctrl+Shift+P 开启
+        profiling.install(self.root, on_stopped=self.on_profiling_stopped)
+
+        # 延迟指标 (环境变量 QUIZUP_METRICS=1 开启，或按 Ctrl+Shift+D 打开调试浮层)
+        self.metrics = metrics.registry
+        metrics.enable_from_environment()
+        self.debug_overlay = None
+        self.last_fade_frame = 0.0  # 上一帧淡入淡出的时间 (用于计算帧抖动)
+        self.root.bind_all("<Control-Shift-D>", lambda e: self.toggle_debug_overlay())
+
+        # 事件循环看门狗：记录界面卡顿及当时的调用栈 (QUIZUP_WATCHDOG=0 关闭)
+        self.watchdog = start_watchdog(self.root)
+
+        # 速刷模式的键盘作答 (仅在速刷模式下生效)
+        self.root.bind("<KeyPress>", self.on_rapid_key)
+        # 章节列表 (跳转到任意章节)
+        self.root.bind("<Control-g>", lambda e: self.show_chapter_navigator())
+        # 标签页：Ctrl+Tab 切换到下一个题库，Ctrl+W 关闭当前题库
+        self.root.bind("<Control-Tab>", lambda e: self.next_tab())
+        self.root.bind("<Control-w>", lambda e: self.close_current_tab())
+
+        # 应用图标不影响首屏内容，等事件循环空闲时再加载
+        self.root.after_idle(self.load_icon)
 
         # 设置窗口大小
         window_width = 900
@@ -61,34 +88,47 @@ class QuizApp:
         self.option_font = ("微软雅黑", 11)  # 选项专用字体
 
         # 初始化变量
-        self.answer_var = tk.StringVar()  # 用于单选题和判断题
-        self.answer_vars = []  # 用于多选题 (存储BooleanVar)
-        self.choice_option_labels = []  # 存储单选题选项标签的引用
-        self.multi_option_labels = []  # 存储多选题选项标签的引用
+        self.front_card = None  # 当前显示题目的卡片 (答题界面创建后赋值)
+        self.back_card = None  # 用于预先布局下一题的后台卡片
+        self.prefetch_job = None  # 预取任务的 after_idle ID
         self.config = self.load_config()  # 加载配置 (如上次文件路径)
 
+        # 共享界面时钟：淡入淡出动画、速刷速度和考试倒计时都由它驱动
+        self.ticker = Ticker(self.root)
+
         # 添加动画效果的变量
-        self.fade_animation = None  # 用于存储当前动画任务的ID
         self.animation_running = False  # 动画是否正在运行的标志
+        self.fade_alpha = 1.0  # 前台卡片内容当前的透明度
+        self.fade_question = None  # 淡出结束后要显示的题目 (淡入阶段为 None)
         self.last_question = None  # 上一题内容 (用于动画对比)
+        self.animations_enabled = True  # 是否使用淡入淡出切题
+        # 当前题目完全显示 (淡入结束) 的时间 (monotonic)，用于记录答题用时
+        self.question_visible_at = None
+
+        # 速刷模式：键盘作答、行内反馈、无对话框和动画
+        self.rapid_mode = False
+        self.rapid_answer_times = deque()  # 最近一分钟内的作答时间 (monotonic)
+        self.rapid_started = 0.0  # 进入速刷模式的时间
+        self.feedback_job = None  # 清除行内反馈的 after ID
+        self.speed_due = 0.0  # 下次刷新速度显示的时刻 (monotonic)
         self.rounded_buttons = []  # 用于存储所有 RoundedButton 实例
-        self.answered_counts = {}  # 用于存储每章已答题目数 {chapter_index: count}
-
-        # 初始化答题统计数据
-        # 结构: { chapter_index: { "判断题": {"answered": n, "correct": m}, ... }, ... }
-        self.stats = {}
-
-        self.question_bank = None  # 当前加载的题库对象
-        self.current_question = None  # 当前显示的问题数据
-        self.current_chapter_index = 0  # 当前章节索引
-        self.shown_questions = (
-            set()
-        )  # 记录已显示过的题目 (chapter_index, question_index)
-        self.type_counts = {  # 记录每种题型在本章显示的次数 (用于可能的加权随机)
-            "判断题": 0,
-            "单选题": 0,
-            "多选题": 0,
-        }
+        self.stats_window = None  # 统计窗口 (非模态，打开时随答题增量更新)
+        self.host_window = None  # 现场答题主持窗口 (打开时每道新题都推送给参与者)
+        self.exam_window = None  # 模拟考试窗口
+        self.bank_browser = None  # 题库浏览窗口
+        self.chapter_navigator = None  # 章节列表窗口
+
+        # 打开的题库 (标签页)，各有自己的题库、答题会话和文件监视
+        self.tabs = []
+        self.tab = None  # 当前显示的标签页
+        self.string_pool = StringPool()  # 各标签页共享的字符串和已解析章节
+        self.parse_job = None  # 正在子进程中解析的题库
+        # 答题进度定时保存 (后台线程写文件)，关闭窗口时同步保存
+        self.session_saver = SessionSaver()
+        self.autosave_job = None
+        # 题目难度和学习者能力评分 (打开第一个题库时读取，随答题进度一起保存)
+        self.ratings = None
+        self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
 
         # 创建主框架 (使用ttk.Frame并应用样式)
         self.main_frame = ttk.Frame(self.root, padding="15 15 15 15", style="TFrame")
@@ -99,94 +139,75 @@ class QuizApp:
         # 创建内容框架 (用于放置开始界面或答题界面)
         self.content_frame = ttk.Frame(self.main_frame, style="TFrame")
         self.content_frame.grid(row=0, column=0, sticky="nsew")  # 使用grid布局
+        self.content_frame.rowconfigure(0, weight=1)
+        self.content_frame.columnconfigure(0, weight=1)
+
+        # 界面缓存：每个界面只创建一次，切换时用 grid_remove 隐藏 {名称: Frame}
+        self.screens = {}
+        self.current_screen = None
 
         # 创建开发者标签
         self.author_label = ttk.Label(
             self.main_frame,
             text="开发者：Dabbler",
             font=("微软雅黑", 9),
-            style="TLabel",  # 使用基础标签样式
+            style="Secondary.TLabel",  # 次要文字样式，随主题自动换色
         )
         # 将开发者标签放置在主框架右下角
         self.author_label.grid(row=1, column=0, sticky="se", padx=5, pady=5)
-        # 初始化时设置颜色
-        self.author_label.configure(
-            foreground=ModernUI.get_theme_color("text_secondary")
-        )
 
-        # 创建开始界面
-        self.create_start_screen()
-
-    def on_theme_changed(self, event=None):
-        """处理主题变更事件，更新需要手动调整颜色的控件"""
-        # 更新根窗口背景 (apply_theme已做，但再次确认无妨)
-        self.root.configure(bg=ModernUI.get_theme_color("bg"))
+        # 显示开始界面；自动继续时直接进入上次的题库 (不创建开始界面)
+        last_file = self.config.get("last_file")
+        if (
+            (resume or self.config.get("auto_resume"))
+            and last_file
+            and os.path.exists(last_file)
+        ):
+            self.start_quiz(last_file, resume_session=True)
+        else:
+            self.show_start_screen()
+        startup.phase("app_init")
+        # 事件循环处理到这个空闲任务时，首屏已完成首次绘制
+        self.root.after_idle(self.on_startup_done)
 
-        # 更新ttk样式以反映新主题 (apply_theme已做)
-        # ModernUI.style_widgets(self.root) # 无需重复调用
+    def load_icon(self):
+        """设置应用图标"""
+        try:
+            # 获取资源路径 (适配打包)
+            base_dir = getattr(
+                sys, "_MEIPASS", os.path.dirname(os.path.abspath(__file__))
+            )
+            icon_path = os.path.join(base_dir, "QuizUp_icon.ico")
+            if os.path.exists(icon_path):
+                self.root.iconbitmap(icon_path)
+        except Exception:
+            pass  # 打包时忽略图标加载错误
 
-        # 更新作者标签颜色 (它是ttk.Label，但前景设为次要文本色)
-        self.author_label.configure(
-            foreground=ModernUI.get_theme_color("text_secondary")
-        )
+    def on_startup_done(self):
+        """记录启动完成 (首题或开始界面已显示)"""
+        if self.current_screen is not None and self.current_screen is self.screens.get(
+            "quiz"
+        ):
+            startup.finish("first_question")
+        else:
+            startup.finish("first_screen")
 
-        # 更新所有RoundedButton按钮的颜色
-        self.update_rounded_buttons()  # 现在会使用优化后的方法
+    def on_theme_changed(self, event=None):
+        """处理主题变更事件，更新无法通过ttk样式着色的控件"""
+        # theme_use 会向每个控件派发 <<ThemeChanged>>，只处理根窗口上的那一次
+        if event is not None and event.widget is not self.root:
+            return
 
-        # 如果当前显示的是问题页面，更新问题卡片内的非ttk或特殊控件
-        if hasattr(self, "question_text") and self.question_text.winfo_exists():
-            # 更新题目文本区域 (tk.Text) 的背景和前景
-            bg_color = ModernUI.get_theme_color("card_bg")
-            fg_color = ModernUI.get_theme_color("text")
-            self.question_text.configure(bg=bg_color, fg=fg_color)
+        # 更新根窗口背景 (apply_theme已做，但再次确认无妨)
+        self.root.configure(bg=ModernUI.get_theme_color("bg"))
 
-            # 更新题型标签 (ttk.Label，但背景色需明确为卡片背景)
-            if hasattr(self, "question_type_label"):
-                self.question_type_label.configure(
-                    background=bg_color, foreground=ModernUI.get_theme_color("primary")
-                )
+        # ttk控件 (标签、选项、进度条等) 已随 theme_use 自动换色，
+        # 这里只需更新 RoundedButton (Canvas) 和 tk.Text 这类非ttk控件
+        self.update_rounded_buttons()
 
-            # 更新选项区域 (ttk控件样式已在style_widgets中更新)
-            # 需要手动更新选项 Label 的颜色
-            if hasattr(self, "options_frame") and self.options_frame.winfo_exists():
-                card_bg_color = ModernUI.get_theme_color("card_bg")
-                text_color = ModernUI.get_theme_color("text")
-                # 更新选项框架背景
-                self.options_frame.configure(style="Card.TFrame")  # 确保背景是卡片色
-                # 更新判断题、单选、多选框架背景
-                for frame in [self.judge_frame, self.choice_frame, self.multi_frame]:
-                    if frame.winfo_exists():
-                        frame.configure(style="Card.TFrame")
-                        # 遍历子控件更新 Label 颜色
-                        for widget in frame.winfo_children():
-                            if isinstance(widget, ttk.Frame):  # 选项行框架
-                                widget.configure(style="Card.TFrame")
-                                for child in widget.winfo_children():
-                                    if isinstance(child, ttk.Label):
-                                        # 更新选项 Label 颜色
-                                        child.configure(
-                                            background=card_bg_color,
-                                            foreground=text_color,
-                                        )
-                                    elif isinstance(
-                                        child, (ttk.Radiobutton, ttk.Checkbutton)
-                                    ):
-                                        # ttk 控件理论上会自动更新，但可以强制指定背景
-                                        child.configure(
-                                            style=child.winfo_class()
-                                        )  # 重新应用样式
-                            elif isinstance(
-                                widget, (ttk.Radiobutton, ttk.Checkbutton)
-                            ):  # 判断题的直接子控件
-                                widget.configure(
-                                    style=widget.winfo_class()
-                                )  # 重新应用样式
-
-            # 更新进度标签颜色 (ttk.Label，但前景设为次要文本色)
-            if hasattr(self, "progress_label") and self.progress_label.winfo_exists():
-                self.progress_label.configure(
-                    foreground=ModernUI.get_theme_color("text_secondary")
-                )
+        # 如果答题界面已创建，更新两张题目卡片中的 tk.Text
+        for card in getattr(self, "cards", []):
+            card.apply_theme()
 
     def update_rounded_buttons(self):
         """更新应用中所有RoundedButton实例的颜色以匹配当前主题 (优化版)"""
@@ -254,7 +275,8 @@ class QuizApp:
         # 获取资源路径 (适配打包)
         base_dir = getattr(sys, "_MEIPASS", os.path.dirname(os.path.abspath(__file__)))
         config_path = os.path.join(base_dir, "quiz_config.json")
-        default_config = {"last_file": "", "recent_files": []}  # 默认配置
+        # 默认配置 (auto_resume：启动时直接继续上次的题库)
+        default_config = {"last_file": "", "recent_files": [], "auto_resume": False}
 
         if os.path.exists(config_path):
             try:
@@ -285,16 +307,35 @@ class QuizApp:
         except IOError:
             pass  # 忽略保存配置失败
 
-    def create_start_screen(self):
-        """创建开始界面"""
-        # 清除内容框架中的所有组件
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
-        self.content_frame.configure(style="TFrame")  # 确保是基础样式
-        self.rounded_buttons.clear()  # 清空旧按钮列表
-
+    def show_screen(self, name):
+        """显示指定界面 (首次显示时创建)，并隐藏其他界面"""
+        screen = self.screens.get(name)
+        if screen is None:
+            screen = ttk.Frame(self.content_frame, style="TFrame")
+            if name == "start":
+                self.build_start_screen(screen)
+            else:
+                self.build_quiz_screen(screen)
+            self.screens[name] = screen
+
+        if self.current_screen is not None and self.current_screen is not screen:
+            self.current_screen.grid_remove()
+        screen.grid(row=0, column=0, sticky="nsew")
+        self.current_screen = screen
+        return screen
+
+    def show_start_screen(self):
+        """显示开始界面 (返回主菜单)"""
+        self.save_session()
+        # 离开答题界面时停止尚未完成的淡入淡出动画
+        self.stop_fade()
+        self.show_screen("start")
+        self.update_continue_button()
+
+    def build_start_screen(self, screen):
+        """创建开始界面 (只执行一次)"""
         # 创建容器框架 (用于居中内容)
-        center_frame = ttk.Frame(self.content_frame, padding="20 40", style="TFrame")
+        center_frame = ttk.Frame(screen, padding="20 40", style="TFrame")
         # 使用 place 将其放置在内容框架的中心偏上位置
         center_frame.place(relx=0.5, rely=0.45, anchor=tk.CENTER)
 
@@ -362,7 +403,22 @@ class QuizApp:
         select_button.pack(pady=12)
         self.rounded_buttons.append(select_button)  # 添加到列表
 
-        # 继续上次学习按钮 (如果配置文件中有记录且文件存在)
+        # 继续上次学习按钮 (文字和可见性在每次显示开始界面时刷新)
+        self.continue_button = ModernUI.create_rounded_button(
+            button_frame,
+            text="继续",
+            command=self.continue_last_file,
+            width=250,  # 按钮稍宽以容纳文件名
+            height=40,
+            corner_radius=20,
+            color_role="success",  # 指定角色
+            fg="white",
+            font=("微软雅黑", 11),
+        )
+        self.rounded_buttons.append(self.continue_button)  # 添加到列表
+
+    def update_continue_button(self):
+        """根据配置刷新“继续上次学习”按钮 (如果有记录且文件存在才显示)"""
         last_file = self.config.get("last_file")
         if last_file and os.path.exists(last_file):
             last_file_name = os.path.basename(last_file)
@@ -372,22 +428,14 @@ class QuizApp:
                 if len(last_file_name) < 30
                 else last_file_name[:27] + "..."  # 超长则截断并加省略号
             )
-            continue_button = ModernUI.create_rounded_button(
-                button_frame,
-                text=f"继续: {display_name}",
-                # 使用 lambda 传递参数，确保每次点击都用最新的 lf 值
-                command=lambda lf=last_file: self.start_quiz(lf),
-                width=250,  # 按钮稍宽以容纳文件名
-                height=40,
-                corner_radius=20,
-                # bg=ModernUI.get_theme_color("success"), # 由 color_role 决定
-                # hover_bg=ModernUI.get_theme_color("success_dark"),
-                color_role="success",  # 指定角色
-                fg="white",
-                font=("微软雅黑", 11),
-            )
-            continue_button.pack(pady=12)
-            self.rounded_buttons.append(continue_button)  # 添加到列表
+            self.continue_button.set_text(f"继续: {display_name}")
+            self.continue_button.pack(pady=12)
+        else:
+            self.continue_button.pack_forget()
+
+    def continue_last_file(self):
+        """继续上次打开的题库 (恢复保存的答题进度)"""
+        self.start_quiz(self.config.get("last_file"), resume_session=True)
 
     def select_question_bank(self):
         """打开文件对话框选择题库文件"""
@@ -396,7 +444,13 @@ class QuizApp:
         file_path = filedialog.askopenfilename(
             initialdir=current_dir,
             title="选择题库文件",
-            filetypes=(("文本文件", "*.txt"), ("所有文件", "*.*")),  # 文件类型过滤器
+            filetypes=(  # 文件类型过滤器
+                ("题库文件", "*.txt *.jsonl *.sqlite *.sqlite3 *.db"),
+                ("文本文件", "*.txt"),
+                ("JSONL", "*.jsonl"),
+                ("SQLite", "*.sqlite *.sqlite3 *.db"),
+                ("所有文件", "*.*"),
+            ),
         )
 
         if file_path:  # 如果用户选择了文件
@@ -415,50 +469,226 @@ class QuizApp:
             # 开始答题
             self.start_quiz(file_path)
 
-    def start_quiz(self, file_path=None):
-        """根据提供的文件路径开始答题"""
+    def start_quiz(self, file_path=None, resume_session=False):
+        """根据提供的文件路径开始答题 (resume_session 为真时恢复该题库保存的进度)"""
+        # 切换题库前保存当前题库的进度
+        self.save_session()
         if not file_path:
             messagebox.showerror("错误", "未指定题库文件路径。")
-            self.create_start_screen()  # 返回开始界面
+            self.show_start_screen()  # 返回开始界面
             return
-
-        # 初始化题库对象
-        self.question_bank = QuestionBank()
-        # 加载题库文件，如果失败则显示错误并返回开始界面
-        if not self.question_bank.load_question_bank(file_path):
-            # 错误消息已在 load_question_bank 中显示
-            self.create_start_screen()
+        # 已在标签页中打开的题库直接切换过去 (保留其进度，不重新解析)
+        for tab in self.tabs:
+            if tab.is_file(file_path):
+                self.switch_tab(tab)
+                return
+
+        # 题库文件未修改时直接读取解析快照；否则在受限的子进程中解析，界面保持响应
+        started = self.metrics.start()
+        import question_store  # 依赖 sqlite3，打开题库时才导入
+
+        question_bank = QuestionBank()
+        if question_store.is_store_file(file_path):
+            # SQLite 题库按需读取，打开时只读取章节目录，不需要子进程解析
+            if question_bank.load_question_bank(file_path):
+                self.open_question_bank(question_bank, resume_session, started)
+            elif self.tab is None:
+                self.show_start_screen()
             return
+        if question_bank.load_snapshot(file_path):
+            self.open_question_bank(question_bank, resume_session, started)
+            return
+        if self.parse_job:
+            self.parse_job.cancel()
+        # 与已打开题库内容相同的章节直接复用，子进程不再解析
+        known = self.string_pool.known_chapters(tab.question_bank for tab in self.tabs)
+        self.parse_job = ParseJob(file_path, known=known)
+        self.parse_job.start()
+        if self.current_screen is None:
+            self.show_start_screen()
+        self.root.configure(cursor="watch")
+        self.poll_parse_job(self.parse_job, resume_session, started)
+
+    def poll_parse_job(self, job, resume_session, started):
+        """定时收取子进程的解析结果，完成后打开题库"""
+        if job is not self.parse_job:
+            return  # 已被新的加载取代
+        if not job.poll():
+            self.root.after(
+                50, lambda: self.poll_parse_job(job, resume_session, started)
+            )
+            return
+        self.parse_job = None
+        self.root.configure(cursor="")
+        if job.bank is None:
+            messagebox.showerror(
+                "错误", "\n".join(job.diagnostics) or "题库中没有识别到题目。"
+            )
+            if self.tab is None:
+                self.show_start_screen()
+            return
+        if job.diagnostics:
+            # 超出解析限制时使用已解析的部分章节
+            messagebox.showwarning(
+                "提示" if job.complete else "题库未完整加载",
+                "\n".join(job.diagnostics[:5]),
+            )
+        self.open_question_bank(job.bank, resume_session, started)
+
+    def open_question_bank(self, question_bank, resume_session, started):
+        """使用加载好的题库开始答题 (在新标签页中打开)"""
+        file_path = question_bank.file_path
+        self.metrics.stop("bank_parse_ms", started)
+        startup.phase("bank_load")
+
+        # 为新题库创建答题会话 (答题状态和统计从零开始，或恢复保存的进度)
+        if self.ratings is None:
+            self.ratings = ratings.Ratings.load()
+        engine = QuizEngine(question_bank, ratings=self.ratings)
+        engine.set_adaptive(self.config.get("adaptive", False))
+        if resume_session:
+            snapshot = session_store.load_session(file_path)
+            if snapshot is not None:
+                engine.restore(snapshot)
+        engine.subscribe(self.on_engine_event)
+        tab = BankTab(question_bank, engine)
+        # 并入共享存储 (驻留字符串、复用相同章节) 不影响首题，空闲时再做
+        others = [other.question_bank for other in self.tabs]
+        self.root.after_idle(lambda: self.string_pool.adopt(question_bank, others))
+
+        self.stop_fade()
+        self.cancel_prefetch()
+        self.tabs.append(tab)
+        self.schedule_autosave()
+        self.activate_tab(tab)
+
+        # 显示第一题
+        self.show_chapter_question()
 
-        # 重置答题状态
-        self.current_chapter_index = 0
-        self.shown_questions = set()
-        self.type_counts = {"判断题": 0, "单选题": 0, "多选题": 0}
-        self.stats = {}  # 重置统计数据
-        self.answered_counts = {}  # 重置章节计数
-        # 初始化第一章计数 (如果题库非空)
-        if self.question_bank and self.question_bank.chapters:
-            self.answered_counts[0] = 0
+    # --- 标签页 (同时打开多个题库) ---
+    def activate_tab(self, tab):
+        """把 tab 设为当前标签页：只为它运行文件监视，刷新窗口标题和已打开的窗口"""
+        if self.tab is not None and self.tab is not tab and self.tab.bank_watcher:
+            self.tab.bank_watcher.stop()
+        self.tab = tab
+        self.watch_bank()
+        self.refresh_stats_window()
+        self.refresh_bank_windows()
 
         # 更新窗口标题以包含题库名称
-        self.root.title(f"题库复习 - {self.question_bank.title}")
+        self.set_title(f"题库复习 - {tab.title}")
 
-        # 创建答题界面
-        self.create_quiz_screen()
+        # 显示答题界面 (已创建过则直接复用)
+        self.show_screen("quiz")
+        self.update_tab_bar()
 
-        # 显示第一题
-        self.show_chapter_question()
+    def switch_tab(self, tab):
+        """切换到已打开的题库：换入它的会话并显示它的当前题目，不重新解析"""
+        if tab is self.tab and self.current_screen is self.screens.get("quiz"):
+            return
+        self.stop_fade()
+        self.cancel_prefetch()
+        self.save_session()
+        self.activate_tab(tab)
 
-    def create_quiz_screen(self):
-        """创建答题主界面"""
-        # 清除内容框架
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
-        self.content_frame.configure(style="TFrame")
-        self.rounded_buttons.clear()  # 清空旧按钮列表
+        question = self.engine.current_question
+        if question is None or not self.engine.awaiting_answer:
+            self.show_chapter_question()
+            return
+        # 该标签页还有未作答的题目：直接显示它 (不做淡入淡出)
+        self.question_visible_at = None
+        self.update_chapter_header(question)
+        self.update_question_content(question)
+        self.front_card.reset_content_color()
+        self.on_question_visible()
+
+    def next_tab(self):
+        """切换到下一个标签页 (循环)"""
+        if len(self.tabs) > 1 and self.tab in self.tabs:
+            index = self.tabs.index(self.tab)
+            self.switch_tab(self.tabs[(index + 1) % len(self.tabs)])
+        return "break"
+
+    def close_current_tab(self):
+        if self.tab is not None and self.current_screen is self.screens.get("quiz"):
+            self.close_tab(self.tab)
+        return "break"
+
+    def close_tab(self, tab):
+        """关闭标签页 (先保存它的进度)，关闭当前标签页时切换到相邻的标签页"""
+        if tab.bank_watcher:
+            tab.bank_watcher.stop()
+        self.save_tab(tab)
+        index = self.tabs.index(tab)
+        self.tabs.remove(tab)
+        # 释放只有这个题库用到的驻留字符串
+        self.root.after_idle(self.rebuild_string_pool)
+        if tab is not self.tab:
+            self.update_tab_bar()
+        elif self.tabs:
+            self.switch_tab(self.tabs[min(index, len(self.tabs) - 1)])
+        else:
+            self.stop_fade()
+            self.cancel_prefetch()
+            self.tab = None
+            self.refresh_stats_window()
+            self.refresh_bank_windows()
+            self.set_title("QuizUp")
+            self.update_tab_bar()
+            self.show_start_screen()
+        if tab.question_bank.store is not None:
+            tab.question_bank.store.close()
+
+    def rebuild_string_pool(self):
+        """按仍打开的题库重建共享的驻留表 (空闲时执行，约 0.1 秒/10 万题)"""
+        self.string_pool.rebuild([tab.question_bank for tab in self.tabs])
+
+    def update_tab_bar(self):
+        """重建标签页栏 (标签页很少，直接重建)"""
+        if not hasattr(self, "tab_bar"):
+            return
+        for child in self.tab_bar.winfo_children():
+            child.destroy()
+        for tab in self.tabs:
+            active = tab is self.tab
+            frame = ttk.Frame(
+                self.tab_bar,
+                style="Card.TFrame" if active else "TFrame",
+                padding="10 4",
+            )
+            frame.pack(side=tk.LEFT, padx=(0, 4))
+            title = tab.title if len(tab.title) <= 20 else tab.title[:19] + "…"
+            label = ttk.Label(
+                frame,
+                text=title,
+                style="StatsHeader.TLabel" if active else "Secondary.TLabel",
+                cursor="hand2",
+            )
+            label.pack(side=tk.LEFT)
+            label.bind("<Button-1>", lambda e, t=tab: self.switch_tab(t))
+            close_label = ttk.Label(
+                frame,
+                text="×",
+                style="StatsHeader.TLabel" if active else "Secondary.TLabel",
+                cursor="hand2",
+            )
+            close_label.pack(side=tk.LEFT, padx=(8, 0))
+            close_label.bind("<Button-1>", lambda e, t=tab: self.close_tab(t))
+        # 打开另一个题库 (在新标签页中)
+        add_label = ttk.Label(
+            self.tab_bar, text="+ 打开题库", style="Secondary.TLabel", cursor="hand2"
+        )
+        add_label.pack(side=tk.LEFT, padx=(6, 0))
+        add_label.bind("<Button-1>", lambda e: self.select_question_bank())
+
+    def build_quiz_screen(self, screen):
+        """创建答题主界面 (只执行一次)"""
+        # --- 标签页栏 (每个打开的题库一个标签，见 update_tab_bar) ---
+        self.tab_bar = ttk.Frame(screen, padding="10 0 10 0", style="TFrame")
+        self.tab_bar.pack(fill=tk.X)
 
         # --- 顶部面板 (章节标题和控制按钮) ---
-        top_panel = ttk.Frame(self.content_frame, padding="0 10 0 10", style="TFrame")
+        top_panel = ttk.Frame(screen, padding="0 10 0 10", style="TFrame")
         top_panel.pack(fill=tk.X)
 
         # 章节标签
@@ -469,6 +699,9 @@ class QuizApp:
             style="Chapter.TLabel",  # 应用章节标题样式
         )
         self.chapter_label.pack(side=tk.LEFT, padx=(10, 0))
+        # 点击章节标题打开章节列表
+        self.chapter_label.configure(cursor="hand2")
+        self.chapter_label.bind("<Button-1>", lambda e: self.show_chapter_navigator())
 
         # 右侧控制按钮框架
         control_frame = ttk.Frame(top_panel, style="TFrame")
@@ -496,6 +729,82 @@ class QuizApp:
         theme_button.pack(side=tk.RIGHT, padx=5)
         self.rounded_buttons.append(theme_button)  # 添加到列表
 
+        # 速刷模式切换按钮
+        self.rapid_button = ModernUI.create_rounded_button(
+            control_frame,
+            text="速刷",
+            command=self.toggle_rapid_mode,
+            width=70,
+            height=30,
+            corner_radius=15,
+            color_role="success",  # 指定角色
+            fg="white",
+            font=("微软雅黑", 9),
+        )
+        self.rapid_button.pack(side=tk.RIGHT, padx=5)
+        self.rounded_buttons.append(self.rapid_button)  # 添加到列表
+
+        # 自适应选题切换按钮 (开启时显示能力评分)
+        self.adaptive_button = ModernUI.create_rounded_button(
+            control_frame,
+            text="自适应",
+            command=self.toggle_adaptive_mode,
+            width=90,
+            height=30,
+            corner_radius=15,
+            color_role="neutral",  # 指定角色
+            fg="white",
+            font=("微软雅黑", 9),
+        )
+        self.adaptive_button.pack(side=tk.RIGHT, padx=5)
+        self.rounded_buttons.append(self.adaptive_button)  # 添加到列表
+        self.update_adaptive_button()
+
+        # 现场答题主持按钮
+        self.host_button = ModernUI.create_rounded_button(
+            control_frame,
+            text="主持",
+            command=self.show_host_window,
+            width=70,
+            height=30,
+            corner_radius=15,
+            color_role="primary",  # 指定角色
+            fg="white",
+            font=("微软雅黑", 9),
+        )
+        self.host_button.pack(side=tk.RIGHT, padx=5)
+        self.rounded_buttons.append(self.host_button)  # 添加到列表
+
+        # 题库浏览按钮
+        self.browse_button = ModernUI.create_rounded_button(
+            control_frame,
+            text="浏览",
+            command=self.show_bank_browser,
+            width=70,
+            height=30,
+            corner_radius=15,
+            color_role="neutral",  # 指定角色
+            fg="white",
+            font=("微软雅黑", 9),
+        )
+        self.browse_button.pack(side=tk.RIGHT, padx=5)
+        self.rounded_buttons.append(self.browse_button)  # 添加到列表
+
+        # 模拟考试按钮
+        self.exam_button = ModernUI.create_rounded_button(
+            control_frame,
+            text="考试",
+            command=self.show_exam_window,
+            width=70,
+            height=30,
+            corner_radius=15,
+            color_role="secondary",  # 指定角色
+            fg="white",
+            font=("微软雅黑", 9),
+        )
+        self.exam_button.pack(side=tk.RIGHT, padx=5)
+        self.rounded_buttons.append(self.exam_button)  # 添加到列表
+
         # 答题统计按钮
         self.stats_button = ModernUI.create_rounded_button(
             control_frame,
@@ -517,7 +826,7 @@ class QuizApp:
         home_button = ModernUI.create_rounded_button(
             control_frame,
             text="主菜单",
-            command=self.create_start_screen,  # 返回开始界面
+            command=self.show_start_screen,  # 返回开始界面
             width=90,
             height=30,
             corner_radius=15,
@@ -532,7 +841,7 @@ class QuizApp:
 
         # --- 问题卡片面板 ---
         # 外层容器用于可能的阴影或边距效果
-        card_container = ttk.Frame(self.content_frame, style="TFrame")
+        card_container = ttk.Frame(screen, style="TFrame")
         card_container.pack(fill=tk.BOTH, expand=True, padx=20, pady=15)
 
         # 问题卡片主体 (使用Card样式)
@@ -540,59 +849,26 @@ class QuizApp:
         question_panel.pack(fill=tk.BOTH, expand=True)
 
         # 配置卡片内部行列权重
-        question_panel.rowconfigure(0, weight=0)  # 题型标签 (固定高度)
-        question_panel.rowconfigure(1, weight=3)  # 问题文本区域 (可扩展)
-        question_panel.rowconfigure(2, weight=4)  # 选项框架 (可扩展，权重稍大)
-        question_panel.rowconfigure(3, weight=0)  # 进度条框架 (固定高度)
-        question_panel.rowconfigure(4, weight=0)  # 下一题按钮框架 (固定高度)
+        question_panel.rowconfigure(0, weight=1)  # 题目卡片 (可扩展)
+        question_panel.rowconfigure(1, weight=0)  # 进度条框架 (固定高度)
+        question_panel.rowconfigure(2, weight=0)  # 下一题按钮框架 (固定高度)
         question_panel.columnconfigure(0, weight=1)  # 列宽占满
 
-        # 题目类型标签
-        self.question_type_label = ttk.Label(
-            question_panel,
-            text="【题型】",
-            style="QuestionType.TLabel",  # 应用题型样式
-            # 背景色由样式自动处理
-        )
-        self.question_type_label.grid(row=0, column=0, sticky="nw", pady=(0, 5))
-
-        # 题目显示区域 (使用tk.Text)
-        # 外部套一层Frame是为了更好地控制边距和样式一致性
-        text_frame = ttk.Frame(question_panel, style="Card.TFrame", borderwidth=0)
-        text_frame.grid(row=1, column=0, sticky="nsew", pady=(0, 5))
-        text_frame.rowconfigure(0, weight=1)
-        text_frame.columnconfigure(0, weight=1)
-
-        # 题目文本控件 (tk.Text)
-        self.question_text = tk.Text(
-            text_frame,
-            wrap=tk.WORD,  # 自动换行
-            font=self.question_font,
-            bg=ModernUI.get_theme_color("card_bg"),  # 背景设为卡片背景
-            fg=ModernUI.get_theme_color("text"),  # 前景设为文本颜色
-            bd=0,  # 无边框
-            height=2.5,  # 初始高度 (大致行数)
-            relief=tk.FLAT,  # 扁平样式
-            state="disabled",  # 初始不可编辑
-            highlightthickness=0,  # 无焦点高亮边框
-            cursor="arrow",  # 使用箭头光标
-        )
-        self.question_text.grid(row=0, column=0, sticky="nsew")
-
-        # 选项框架 (用于容纳不同题型的选项)
-        self.options_frame = ttk.Frame(
-            question_panel, style="Card.TFrame", borderwidth=0
-        )
-        self.options_frame.grid(row=2, column=0, sticky="nsew", pady=(0, 5))
-        self.options_frame.columnconfigure(0, weight=1)  # 使选项内容水平扩展
-
-        # 创建答案选项按钮/标签 (初始隐藏)
-        self.create_answer_buttons()
+        # 双缓冲题目卡片：两张卡片叠放在同一单元格，前台显示当前题，
+        # 后台预先布局下一题，切题时只需提升后台卡片
+        self.cards = [
+            QuestionCard(question_panel, self.question_font, self.option_font)
+            for _ in range(2)
+        ]
+        for card in self.cards:
+            card.grid(row=0, column=0, sticky="nsew")
+        self.front_card, self.back_card = self.cards
+        self.front_card.tkraise()
 
         # 进度指示器框架
         self.progress_frame = ttk.Frame(question_panel, style="TFrame")
         self.progress_frame.grid(
-            row=3, column=0, sticky="ew", pady=(0, 5)
+            row=1, column=0, sticky="ew", pady=(0, 5)
         )  # 减少底部pady
         self.progress_frame.columnconfigure(0, weight=1)
         # 配置行权重
@@ -613,9 +889,8 @@ class QuizApp:
         self.progress_label = ttk.Label(
             self.progress_frame,
             text="已答: 0 / 总数: 0",  # 初始文本
-            style="TLabel",  # 使用基础标签样式
+            style="Secondary.TLabel",  # 次要文字样式
             font=("微软雅黑", 8),  # 字体稍小
-            foreground=ModernUI.get_theme_color("text_secondary"),  # 次要文本色
         )
         self.progress_label.grid(
             row=1, column=0, sticky="w", padx=5
@@ -625,7 +900,7 @@ class QuizApp:
         next_button_frame = ttk.Frame(
             question_panel, style="Card.TFrame", borderwidth=0
         )
-        next_button_frame.grid(row=4, column=0, sticky="ew", pady=(10, 0))
+        next_button_frame.grid(row=2, column=0, sticky="ew", pady=(10, 0))
         next_button_frame.columnconfigure(0, weight=1)  # 用于居中按钮
 
         # 下一题按钮
@@ -645,12 +920,29 @@ class QuizApp:
         self.next_button.grid(row=0, column=0, pady=5)  # 放置在框架中央
         self.rounded_buttons.append(self.next_button)  # 添加到列表
 
+        # 速刷模式状态栏：左侧行内反馈，右侧实时速度 (仅速刷模式显示)
+        self.rapid_bar = ttk.Frame(next_button_frame, style="Card.TFrame")
+        self.rapid_bar.columnconfigure(0, weight=1)
+        self.feedback_label = ttk.Label(
+            self.rapid_bar, text="", style="FeedbackCorrect.TLabel"
+        )
+        self.feedback_label.grid(row=0, column=0, sticky="w", padx=5)
+        self.speed_label = ttk.Label(
+            self.rapid_bar, text="速度: 0 题/分钟", style="Speed.TLabel"
+        )
+        self.speed_label.grid(row=0, column=1, sticky="e", padx=5)
+        ttk.Label(
+            self.rapid_bar,
+            text="1-4 / A-D 选择，回车提交",
+            style="StatsMuted.TLabel",
+        ).grid(row=1, column=0, columnspan=2, sticky="w", padx=5)
+
         # --- 底部章节切换 ---
-        bottom_frame = ttk.Frame(self.content_frame, padding="10 10", style="TFrame")
+        bottom_frame = ttk.Frame(screen, padding="10 10", style="TFrame")
         bottom_frame.pack(fill=tk.X)
-        # 配置列权重使按钮分布在两侧
+        # 配置列权重使按钮分布在两侧，章节列表按钮居中
         bottom_frame.columnconfigure(0, weight=1)
-        bottom_frame.columnconfigure(1, weight=1)
+        bottom_frame.columnconfigure(2, weight=1)
 
         # 上一章按钮
         self.prev_chapter_button = ModernUI.create_rounded_button(
@@ -683,142 +975,145 @@ class QuizApp:
             fg="white",
             font=("微软雅黑", 10),
         )
-        self.next_chapter_button.grid(row=0, column=1, sticky="w", padx=10)  # 靠左对齐
+        self.next_chapter_button.grid(row=0, column=2, sticky="w", padx=10)  # 靠左对齐
         self.rounded_buttons.append(self.next_chapter_button)  # 添加到列表
 
-    def create_answer_buttons(self):
-        """创建用于显示答案选项的ttk控件 (初始隐藏)"""
-        # 清除旧的选项标签引用
-        self.choice_option_labels = []
-        self.multi_option_labels = []
-
-        # 共享的样式参数
-        style_args = {"style": "TRadiobutton"}  # 单选按钮样式
-        check_style_args = {"style": "TCheckbutton"}  # 复选框样式
-        label_style_args = {
-            "style": "Option.TLabel",
-            "font": self.option_font,
-        }  # 选项标签样式
-
-        # --- 判断题选项 (A/B) ---
-        self.judge_frame = ttk.Frame(self.options_frame, style="Card.TFrame")
-        # 使用pack布局，稍后根据题目类型决定是否显示
-        self.judge_frame.pack(fill=tk.X, pady=5)
-
-        rb_true = ttk.Radiobutton(
-            self.judge_frame,
-            text="对 (A)",
-            variable=self.answer_var,  # 绑定到单选变量
-            value="A",  # 选中时的值
-            **style_args,
-        )
-        rb_true.pack(side=tk.LEFT, padx=30, pady=5, expand=True)  # 水平排列，扩展填充
-        # 绑定点击事件确保单击即选中 (有时ttk默认行为可能不符合预期)
-        rb_true.bind("<Button-1>", lambda e: self.answer_var.set("A"))
-
-        rb_false = ttk.Radiobutton(
-            self.judge_frame,
-            text="错 (B)",
-            variable=self.answer_var,
-            value="B",
-            **style_args,
+        # 章节列表按钮 (也可按 Ctrl+G 或点击章节标题打开)
+        chapters_button = ModernUI.create_rounded_button(
+            bottom_frame,
+            text="章节列表",
+            command=self.show_chapter_navigator,
+            width=110,
+            height=35,
+            corner_radius=17,
+            color_role="neutral",  # 指定角色
+            fg="white",
+            font=("微软雅黑", 10),
         )
-        rb_false.pack(side=tk.LEFT, padx=30, pady=5, expand=True)
-        rb_false.bind("<Button-1>", lambda e: self.answer_var.set("B"))
-
-        # --- 单选题选项 (A/B/C/D) ---
-        self.choice_frame = ttk.Frame(self.options_frame, style="Card.TFrame")
-        self.choice_frame.pack(fill=tk.X)  # 使用pack布局
-
-        for i, opt in enumerate(["A", "B", "C", "D"]):
-            # 每行一个选项，包含Radiobutton和Label
-            option_row = ttk.Frame(self.choice_frame, style="Card.TFrame")
-            option_row.pack(fill=tk.X, pady=1, padx=10)  # 垂直排列，左右留边距
-
-            rb = ttk.Radiobutton(
-                option_row,
-                text=f"{opt}.",  # 显示 "A." "B." 等
-                variable=self.answer_var,  # 绑定到单选变量
-                value=opt,  # 选中时的值
-                **style_args,
-            )
-            rb.grid(
-                row=0, column=0, sticky="w", padx=(15, 5), pady=5
-            )  # 左对齐，增加左内边距
-            # 绑定点击事件
-            rb.bind("<Button-1>", lambda e, v=opt: self.answer_var.set(v))
-
-            option_label = ttk.Label(
-                option_row,
-                text=f"选项 {opt}",  # 初始文本
-                wraplength=700,  # 自动换行宽度
-                **label_style_args,
-            )
-            option_label.grid(
-                row=0, column=1, sticky="w", pady=5
-            )  # 紧随Radiobutton之后，左对齐
-            # 点击标签也能选中对应的Radiobutton
-            option_label.bind("<Button-1>", lambda e, v=opt: self.answer_var.set(v))
-
-            self.choice_option_labels.append(
-                option_label
-            )  # 保存标签引用，以便后续更新文本
-            option_row.columnconfigure(1, weight=1)  # 让标签列可以扩展宽度
-
-        # --- 多选题选项 (A/B/C/D) ---
-        self.multi_frame = ttk.Frame(self.options_frame, style="Card.TFrame")
-        self.multi_frame.pack(fill=tk.X)  # 使用pack布局
-        self.answer_vars = []  # 重置多选题的变量列表
-
-        for i, opt in enumerate(["A", "B", "C", "D"]):
-            var = tk.BooleanVar(value=False)  # 每个选项一个布尔变量
-            self.answer_vars.append(var)
-
-            # 每行一个选项，包含Checkbutton和Label
-            option_row = ttk.Frame(self.multi_frame, style="Card.TFrame")
-            option_row.pack(fill=tk.X, pady=1, padx=10)
-
-            cb = ttk.Checkbutton(
-                option_row,
-                text=f"{opt}.",  # 显示 "A." "B." 等
-                variable=var,  # 绑定到对应的布尔变量
-                **check_style_args,
+        chapters_button.grid(row=0, column=1, padx=10)
+        self.rounded_buttons.append(chapters_button)  # 添加到列表
+
+    # --- 会话状态 (由当前标签页的 QuizEngine 维护) ---
+    @property
+    def question_bank(self):
+        """当前标签页的题库对象 (没有打开的题库时为 None)"""
+        return self.tab.question_bank if self.tab else None
+
+    @property
+    def engine(self):
+        """当前标签页的答题会话核心 (选题、判分、章节导航和统计)，界面只负责显示"""
+        return self.tab.engine if self.tab else None
+
+    @property
+    def current_chapter_index(self):
+        """当前章节索引"""
+        return self.engine.chapter_index if self.engine else 0
+
+    @property
+    def current_question(self):
+        """当前显示的问题数据"""
+        return self.engine.current_question if self.engine else None
+
+    @property
+    def stats(self):
+        """答题统计 { chapter_index: { 题型: {"answered": n, "correct": m} } }"""
+        return self.engine.stats if self.engine else {}
+
+    @property
+    def response_times(self):
+        """答题用时 (response_times.ResponseTimes)，没有题库时为 None"""
+        return self.engine.response_times if self.engine else None
+
+    def on_engine_event(self, event):
+        """接收会话事件，同步已打开的统计窗口"""
+        if event.kind == quiz_engine.GRADED:
+            # 统计窗口打开时只应用本次增量
+            if self.stats_window and self.stats_window.exists():
+                self.stats_window.apply_delta(
+                    event.chapter_index, event.data.is_correct
+                )
+        elif event.kind in (quiz_engine.STATS_RESET, quiz_engine.BANK_RELOADED):
+            self.refresh_stats_window()
+            if event.kind == quiz_engine.BANK_RELOADED:
+                self.refresh_bank_windows()
+
+    def watch_bank(self):
+        """开始监视当前标签页的题库文件 (后台标签页的监视已停止)"""
+        tab = self.tab
+        if tab.bank_watcher is None:
+            tab.bank_watcher = BankWatcher(
+                self.root, tab.question_bank, self.on_bank_reloaded
             )
-            cb.grid(
-                row=0, column=0, sticky="w", padx=(15, 5), pady=5
-            )  # 左对齐，增加左内边距
-
-            option_label = ttk.Label(
-                option_row,
-                text=f"选项 {opt}",  # 初始文本
-                wraplength=700,  # 自动换行宽度
-                **label_style_args,
+        tab.bank_watcher.start()
+
+    def on_bank_reloaded(self, bank, chapter_map, errors):
+        """题库文件修改后换入重新加载的题库，未修改章节的进度和统计保持不变"""
+        if errors:
+            messagebox.showwarning(
+                "题库重新加载",
+                "题库文件已修改，重新加载时出现错误：\n" + "\n".join(errors[:5]),
             )
-            option_label.grid(
-                row=0, column=1, sticky="w", pady=5
-            )  # 紧随Checkbutton之后，左对齐
-            # 点击标签也能切换对应的Checkbutton状态
-            option_label.bind(
-                "<Button-1>", lambda e, c=cb: c.invoke()
-            )  # invoke()模拟点击
-
-            self.multi_option_labels.append(option_label)  # 保存标签引用
-            option_row.columnconfigure(1, weight=1)  # 让标签列可以扩展宽度
-
-        # 初始状态下隐藏所有选项框架
-        self.judge_frame.pack_forget()
-        self.choice_frame.pack_forget()
-        self.multi_frame.pack_forget()
+        if bank is None:
+            return  # 重新加载失败，继续使用原题库
+        # 监视器换入新题库时对应的标签页 (等待动画期间可能已切换或关闭)
+        tab = next(
+            (t for t in self.tabs if t.bank_watcher and t.bank_watcher.bank is bank),
+            None,
+        )
+        if tab is None:
+            if bank.store is not None:
+                bank.store.close()  # 标签页已关闭，不再使用
+            return
+        # 淡入淡出过程中不切换题库，动画结束后再换入
+        if tab is self.tab and self.animation_running:
+            self.root.after(50, lambda: self.on_bank_reloaded(bank, chapter_map, []))
+            return
 
+        if tab is self.tab:
+            self.cancel_prefetch()
+        old_bank = tab.question_bank
+        # 未修改的章节沿用原题目列表，只有修改过的章节需要驻留
+        self.string_pool.adopt(bank, [other.question_bank for other in self.tabs])
+        tab.question_bank = bank
+        # 驻留表中去掉只有被替换的旧章节用到的字符串
+        self.root.after_idle(self.rebuild_string_pool)
+        current_valid = tab.engine.replace_bank(bank, chapter_map)
+        # 重新打开的 SQLite 题库使用新的连接，关闭旧连接及其页缓存
+        if old_bank.store is not None and old_bank.store is not bank.store:
+            old_bank.store.close()
+        self.metrics.incr("bank_reloads")
+        if tab is not self.tab:
+            self.update_tab_bar()
+            return
+        self.set_title(f"题库复习 - {tab.title}")
+        self.update_tab_bar()
+        if self.current_screen is None or self.current_screen is not self.screens.get(
+            "quiz"
+        ):
+            return
+        if current_valid:
+            # 当前题目所在章节未修改：题目保持不变，只刷新章节信息和进度
+            self.update_chapter_header(self.current_question)
+            self.update_progress()
+            self.schedule_prefetch()
+        else:
+            self.show_chapter_question()
+
+    @profiled("show_chapter_question")
     def show_chapter_question(self):
         """根据当前章节索引，选择并显示一个题目"""
-        if not self.question_bank or not self.question_bank.chapters:
+        if not self.engine or not self.question_bank.chapters:
             messagebox.showerror("错误", "题库未加载或为空！")
-            self.create_start_screen()
+            self.show_start_screen()
             return
 
+        # 抽题 (优先使用预取的题目，它已在后台卡片布局好)
+        started = self.metrics.start()
+        event = self.engine.draw()
+        self.metrics.stop("question_draw_ms", started)
+
         # 检查是否已完成所有章节
-        if self.current_chapter_index >= len(self.question_bank.chapters):
+        if event.kind == quiz_engine.BANK_DONE:
             # 使用自定义对话框提示
             dialog = CustomDialog(
                 self.root,
@@ -828,59 +1123,45 @@ class QuizApp:
                 no_text="返回主菜单",
             )
             if dialog.result:  # 如果用户选择“重新开始”
-                self.current_chapter_index = 0
-                self.shown_questions.clear()
-                self.type_counts = {"判断题": 0, "单选题": 0, "多选题": 0}
-                self.stats = {}  # 清空统计
+                self.engine.restart()  # 回到第一章并清空统计
                 self.show_chapter_question()  # 显示第一章第一题
             else:  # 用户选择“返回主菜单”
-                self.create_start_screen()
+                self.show_start_screen()
             return
 
-        # 获取当前章节的所有问题
-        current_chapter_questions = self.question_bank.chapters[
-            self.current_chapter_index
-        ]
         # 处理空章节的情况
-        if not current_chapter_questions:
-            messagebox.showinfo(
-                "提示", f"第 {self.current_chapter_index + 1} 章没有题目，跳至下一章。"
-            )
+        if event.kind == quiz_engine.CHAPTER_EMPTY:
+            if not self.rapid_mode:  # 速刷模式下直接跳过，不弹窗
+                messagebox.showinfo(
+                    "提示",
+                    f"第 {self.current_chapter_index + 1} 章没有题目，跳至下一章。",
+                )
             self.next_chapter()  # 自动跳到下一章
             return
 
-        # --- 问题选择逻辑 ---
-        # 找出本章尚未显示过的问题索引
-        available_indices = [
-            i
-            for i, q in enumerate(current_chapter_questions)
-            if (self.current_chapter_index, i) not in self.shown_questions
-        ]
-
         # 如果本章所有问题都已显示过
-        if not available_indices:
+        if event.kind == quiz_engine.CHAPTER_DONE:
             # --- 在显示对话框前，更新进度条到100% ---
-            total_questions_in_chapter = len(current_chapter_questions)
-            if total_questions_in_chapter > 0:
-                # 确保 answered_counts 反映的是已完成所有题目
-                # 注意：此时 answered_counts 应该是 total_questions_in_chapter
-                # 如果不是，可能需要检查 next_question 中的计数逻辑
-                answered_in_chapter = self.answered_counts.get(
-                    self.current_chapter_index, 0
-                )
-                # 强制设置为总数，以防万一计数有误
-                answered_in_chapter = total_questions_in_chapter
+            total_questions_in_chapter = len(
+                self.question_bank.chapters[self.current_chapter_index]
+            )
+            self.progress.configure(value=100)
+            self.progress_label.config(
+                text=f"已答: {total_questions_in_chapter} / 总数: {total_questions_in_chapter}"
+            )
+            self.root.update_idletasks()  # 强制更新UI显示进度条变化
 
-                self.progress.configure(value=100)
-                self.progress_label.config(
-                    text=f"已答: {answered_in_chapter} / 总数: {total_questions_in_chapter}"
-                )
-                self.root.update_idletasks()  # 强制更新UI显示进度条变化
-            # --- 更新结束 ---
+            is_last_chapter = self.engine.is_last_chapter()
+
+            # 速刷模式不弹对话框：自动进入下一章，全部完成后从头循环 (保留统计)
+            if self.rapid_mode:
+                if is_last_chapter:
+                    self.engine.restart(keep_stats=True)
+                    self.show_chapter_question()
+                else:
+                    self.next_chapter()
+                return
 
-            is_last_chapter = (
-                self.current_chapter_index >= len(self.question_bank.chapters) - 1
-            )
             dialog_title = "完成" if is_last_chapter else "章节完成"
             dialog_message = (
                 f"您已完成所有题目！\n是否重新开始答题？"
@@ -900,33 +1181,27 @@ class QuizApp:
             if dialog.result:  # 用户选择“下一章”或“重新开始”
                 if is_last_chapter:
                     # 重新开始答题
-                    self.current_chapter_index = 0
-                    self.shown_questions.clear()
-                    self.type_counts = {"判断题": 0, "单选题": 0, "多选题": 0}
-                    self.stats = {}  # 清空统计
+                    self.engine.restart()
                     self.show_chapter_question()
                 else:
                     # 进入下一章
                     self.next_chapter()
             else:  # 用户选择“返回主菜单”
-                self.create_start_screen()
+                self.show_start_screen()
             return
 
-        # --- 从可用问题中随机选择一个 ---
-        # 可以加入基于 type_counts 的加权随机逻辑，优先显示做得少的题型
-        # 目前使用简单随机选择
-        selected_index = random.choice(available_indices)
-        question_data = current_chapter_questions[selected_index]
-        self.current_question = question_data  # 存储当前问题数据
+        question_data = event.question
+        self.metrics.incr("questions_shown")
 
-        # 将选中的问题加入已显示集合
-        question_identifier = (self.current_chapter_index, selected_index)
-        self.shown_questions.add(question_identifier)  # 仅添加记录
+        # --- 更新UI元素 ---
+        self.update_chapter_header(question_data)
 
-        # 更新本章该题型的显示次数
-        self.type_counts[question_data["type"]] += 1
+        # --- 显示选中的问题 ---
+        # 不再强制 update_idletasks：按钮、标题和卡片交换在同一次重绘中完成
+        self.display_question(question_data)
 
-        # --- 更新UI元素 ---
+    def update_chapter_header(self, question_data):
+        """更新章节标题和章节切换按钮的状态"""
         # 更新章节标题标签
         chapter_title = question_data.get(
             "chapter",
@@ -938,226 +1213,233 @@ class QuizApp:
         prev_state = tk.NORMAL if self.current_chapter_index > 0 else tk.DISABLED
         self.prev_chapter_button.set_state(prev_state)
 
-        is_last_chapter = (
-            self.current_chapter_index >= len(self.question_bank.chapters) - 1
-        )
-        next_state = tk.DISABLED if is_last_chapter else tk.NORMAL
+        next_state = tk.DISABLED if self.engine.is_last_chapter() else tk.NORMAL
         self.next_chapter_button.set_state(next_state)
 
-        # 强制更新界面以确保按钮状态立即生效
-        self.root.update_idletasks()
-
-        # --- 显示选中的问题 ---
-        self.display_question(question_data)
-
-    def get_multi_answer(self):
-        """获取多选题用户选择的答案 (返回排序后的字母字符串, 如 "ACD")"""
-        answer = ""
-        for i, var in enumerate(self.answer_vars):
-            if var.get():  # 如果该选项被选中
-                answer += chr(65 + i)  # 将索引转换为大写字母 (0->A, 1->B, ...)
-        return "".join(sorted(answer))  # 返回排序后的答案字符串
+    def schedule_prefetch(self):
+        """在空闲时预取下一题 (用户阅读当前题目期间执行)"""
+        if self.prefetch_job is None:
+            self.prefetch_job = self.root.after_idle(self.prefetch_next)
+
+    def cancel_prefetch(self):
+        """取消尚未执行的预取任务"""
+        if self.prefetch_job is not None:
+            self.root.after_cancel(self.prefetch_job)
+            self.prefetch_job = None
+
+    def prefetch_next(self):
+        """预先选出下一题并布局到后台卡片"""
+        self.prefetch_job = None
+        # 动画进行中后台卡片可能正被使用，稍后再预取
+        if self.animation_running or not self.engine:
+            return
+        question = self.engine.prefetch()
+        if question is not None:
+            self.back_card.layout(question)
 
     def next_question(self):
         """处理“下一题”按钮点击：检查当前答案（如果已选），然后显示新题目"""
+        # 计时：点击“下一题”到新题完全显示
+        self.metrics.mark("next_to_visible_ms")
         if not self.current_question:
             # 一般不会发生，但作为安全检查
             self.show_chapter_question()
             return
 
-        # 检查用户是否已作答
-        answered = False
-        user_answer = ""
         q_type = self.current_question["type"]
 
-        if q_type in ["判断题", "单选题"]:
-            user_answer = self.answer_var.get()  # 获取单选变量的值
-            answered = bool(user_answer)  # 如果有值则认为已作答
-        elif q_type == "多选题":
-            user_answer = self.get_multi_answer()  # 获取多选答案
-            answered = bool(user_answer)  # 如果选择了至少一个选项则认为已作答
-
-        # 记录当前章节索引，因为 show_chapter_question 可能会改变它
-        completed_chapter_index = self.current_chapter_index
-
-        # 如果已作答，则检查答案并显示结果
-        if answered:
-            correct_answer = self.current_question.get("answer", "")  # 获取正确答案
-            # 多选题答案需要排序后比较
-            if q_type == "多选题":
-                correct_answer = "".join(sorted(correct_answer.upper()))
-            is_correct = user_answer == correct_answer
-
-            # 更新统计数据
-            self.update_stats(is_correct)
-
-            # 显示结果反馈 (使用自定义对话框)
-            result_title = "回答正确！" if is_correct else "回答错误！"
-            # 格式化答案显示
-            display_user_answer = user_answer
-            display_correct_answer = correct_answer
-            if q_type == "判断题":
-                display_user_answer = "对 (A)" if user_answer == "A" else "错 (B)"
-                display_correct_answer = "对 (A)" if correct_answer == "A" else "错 (B)"
-
-            result_message = (
-                f"你的答案: {display_user_answer}\n正确答案: {display_correct_answer}"
-            )
+        # 答题用时：从题目完全显示到提交 (淡入尚未结束时不计)
+        response_time = (
+            time.monotonic() - self.question_visible_at
+            if self.question_visible_at is not None
+            else None
+        )
+        self.question_visible_at = None
 
-            if is_correct:
-                # 正确时显示简单提示
-                dialog = CustomDialog(
-                    self.root,
-                    title=result_title,
-                    message="太棒了，回答正确！",
-                    yes_text="下一题",
-                    show_no=False,  # 只显示一个按钮
-                )
-            else:
-                # 错误时显示正确答案
-                dialog = CustomDialog(
-                    self.root,
-                    title=result_title,
-                    message=result_message,
-                    yes_text="下一题",
-                    show_no=False,  # 只显示一个按钮
-                )
+        # 从前台卡片读取作答并判分 (未作答则视为跳过，同样计入本章已答数)
+        grade = self.engine.answer(self.front_card.get_answer(), response_time)
+        if grade is None:
+            # 如果未作答，直接显示下一题 (允许跳过)
+            self.show_chapter_question()
+            return
 
-            # 对话框关闭后，准备加载下一题
-            # 在加载下一题之前，增加上一题所在章节的计数
-            self.answered_counts[completed_chapter_index] = (
-                self.answered_counts.get(completed_chapter_index, 0) + 1
-            )
+        user_answer = grade.user_answer
+        correct_answer = grade.correct_answer
+        is_correct = grade.is_correct
+
+        if self.engine.adaptive:
+            self.update_adaptive_button()  # 显示更新后的能力评分
+
+        if self.rapid_mode:
+            # 速刷模式：行内闪现结果，立即进入下一题
+            self.flash_feedback(is_correct, correct_answer)
+            self.record_rapid_answer()
             self.show_chapter_question()
+            return
+
+        # 显示结果反馈 (使用自定义对话框)
+        result_title = "回答正确！" if is_correct else "回答错误！"
+        # 格式化答案显示
+        display_user_answer = user_answer
+        display_correct_answer = correct_answer
+        if q_type == "判断题":
+            display_user_answer = "对 (A)" if user_answer == "A" else "错 (B)"
+            display_correct_answer = "对 (A)" if correct_answer == "A" else "错 (B)"
+
+        result_message = (
+            f"你的答案: {display_user_answer}\n正确答案: {display_correct_answer}"
+        )
 
+        if is_correct:
+            # 正确时显示简单提示
+            CustomDialog(
+                self.root,
+                title=result_title,
+                message="太棒了，回答正确！",
+                yes_text="下一题",
+                show_no=False,  # 只显示一个按钮
+            )
         else:
-            # 如果未作答，直接显示下一题 (允许跳过)
-            # 跳过题目也算完成，增加计数
-            self.answered_counts[completed_chapter_index] = (
-                self.answered_counts.get(completed_chapter_index, 0) + 1
+            # 错误时显示正确答案
+            CustomDialog(
+                self.root,
+                title=result_title,
+                message=result_message,
+                yes_text="下一题",
+                show_no=False,  # 只显示一个按钮
             )
-            self.show_chapter_question()
+
+        # 对话框关闭后，加载下一题 (重新开始计时，不计入用户阅读结果的时间)
+        self.metrics.mark("next_to_visible_ms")
+        self.show_chapter_question()
 
     def next_chapter(self):
         """切换到下一章"""
-        if self.current_chapter_index < len(self.question_bank.chapters) - 1:
-            self.current_chapter_index += 1
-            # 重置章节内状态
-            self.type_counts = {"判断题": 0, "单选题": 0, "多选题": 0}
-            # 重置新章节的已答计数 (优化点)
-            self.answered_counts[self.current_chapter_index] = 0
+        if self.engine.next_chapter():
             self.show_chapter_question()  # 显示新章节的第一题
 
     def prev_chapter(self):
-        """切换到上一章"""
-        if self.current_chapter_index > 0:
-            self.current_chapter_index -= 1
-            # 重置章节内状态
-            self.type_counts = {"判断题": 0, "单选题": 0, "多选题": 0}
-            # 重置新章节的已答计数
-            self.answered_counts[self.current_chapter_index] = 0
-            # 清除返回到的这一章的已显示题目记录，以便重新开始
-            self.shown_questions = {
-                (chap_idx, q_idx)
-                for chap_idx, q_idx in self.shown_questions
-                if chap_idx != self.current_chapter_index
-            }
+        """切换到上一章 (该章重新开始)"""
+        if self.engine.prev_chapter():
             self.show_chapter_question()  # 显示新章节的第一题
 
+    def go_to_chapter(self, chapter_index):
+        """跳转到任意章节 (从章节列表选择)，做过一部分的章节从上次的位置继续"""
+        if self.engine and self.engine.go_to_chapter(chapter_index):
+            self.show_chapter_question()
+
+    def show_chapter_navigator(self):
+        """打开章节列表 (已打开时提到最前)"""
+        if not self.engine or self.current_screen is not self.screens.get("quiz"):
+            return
+        if self.chapter_navigator and self.chapter_navigator.exists():
+            self.chapter_navigator.show()
+            return
+        from chapter_navigator import ChapterNavigator  # 首次打开时才导入
+
+        self.chapter_navigator = ChapterNavigator(self)
+
     def display_question(self, question):
-        """在UI上显示给定的问题数据 (包含淡入淡出动画)"""
+        """在UI上显示给定的问题数据 (双缓冲卡片，可选淡入淡出动画)"""
         # 保存当前问题以便动画对比或回退 (暂未使用回退)
         self.last_question = self.current_question
+        self.question_visible_at = None
+        self.cancel_prefetch()
 
         # 如果动画正在运行，先取消它，避免冲突
-        if self.animation_running and self.fade_animation:
-            self.root.after_cancel(self.fade_animation)
-            self.animation_running = False
-
-        # 执行淡出动画，完成后在回调中更新内容并淡入
-        self.fade_out_content(question)
+        self.stop_fade()
 
-    def fade_out_content(self, new_question, current_alpha=1.0):
-        """淡出当前问题内容 (递归调用)"""
-        self.animation_running = True
-        step = 0.1  # 每次透明度减少量
-        delay = 20  # 动画帧之间的延迟 (毫秒)
+        # 后台卡片尚未布局这道题时 (没有命中预取) 现在布局
+        if self.back_card.question is not question:
+            self.back_card.layout(question)
 
-        if current_alpha > step:
-            try:
-                new_alpha = current_alpha - step
-                # 计算基于透明度的颜色 (与背景色混合)
-                new_fg_color = self.get_alpha_color(
-                    ModernUI.get_theme_color("text"), new_alpha
-                )
-                new_option_color = self.get_alpha_color(
-                    ModernUI.get_theme_color("text"), new_alpha  # 选项也用基础文本色
-                )
-                bg_color = ModernUI.get_theme_color("card_bg")  # 卡片背景色
-
-                # 更新问题文本颜色
-                self.question_text.configure(fg=new_fg_color)
+        # 首题 (前台卡片还是空的) 直接显示，不做淡入淡出
+        if self.animations_enabled and self.front_card.question is not None:
+            # 执行淡出动画，完成后在回调中交换卡片并淡入
+            self.last_fade_frame = 0.0
+            self.fade_out_content(question)
+        else:
+            self.update_question_content(question)
+            self.on_question_visible()
 
-                # 更新选项标签颜色
-                for label in self.choice_option_labels + self.multi_option_labels:
-                    label.configure(foreground=new_option_color)
-                # 判断题的 Radiobutton 文本颜色 (需要通过样式修改，这里暂不处理)
+    def fade_out_content(self, new_question):
+        """开始淡出前台卡片内容，之后由共享时钟逐帧推进 (见 fade_step)"""
+        self.animation_running = True
+        self.fade_alpha = 1.0
+        self.fade_question = new_question
+        self.ticker.add(self.fade_step)
+
+    def stop_fade(self):
+        """停止尚未完成的淡入淡出动画"""
+        if self.animation_running:
+            self.ticker.remove(self.fade_step)
+            self.animation_running = False
 
-                # 计划下一次淡出步骤
-                self.fade_animation = self.root.after(
-                    delay, lambda: self.fade_out_content(new_question, new_alpha)
-                )
-            except Exception:
-                # 如果控件已销毁或发生其他错误，停止动画并直接更新
-                self.update_question_content(new_question)
-                self.animation_running = False
-        else:
-            # 淡出完成，更新内容并开始淡入
+    def fade_step(self, now):
+        """淡入淡出的一帧 (共享时钟回调，返回 False 时停止)
+
+        先淡出前台卡片；淡出完成后把后台卡片以透明状态换到前台，再淡入。
+        """
+        step = 0.1  # 每帧透明度的变化量
+        if self.metrics.enabled:
+            self.record_fade_frame(self.ticker.interval_ms)
+        text_color = ModernUI.get_theme_color("text")
+
+        if self.fade_question is not None:
+            new_question = self.fade_question
+            if self.fade_alpha > step:
+                try:
+                    # 计算基于透明度的颜色 (与背景色混合)
+                    self.fade_alpha -= step
+                    self.front_card.set_content_color(
+                        self.get_alpha_color(text_color, self.fade_alpha)
+                    )
+                    return True
+                except Exception:
+                    # 如果控件已销毁或发生其他错误，停止动画并直接更新
+                    self.fade_question = None
+                    self.update_question_content(new_question)
+                    self.animation_running = False
+                    self.schedule_prefetch()
+                    return False
+            # 淡出完成：后台卡片以透明状态换到前台，本帧开始淡入
+            self.fade_question = None
+            self.back_card.set_content_color(self.get_alpha_color(text_color, 0.0))
             self.update_question_content(new_question)
-            self.fade_in_content()
+            self.fade_alpha = 0.0
 
-    def fade_in_content(self, current_alpha=0.0):
-        """淡入新问题内容 (递归调用)"""
-        step = 0.1  # 每次透明度增加量
-        delay = 20  # 动画帧之间的延迟 (毫秒)
-
-        if current_alpha < 1.0:
+        if self.fade_alpha < 1.0:
             try:
-                new_alpha = min(current_alpha + step, 1.0)  # 确保不超过1.0
-                # 计算基于透明度的颜色
-                new_fg_color = self.get_alpha_color(
-                    ModernUI.get_theme_color("text"), new_alpha
-                )
-                new_option_color = self.get_alpha_color(
-                    ModernUI.get_theme_color("text"), new_alpha
-                )
-                bg_color = ModernUI.get_theme_color("card_bg")
-
-                # 更新问题文本颜色
-                self.question_text.configure(fg=new_fg_color)
-
-                # 更新选项标签颜色
-                for label in self.choice_option_labels + self.multi_option_labels:
-                    label.configure(foreground=new_option_color)
-                # 判断题的 Radiobutton 文本颜色 (需要通过样式修改，这里暂不处理)
-
-                # 计划下一次淡入步骤
-                self.fade_animation = self.root.after(
-                    delay, lambda: self.fade_in_content(new_alpha)
+                self.fade_alpha = min(self.fade_alpha + step, 1.0)  # 确保不超过1.0
+                self.front_card.set_content_color(
+                    self.get_alpha_color(text_color, self.fade_alpha)
                 )
+                return True
             except Exception:
                 # 如果控件已销毁或发生其他错误，停止动画并直接显示最终状态
-                self.question_text.configure(fg=ModernUI.get_theme_color("text"))
-                for label in self.choice_option_labels + self.multi_option_labels:
-                    label.configure(foreground=ModernUI.get_theme_color("text"))
+                self.front_card.reset_content_color()
                 self.animation_running = False
-        else:
-            # 淡入完成
-            self.animation_running = False
-            # 确保最终颜色正确
-            self.question_text.configure(fg=ModernUI.get_theme_color("text"))
-            for label in self.choice_option_labels + self.multi_option_labels:
-                label.configure(foreground=ModernUI.get_theme_color("text"))
+                return False
+
+        # 淡入完成，恢复样式颜色并开始预取下一题
+        self.animation_running = False
+        self.front_card.reset_content_color()
+        self.on_question_visible()
+        return False
+
+    def on_question_visible(self):
+        """题目已完全显示：开始计答题用时，并在空闲时预取下一题"""
+        self.metrics.measure("next_to_visible_ms")
+        self.question_visible_at = time.monotonic()
+        self.schedule_prefetch()
+
+    def record_fade_frame(self, delay):
+        """记录淡入淡出帧的实际间隔与计划间隔 delay 的偏差 (帧抖动)"""
+        now = time.perf_counter()
+        if self.last_fade_frame:
+            jitter = abs((now - self.last_fade_frame) * 1000 - delay)
+            self.metrics.observe("fade_frame_jitter_ms", jitter)
+        self.last_fade_frame = now
 
     def get_alpha_color(self, fg_color_hex, alpha):
         """计算前景在背景上的透明度混合颜色"""
@@ -1188,464 +1470,260 @@ class QuizApp:
             # 发生错误时返回原始前景色
             return fg_color_hex
 
+    @profiled("update_question_content")
     def update_question_content(self, new_question):
-        """更新UI以显示新问题的内容 (无动画，供动画函数调用)"""
-        q_type = new_question["type"]
-        q_text = new_question["question"]
-        options = new_question.get("options", [])  # 获取选项，可能为空
-
-        # --- 重置UI状态 ---
-        # 启用文本控件以便修改
-        self.question_text.config(state="normal")
-        self.question_text.delete(1.0, tk.END)  # 清空旧内容
-
-        # 重置答案变量
-        self.answer_var.set("")  # 清空单选/判断题变量
-        for var in self.answer_vars:  # 清空多选题变量
-            var.set(False)
-
-        # --- 根据题目类型配置UI ---
-        self.question_type_label.config(text=f"【{q_type}】")  # 更新题型标签
-        self.question_text.insert(tk.END, q_text)  # 插入新题干
-
-        # 隐藏所有选项框架
-        self.judge_frame.pack_forget()
-        self.choice_frame.pack_forget()
-        self.multi_frame.pack_forget()
-
-        # 根据题型显示对应的选项框架并更新内容
-        if q_type == "判断题":
-            self.judge_frame.pack(fill=tk.X, pady=5, padx=10)  # 显示判断题框架
-        elif q_type == "单选题":
-            self.choice_frame.pack(fill=tk.X, pady=5)  # 显示单选题框架
-            # 更新选项标签文本
-            for i, label in enumerate(self.choice_option_labels):
-                if i < len(options):
-                    label.config(text=options[i])
-                else:
-                    label.config(text="")  # 清空多余的标签 (虽然一般是4个)
-        elif q_type == "多选题":
-            self.multi_frame.pack(fill=tk.X, pady=5)  # 显示多选题框架
-            # 更新选项标签文本
-            for i, label in enumerate(self.multi_option_labels):
-                if i < len(options):
-                    label.config(text=options[i])
-                else:
-                    label.config(text="")  # 清空多余的标签
-
-        # 禁用文本控件，使其不可编辑
-        self.question_text.config(state="disabled")
-        # 将文本滚动到顶部
-        self.question_text.yview_moveto(0)
-
-        # 更新进度条
-        if self.current_chapter_index < len(self.question_bank.chapters):
-            current_chapter_questions = self.question_bank.chapters[
-                self.current_chapter_index
-            ]
-            total_questions_in_chapter = len(current_chapter_questions)
-            # 使用优化后的计数器获取本章已回答的问题数量 (优化点)
-            answered_in_chapter = self.answered_counts.get(
-                self.current_chapter_index, 0
-            )
+        """交换前后台卡片以显示新问题，并更新进度 (供动画函数调用)"""
+        if self.back_card.question is not new_question:
+            self.back_card.layout(new_question)
+        self.front_card, self.back_card = self.back_card, self.front_card
+        self.front_card.tkraise()
+        # 换到后台的卡片还保留着上一题及其作答和反馈；同一道题再次抽到时
+        # (章节重新开始、只有一题的章节、速刷循环) 必须重新布局，不能直接复用
+        self.back_card.question = None
+        self.update_progress()
+        # 主持中：把新题推送给现场参与者
+        if self.host_window and self.host_window.exists():
+            self.host_window.push_question(new_question)
+
+    def update_progress(self):
+        """根据本章已答题数更新进度条和进度标签"""
+        answered_in_chapter, total_questions_in_chapter = self.engine.progress()
+        if total_questions_in_chapter > 0:
+            progress_value = (answered_in_chapter * 100) / total_questions_in_chapter
+            self.progress.configure(value=progress_value)
+        else:
+            self.progress.configure(value=0)  # 空章节进度为0
+        # 更新进度标签文本
+        self.progress_label.config(
+            text=f"已答: {answered_in_chapter} / 总数: {total_questions_in_chapter}"
+        )
 
-            if total_questions_in_chapter > 0:
-                # 确保 answered_in_chapter 不超过 total_questions_in_chapter
-                # (理论上不会，但作为安全检查)
-                answered_in_chapter = min(
-                    answered_in_chapter, total_questions_in_chapter
-                )
-                progress_value = (
-                    answered_in_chapter * 100
-                ) / total_questions_in_chapter
-                self.progress.configure(value=progress_value)
-                # 更新进度标签文本
-                self.progress_label.config(
-                    text=f"已答: {answered_in_chapter} / 总数: {total_questions_in_chapter}"
-                )
-            else:
-                self.progress.configure(value=0)  # 空章节进度为0
-                # 更新进度标签文本
-                self.progress_label.config(text="已答: 0 / 总数: 0")
+    def toggle_rapid_mode(self):
+        """切换速刷模式 (键盘作答、行内反馈、无对话框和动画)"""
+        self.rapid_mode = not self.rapid_mode
+        self.animations_enabled = not self.rapid_mode
+        if self.rapid_mode:
+            self.rapid_button.set_text("常规")
+            self.rapid_answer_times.clear()
+            self.rapid_started = time.monotonic()
+            self.feedback_label.configure(text="")
+            self.rapid_bar.grid(row=1, column=0, sticky="ew", pady=(5, 0))
+            self.update_speed()
+            self.ticker.add(self.speed_tick)
+            self.root.focus_set()  # 确保按键事件送达主窗口
+        else:
+            self.rapid_button.set_text("速刷")
+            self.rapid_bar.grid_remove()
+            self.ticker.remove(self.speed_tick)
+
+    def toggle_adaptive_mode(self):
+        """切换自适应选题：按能力评分选择难度接近学习者水平的题目"""
+        adaptive = not self.config.get("adaptive", False)
+        self.config["adaptive"] = adaptive
+        self.save_config()
+        self.update_adaptive_button()
+        if self.engine:
+            # 已预取的题目按原方式选出，重新预取
+            self.cancel_prefetch()
+            self.engine.set_adaptive(adaptive)
+            self.schedule_prefetch()
+
+    def update_adaptive_button(self):
+        """自适应按钮文字：关闭时为“自适应”，开启时显示当前能力评分"""
+        if not self.config.get("adaptive", False):
+            self.adaptive_button.set_text("自适应")
+            return
+        ability = self.ratings.ability if self.ratings else ratings.DEFAULT_RATING
+        self.adaptive_button.set_text(f"能力 {ability:.0f}")
 
-    def show_stats(self):
-        """显示答题统计信息窗口"""
-        # 创建统计信息窗口 (Toplevel)
-        stats_window = tk.Toplevel(self.root)
-        stats_window.title("答题情况统计")
-        stats_window.geometry("700x550")  # 初始大小
-        # 使用主题背景色
-        stats_window.configure(bg=ModernUI.get_theme_color("bg"))
-        stats_window.minsize(600, 400)  # 最小尺寸
-
-        # --- 标题栏 ---
-        # 应用 Title.TFrame 样式
-        title_bar = ttk.Frame(stats_window, style="Title.TFrame", padding="0 5")
-        title_bar.pack(fill=tk.X)
-
-        # 应用 Title.TLabel 样式
-        ttk.Label(
-            title_bar,
-            text="答题统计情况",
-            style="Title.TLabel",
-            padding=8,
-        ).pack()
-
-        # --- 主框架 (包含滚动条和内容) ---
-        # 使用基础 TFrame 样式
-        main_scroll_frame = ttk.Frame(stats_window, style="TFrame")
-        main_scroll_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-
-        # 创建 Canvas 用于滚动
-        # Canvas 背景设为窗口背景色
-        canvas = tk.Canvas(
-            main_scroll_frame,
-            bg=ModernUI.get_theme_color("bg"),
-            bd=0,
-            highlightthickness=0,
-        )
-        # 创建垂直滚动条
-        scrollbar = ttk.Scrollbar(
-            main_scroll_frame,
-            orient="vertical",
-            command=canvas.yview,
-            style="Vertical.TScrollbar",  # 应用滚动条样式
-        )
-        # 创建真正的内容框架，放置在 Canvas 中
-        # 内容框架背景也设为窗口背景色
-        content_frame = ttk.Frame(canvas, style="TFrame", padding="15 15")
-
-        # 关联 Canvas 和滚动条
-        canvas.configure(yscrollcommand=scrollbar.set)
-        # 将内容框架放入 Canvas
-        canvas_window = canvas.create_window((0, 0), window=content_frame, anchor="nw")
-
-        # --- 滚动逻辑 ---
-        # 当内容框架大小改变时，更新 Canvas 的滚动区域
-        def on_frame_configure(event):
-            canvas.configure(scrollregion=canvas.bbox("all"))
-            # 确保内容框架宽度不超过 Canvas 宽度，避免水平滚动条
-            canvas.itemconfig(canvas_window, width=canvas.winfo_width())
-
-        # 当 Canvas 大小改变时，更新内容框架的宽度
-        def on_canvas_configure(event):
-            canvas.itemconfig(canvas_window, width=event.width)
-
-        content_frame.bind("<Configure>", on_frame_configure)
-        canvas.bind("<Configure>", on_canvas_configure)
-
-        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-
-        # 鼠标滚轮绑定 (跨平台)
-        def on_mousewheel(event):
-            delta = 0
-            if event.num == 4:
-                delta = -1  # Linux 上滚
-            elif event.num == 5:
-                delta = 1  # Linux 下滚
-            elif event.delta > 0:
-                delta = -1  # Windows/macOS 上滚
-            elif event.delta < 0:
-                delta = 1  # Windows/macOS 下滚
-            if delta != 0:
-                canvas.yview_scroll(delta, "units")
-
-        # 将滚轮事件绑定到 Canvas, 内容框架, 和窗口本身，确保滚动有效
-        for widget in (canvas, content_frame, stats_window):
-            widget.bind("<MouseWheel>", on_mousewheel)  # Windows/macOS
-            widget.bind("<Button-4>", on_mousewheel)  # Linux 上滚
-            widget.bind("<Button-5>", on_mousewheel)  # Linux 下滚
-
-        # --- 统计内容填充 ---
-        total_answered = 0
-        total_correct = 0
-        total_wrong = 0
-        total_time = datetime.now().strftime("%Y-%m-%d %H:%M")  # 当前时间
-
-        # 题库信息和统计时间
-        # 使用基础 TFrame 背景
-        ttk.Label(
-            content_frame,
-            text=f"题库: {self.question_bank.title if self.question_bank else 'N/A'}",
-            style="TLabel",  # 使用基础标签样式
-            font=("微软雅黑", 11, "bold"),  # 字体加粗
-        ).pack(anchor=tk.W, pady=(0, 5))
-        ttk.Label(
-            content_frame,
-            text=f"统计时间: {total_time}",
-            style="TLabel",  # 使用基础标签样式
-            font=("微软雅黑", 9),
-            foreground=ModernUI.get_theme_color("text_secondary"),  # 次要文本色
-        ).pack(anchor=tk.W, pady=(0, 15))
-
-        # --- 分章节统计 ---
-        num_chapters = len(self.question_bank.chapters) if self.question_bank else 0
-        if num_chapters == 0:
-            ttk.Label(
-                content_frame,
-                text="没有可统计的数据。",
-                style="TLabel",
-                font=("微软雅黑", 11),
-            ).pack(pady=20)
-
-        for chapter_index in range(num_chapters):
-            chapter_stats = self.stats.get(
-                chapter_index, {}
-            )  # 获取本章统计，默认为空字典
-            chapter_data = self.question_bank.chapters[chapter_index]
-            # 获取章节标题
-            chapter_title = (
-                chapter_data[0].get("chapter", f"第{chapter_index + 1}章")
-                if chapter_data  # 如果章节非空，从第一个问题获取标题
-                else f"第{chapter_index + 1}章"  # 空章节使用默认标题
+    def on_rapid_key(self, event):
+        """速刷模式按键：1-4 或 A-D 选择选项，回车提交"""
+        if not self.rapid_mode or self.current_screen is not self.screens.get("quiz"):
+            return
+        key = event.keysym
+        if key in ("Return", "KP_Enter"):
+            self.next_question()
+            return "break"
+        if key in ("1", "2", "3", "4"):
+            self.front_card.choose(chr(ord("A") + int(key) - 1))
+            return "break"
+        if len(key) == 1 and key.upper() in "ABCD":
+            self.front_card.choose(key.upper())
+            return "break"
+
+    def flash_feedback(self, is_correct, correct_answer):
+        """在卡片内短暂显示作答结果 (代替结果对话框)"""
+        if is_correct:
+            self.feedback_label.configure(text="✔ 正确", style="FeedbackCorrect.TLabel")
+        else:
+            self.feedback_label.configure(
+                text=f"✘ 错误，正确答案: {correct_answer}",
+                style="FeedbackWrong.TLabel",
             )
+        if self.feedback_job is not None:
+            self.root.after_cancel(self.feedback_job)
+        self.feedback_job = self.root.after(1500, self.clear_feedback)
+
+    def clear_feedback(self):
+        """清除行内反馈"""
+        self.feedback_job = None
+        self.feedback_label.configure(text="")
+
+    def record_rapid_answer(self):
+        """记录一次速刷作答并刷新速度显示"""
+        self.rapid_answer_times.append(time.monotonic())
+        self.update_speed()
+
+    def speed_tick(self, now):
+        """共享时钟回调：速刷模式下每秒刷新一次速度显示"""
+        if not self.rapid_mode:
+            return False
+        if now >= self.speed_due:
+            self.update_speed()
+        return True
+
+    def update_speed(self):
+        """刷新每分钟答题数 (按最近60秒的滑动窗口统计)"""
+        now = time.monotonic()
+        self.speed_due = now + 1.0
+        while self.rapid_answer_times and now - self.rapid_answer_times[0] > 60:
+            self.rapid_answer_times.popleft()
+        # 不足一分钟时按已用时间折算，避免开始阶段数值偏低
+        window = min(max(now - self.rapid_started, 1.0), 60.0)
+        per_minute = len(self.rapid_answer_times) * 60 / window
+        self.speed_label.configure(text=f"速度: {per_minute:.0f} 题/分钟")
+
+    @profiled("show_stats")
+    def show_stats(self):
+        """显示答题统计信息窗口 (非模态，已打开时提到最前)"""
+        if self.stats_window and self.stats_window.exists():
+            self.stats_window.show()
+            return
+        from stats_window import StatsWindow  # 首次打开时才导入
 
-            # --- 每章一个卡片面板 ---
-            # 应用 Card.TFrame 样式 (自带背景色和边框)
-            chapter_panel = ttk.Frame(
-                content_frame, style="Card.TFrame", padding="15 10"
-            )
-            chapter_panel.pack(fill=tk.X, pady=8)
-
-            # 章节标题标签
-            # 应用 StatsHeader 样式，背景色由 Card.TFrame 继承
-            ttk.Label(
-                chapter_panel,
-                text=chapter_title,
-                style="StatsHeader.TLabel",
-                # background 不再需要硬编码为 "white"
-            ).pack(anchor=tk.W, pady=(0, 10))
-
-            # --- 统计表格 (Grid布局) ---
-            # 表格框架也使用 Card.TFrame 样式继承背景色
-            stats_grid = ttk.Frame(
-                chapter_panel,
-                style="Card.TFrame",
-                padding=(3, 3, 3, 3),
-            )
-            stats_grid.pack(fill=tk.X)
-            # 配置列权重，使列宽分布合理
-            stats_grid.columnconfigure(0, weight=3, uniform="stats_col")  # 题型 (较宽)
-            stats_grid.columnconfigure(1, weight=1, uniform="stats_col")  # 已答
-            stats_grid.columnconfigure(2, weight=1, uniform="stats_col")  # 正确
-            stats_grid.columnconfigure(3, weight=1, uniform="stats_col")  # 错误
-            stats_grid.columnconfigure(
-                4, weight=2, uniform="stats_col"
-            )  # 正确率 (稍宽)
-
-            # 表头行
-            headers = ["题型", "已答", "正确", "错误", "正确率"]
-            for col, header in enumerate(headers):
-                hdr_label = ttk.Label(
-                    stats_grid,
-                    text=header,
-                    font=("微软雅黑", 9, "bold"),
-                    style="StatsHeader.TLabel",  # 使用表头样式
-                    # background 不再需要硬编码
-                    anchor=("w" if col == 0 else "center"),  # 题型左对齐，其他居中
-                    padding=(5 if col == 0 else 0, 2),  # 第一列左内边距
-                )
-                hdr_label.grid(row=0, column=col, sticky="ew", pady=(0, 5))
-
-            # 数据行
-            row_num = 1
-            has_data_in_chapter = False  # 标记本章是否有数据
-            for q_type in ["判断题", "单选题", "多选题"]:
-                type_stats = chapter_stats.get(q_type, {"answered": 0, "correct": 0})
-                answered = type_stats["answered"]
-                correct = type_stats["correct"]
-
-                if answered > 0:  # 只显示有答题记录的行
-                    has_data_in_chapter = True
-                    wrong = answered - correct
-                    rate = f"{correct / answered * 100:.1f}%"  # 计算正确率
-
-                    # 题型列 (左对齐)
-                    ttk.Label(
-                        stats_grid,
-                        text=q_type,
-                        style="StatsValue.TLabel",  # 使用数值样式
-                        # background 不再需要硬编码
-                        anchor="w",
-                        padding=(5, 1),
-                    ).grid(row=row_num, column=0, sticky="ew")
-
-                    # 已答列 (居中)
-                    ttk.Label(
-                        stats_grid,
-                        text=str(answered),
-                        style="StatsValue.TLabel",
-                        # background 不再需要硬编码
-                        anchor="center",
-                    ).grid(row=row_num, column=1, sticky="ew")
-                    # 正确列 (居中，使用正确颜色样式)
-                    ttk.Label(
-                        stats_grid,
-                        text=str(correct),
-                        style="StatsCorrect.TLabel",  # 应用正确数样式
-                        # background 不再需要硬编码
-                        anchor="center",
-                    ).grid(row=row_num, column=2, sticky="ew")
-                    # 错误列 (居中，使用错误颜色样式)
-                    ttk.Label(
-                        stats_grid,
-                        text=str(wrong),
-                        style="StatsWrong.TLabel",  # 应用错误数样式
-                        # background 不再需要硬编码
-                        anchor="center",
-                    ).grid(row=row_num, column=3, sticky="ew")
-                    # 正确率列 (居中，使用正确率颜色样式)
-                    ttk.Label(
-                        stats_grid,
-                        text=rate,
-                        style="StatsRate.TLabel",  # 应用正确率样式
-                        # background 不再需要硬编码
-                        anchor="center",
-                    ).grid(row=row_num, column=4, sticky="ew")
-                    row_num += 1
-
-                    # 累加总计 (仅当该行显示时)
-                    total_answered += answered
-                    total_correct += correct
-                    total_wrong += wrong
-
-            # 如果本章没有任何答题记录
-            if not has_data_in_chapter:
-                ttk.Label(
-                    stats_grid,
-                    text="本章无答题记录",
-                    font=("微软雅黑", 9),
-                    style="StatsValue.TLabel",  # 使用基础数值样式
-                    # background 不再需要硬编码
-                    foreground=ModernUI.get_theme_color("text_secondary"),  # 灰色提示
-                ).grid(
-                    row=1, column=0, columnspan=5, pady=5
-                )  # 跨越所有列
-
-        # --- 总结部分 ---
-        # 使用 Summary.TFrame 样式 (背景为窗口主背景)
-        summary_panel = ttk.Frame(
-            content_frame, style="Summary.TFrame", padding="15 15"
-        )
-        summary_panel.pack(fill=tk.X, pady=(15, 5))
+        self.stats_window = StatsWindow(self)
 
-        # 总结标题
-        # 使用 Summary.TLabel 样式继承背景和前景
-        ttk.Label(
-            summary_panel,
-            text="总计",
-            style="StatsHeader.TLabel",  # 仍然用表头样式，但背景会不同
-            font=("微软雅黑", 11, "bold"),  # 确保字体
-            background=ModernUI.get_theme_color("bg"),  # 明确指定背景为窗口背景
-        ).pack(anchor=tk.W, pady=(0, 10))
-
-        # 总结数据网格
-        # 使用 Summary.TFrame 样式继承背景
-        summary_grid = ttk.Frame(summary_panel, style="Summary.TFrame")
-        summary_grid.pack(fill=tk.X)
-        # 配置列权重
-        summary_grid.columnconfigure(0, weight=1, uniform="sum_col")
-        summary_grid.columnconfigure(1, weight=1, uniform="sum_col")
-        summary_grid.columnconfigure(2, weight=1, uniform="sum_col")
-        summary_grid.columnconfigure(3, weight=2, uniform="sum_col")  # 正确率稍宽
-
-        # 计算总正确率
-        total_rate = (
-            f"{total_correct / total_answered * 100:.1f}%"
-            if total_answered > 0
-            else "N/A"  # 避免除零错误
-        )
+    def show_host_window(self):
+        """开始现场答题主持 (已在主持时把主持窗口提到最前)"""
+        if self.host_window and self.host_window.exists():
+            self.host_window.show()
+            return
+        # 主持功能依赖 asyncio (导入较慢)，首次使用时才导入
+        from live_host import LiveHost
+        from host_window import HostWindow
 
-        # 显示总计数据
-        ttk.Label(
-            summary_grid, text=f"总答题: {total_answered}", style="Summary.TLabel"
-        ).grid(row=0, column=0, sticky="w", padx=2)
-        ttk.Label(
-            summary_grid,
-            text=f"总正确: {total_correct}",
-            style="SummaryCorrect.TLabel",  # 使用总结栏的正确样式
-            # background 由样式处理
-        ).grid(row=0, column=1, sticky="w", padx=2)
-        ttk.Label(
-            summary_grid,
-            text=f"总错误: {total_wrong}",
-            style="SummaryWrong.TLabel",  # 使用总结栏的错误样式
-            # background 由样式处理
-        ).grid(row=0, column=2, sticky="w", padx=2)
-        ttk.Label(
-            summary_grid,
-            text=f"总正确率: {total_rate}",
-            style="SummaryRate.TLabel",  # 使用总结栏的正确率样式
-            # background 由样式处理
-        ).grid(row=0, column=3, sticky="w", padx=2)
-
-        # --- 底部关闭按钮 ---
-        # 使用基础 TFrame 样式
-        button_frame = ttk.Frame(stats_window, style="TFrame", padding="0 10 10 10")
-        button_frame.pack(fill=tk.X)
-        button_frame.columnconfigure(0, weight=1)  # 居中按钮
-
-        ok_button = ModernUI.create_rounded_button(
-            button_frame,
-            text="关闭",
-            command=stats_window.destroy,  # 点击关闭窗口
-            width=100,
-            height=35,
-            corner_radius=17,
-            # bg=ModernUI.get_theme_color("neutral"), # 由 color_role 决定
-            # hover_bg=ModernUI.get_theme_color("neutral_dark"),
-            color_role="neutral",  # 指定角色
-            fg="white",
-        )
-        ok_button.grid(row=0, column=0, pady=5)
-        # 注意：统计窗口是临时的，其按钮不需要添加到主窗口的 self.rounded_buttons 列表
-
-        # --- 窗口最终设置 ---
-        stats_window.update_idletasks()  # 确保所有控件尺寸已计算
-
-        # 将窗口居中于父窗口
-        parent = self.root
-        win_width = stats_window.winfo_width()
-        win_height = stats_window.winfo_height()
-        parent_x = parent.winfo_rootx()
-        parent_y = parent.winfo_rooty()
-        parent_width = parent.winfo_width()
-        parent_height = parent.winfo_height()
-        x = parent_x + (parent_width - win_width) // 2
-        y = parent_y + (parent_height - win_height) // 2
-        y = max(y, 0)  # 防止窗口顶部超出屏幕
-        stats_window.geometry(f"+{x}+{y}")
-
-        # 设置为模态窗口
-        stats_window.transient(self.root)  # 依附于主窗口
-        stats_window.grab_set()  # 捕获事件
-        stats_window.focus_set()  # 设置焦点
-        # 绑定 Escape 键关闭窗口
-        stats_window.bind("<Escape>", lambda e: stats_window.destroy())
-        # 等待窗口关闭 (如果需要阻塞主程序)
-        # stats_window.wait_window() # 一般不需要，除非后续代码依赖统计结果
-
-    def update_stats(self, is_correct):
-        """更新内部存储的答题统计数据"""
-        if not self.current_question:
-            return  # 防御性编程
+        host = LiveHost()
+        if not host.start():
+            messagebox.showerror("错误", f"无法启动主持服务器：{host.error}")
+            return
+        self.host_window = HostWindow(self, host)
+        if self.current_question:
+            self.host_window.push_question(self.current_question)
+
+    def show_bank_browser(self):
+        """打开题库浏览窗口 (已打开时提到最前)"""
+        if self.bank_browser and self.bank_browser.exists():
+            self.bank_browser.show()
+            return
+        from bank_browser import BankBrowser  # 首次打开时才导入
 
-        chapter_idx = self.current_chapter_index
-        q_type = self.current_question["type"]
+        self.bank_browser = BankBrowser(self)
 
-        # 确保章节字典存在
-        if chapter_idx not in self.stats:
-            self.stats[chapter_idx] = {}
+    def show_exam_window(self):
+        """打开模拟考试窗口 (已打开时提到最前)"""
+        if self.exam_window and self.exam_window.exists():
+            self.exam_window.show()
+            return
+        from exam_window import ExamWindow  # 首次打开时才导入
 
-        # 确保题型字典存在
-        if q_type not in self.stats[chapter_idx]:
-            self.stats[chapter_idx][q_type] = {"answered": 0, "correct": 0}
+        self.exam_window = ExamWindow(self)
 
-        # 更新计数
-        self.stats[chapter_idx][q_type]["answered"] += 1
-        if is_correct:
-            self.stats[chapter_idx][q_type]["correct"] += 1
+    def save_session(self, now=False):
+        """保存各标签页的答题进度 (状态未变化时跳过)；now 为真时在当前线程写出"""
+        self.save_ratings(now)
+        for tab in self.tabs:
+            self.save_tab(tab, now)
+
+    def save_tab(self, tab, now=False):
+        """保存一个标签页的答题进度 (状态未变化时跳过)"""
+        engine = tab.engine
+        if engine.revision == tab.saved_revision:
+            return
+        snapshot = engine.snapshot()
+        if now:
+            self.session_saver.save_now(tab.file_path, snapshot)
+        else:
+            self.session_saver.submit(tab.file_path, snapshot)
+        tab.saved_revision = engine.revision
+
+    def save_ratings(self, now=False):
+        """保存难度评分 (未变化时跳过)"""
+        rating_data = self.ratings
+        if rating_data is None or rating_data.revision == rating_data.saved_revision:
+            return
+        data = rating_data.serialize()
+        if now:
+            self.session_saver.save_file_now(rating_data.path, data)
+        else:
+            self.session_saver.submit_file(rating_data.path, data)
+        rating_data.saved_revision = rating_data.revision
+
+    def schedule_autosave(self):
+        if self.autosave_job is None:
+            self.autosave_job = self.root.after(
+                session_store.AUTOSAVE_MS, self.autosave
+            )
+
+    def autosave(self):
+        """定时保存答题进度"""
+        self.autosave_job = None
+        self.save_session()
+        self.schedule_autosave()
+
+    def on_closing(self):
+        """关闭窗口：保存答题进度后退出"""
+        if self.parse_job:
+            self.parse_job.cancel()
+        for tab in self.tabs:
+            if tab.bank_watcher:
+                tab.bank_watcher.stop()
+        self.ticker.stop()
+        self.save_session(now=True)
+        self.session_saver.close()
+        self.root.destroy()
+
+    def toggle_debug_overlay(self):
+        """显示/隐藏调试浮层 (首次显示时开启指标记录)"""
+        if self.debug_overlay is None:
+            from debug_overlay import DebugOverlay
+
+            self.debug_overlay = DebugOverlay(self.root, self.metrics)
+        self.debug_overlay.toggle()
+
+    def set_title(self, text):
+        """设置窗口标题 (剖析期间保留“剖析中”标记)"""
+        if profiling.profiler.active:
+            text += profiling.TITLE_SUFFIX
+        self.root.title(text)
+
+    def on_profiling_stopped(self, path):
+        """剖析停止后告知报告位置"""
+        if path:
+            messagebox.showinfo("性能剖析", f"剖析报告已保存到:\n{path}")
+        else:
+            messagebox.showinfo("性能剖析", "剖析期间没有记录到数据")
+
+    def refresh_stats_window(self):
+        """统计数据整体变化 (新题库、重新开始) 时重新加载已打开的统计窗口"""
+        if self.stats_window and self.stats_window.exists():
+            self.stats_window.reload()
+
+    def refresh_bank_windows(self):
+        """题库切换或重新加载后刷新已打开的浏览窗口和章节列表"""
+        if self.bank_browser and self.bank_browser.exists():
+            self.bank_browser.reload()
+        if self.chapter_navigator and self.chapter_navigator.exists():
+            self.chapter_navigator.reload()
 
     def update_theme_button_icon(self):
         """更新主题切换按钮的图标"""
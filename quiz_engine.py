@@ -0,0 +1,526 @@
+import random
+from collections import namedtuple
+
+from response_times import ResponseTimes
+
+QUESTION_TYPES = ("判断题", "单选题", "多选题")
+OPTION_LETTERS = "ABCD"
+JUDGE_ANSWERS = {"A": "对", "B": "错"}  # 判断题答案的显示文字
+
+# draw() 返回的事件类型
+QUESTION = "question"  # 抽到一道题目
+CHAPTER_EMPTY = "chapter_empty"  # 当前章节没有题目
+CHAPTER_DONE = "chapter_done"  # 当前章节所有题目都已显示
+BANK_DONE = "bank_done"  # 章节索引超出范围 (所有章节已完成)
+
+# 通知订阅者的附加事件类型
+GRADED = "graded"  # 一道题已判分 (data 为 Grade)
+STATS_RESET = "stats_reset"  # 统计数据被清空
+CHAPTER_CHANGED = "chapter_changed"  # 切换了章节
+BANK_RELOADED = "bank_reloaded"  # 换入了重新加载的题库
+
+Event = namedtuple("Event", "kind chapter_index question data")
+Event.__new__.__defaults__ = (None, None)
+
+Grade = namedtuple(
+    "Grade", "chapter_index question user_answer correct_answer is_correct"
+)
+
+SNAPSHOT_VERSION = 1  # snapshot() 数据格式版本
+
+
+def new_type_counts():
+    """返回每种题型计数为0的字典"""
+    return {"判断题": 0, "单选题": 0, "多选题": 0}
+
+
+def normalize_answer(question):
+    """返回题目的标准答案 (多选题按字母排序)"""
+    answer = question.get("answer") or ""
+    if question["type"] == "多选题":
+        return "".join(sorted(answer.upper()))
+    return answer
+
+
+def option_text(question, letter):
+    """带字母标号的选项文字 (如 "B. 选项内容")"""
+    return f"{letter}. {question['options'][OPTION_LETTERS.index(letter)]}"
+
+
+def answer_text(q_type, answer):
+    """答案的显示文字：判断题显示为 对/错，选择题为选项字母"""
+    if q_type == "判断题":
+        return JUDGE_ANSWERS.get(answer, answer)
+    return answer
+
+
+class ChapterState:
+    """单个章节的抽题状态：尚未显示的题目索引 (支持O(1)随机抽取和移除)"""
+
+    __slots__ = ("size", "remaining", "position", "shown")
+
+    def __init__(self, size):
+        self.size = size
+        self.remaining = list(range(size))  # 尚未显示的题目索引
+        # 题目索引在 remaining 中的位置，-1 表示已显示
+        self.position = list(range(size))
+        # 已显示题目的位集 (第 i 位对应题目 i)，用于保存进度
+        self.shown = bytearray((size + 7) // 8)
+
+    @classmethod
+    def from_shown(cls, size, shown):
+        """根据已显示题目的位集重建抽题状态"""
+        state = cls.__new__(cls)
+        state.size = size
+        state.shown = bytearray(shown)
+        state.remaining = remaining = []
+        state.position = position = [-1] * size
+        for index in range(size):
+            if not shown[index >> 3] & (1 << (index & 7)):
+                position[index] = len(remaining)
+                remaining.append(index)
+        return state
+
+    def is_available(self, index):
+        """题目是否尚未显示"""
+        return 0 <= index < self.size and self.position[index] >= 0
+
+    def pick(self, rng):
+        """随机选择一个尚未显示的题目 (不移除)"""
+        return self.remaining[rng.randrange(len(self.remaining))]
+
+    def take(self, index):
+        """把题目标记为已显示 (与末尾元素交换后弹出)"""
+        slot = self.position[index]
+        last = self.remaining.pop()
+        if last != index:
+            self.remaining[slot] = last
+            self.position[last] = slot
+        self.position[index] = -1
+        self.shown[index >> 3] |= 1 << (index & 7)
+
+    def untake(self, index):
+        """把已显示的题目放回尚未显示的题目中"""
+        if self.position[index] >= 0:
+            return
+        self.position[index] = len(self.remaining)
+        self.remaining.append(index)
+        self.shown[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+
+    @property
+    def shown_count(self):
+        """已显示的题目数"""
+        return self.size - len(self.remaining)
+
+
+class QuizEngine:
+    """答题会话核心 (不依赖Tk)：选题、判分、章节导航和统计
+
+    界面通过命令方法驱动 (draw / answer / skip / next_chapter / prev_chapter /
+    restart)，并可通过 subscribe 接收事件通知。
+    """
+
+    def __init__(self, question_bank, rng=None, ratings=None):
+        self.bank = question_bank
+        self.rng = rng or random.Random()
+        self.ratings = ratings  # 难度评分 (ratings.Ratings)，判分后更新
+        self.adaptive = False  # 是否按学习者能力选择难度接近的题目
+        self.listeners = []
+        self.revision = 0  # 会话状态每次变化时加1 (用于判断是否需要保存)
+        self.reset()
+
+    def reset(self):
+        """重置会话状态 (回到第一章，清空统计)"""
+        self.chapter_index = 0
+        self.current_question = None  # 当前显示的问题数据
+        self.current_ref = None  # 当前问题位置 (chapter_index, question_index)
+        self.pending = None  # 预取的下一题位置 (chapter_index, question_index)
+        self.awaiting_answer = False  # 当前题目是否尚未作答
+        # 已进入过的章节的抽题状态 {chapter_index: ChapterState}
+        self.chapter_states = {}
+        # 自适应选题用的评分分桶索引 {chapter_index: RatingIndex}
+        self.rating_indexes = {}
+        # 从快照恢复、尚未进入的章节的已显示位集 {chapter_index: bytes}
+        self.saved_shown = {}
+        self.answered_counts = {}  # 每章已答题目数 {chapter_index: count}
+        if self.bank and self.bank.chapters:
+            self.answered_counts[0] = 0
+        self.type_counts = new_type_counts()  # 本章每种题型的显示次数
+        # 结构: { chapter_index: { "判断题": {"answered": n, "correct": m}, ... }, ... }
+        self.stats = {}
+        # 各章各题型的答题用时分位数草图
+        self.response_times = ResponseTimes()
+        self.revision += 1
+
+    # --- 事件 ---
+    def subscribe(self, listener):
+        """订阅事件，listener(event) 在事件发生时调用"""
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        """取消订阅"""
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def emit(self, event):
+        for listener in self.listeners:
+            listener(event)
+
+    # --- 查询 ---
+    @property
+    def chapter_count(self):
+        """章节数"""
+        return len(self.bank.chapters) if self.bank else 0
+
+    def chapter_title(self, chapter_index):
+        """返回章节标题 (空章节使用默认标题)"""
+        questions = self.bank.chapters[chapter_index]
+        default_title = f"第{chapter_index + 1}章"
+        # 按需读取的章节 (question_store.ChapterView) 自带标题，不必读取题目
+        title = getattr(questions, "title", None)
+        if title:
+            return title
+        return (
+            questions[0].get("chapter", default_title) if questions else default_title
+        )
+
+    def is_last_chapter(self):
+        """当前是否为最后一章"""
+        return self.chapter_index >= self.chapter_count - 1
+
+    def chapter_state(self, chapter_index):
+        """返回章节抽题状态 (首次进入章节时创建)"""
+        state = self.chapter_states.get(chapter_index)
+        if state is None:
+            size = len(self.bank.chapters[chapter_index])
+            shown = self.saved_shown.pop(chapter_index, None)
+            if shown is None:
+                state = ChapterState(size)
+            else:
+                state = ChapterState.from_shown(size, shown)
+            self.chapter_states[chapter_index] = state
+        return state
+
+    def pick(self, chapter_index, state):
+        """选择本章尚未显示的一道题 (自适应模式下选择难度接近学习者水平的题目)"""
+        if self.adaptive and self.ratings is not None:
+            index = self.rating_indexes.get(chapter_index)
+            if index is None:
+                # ratings 依赖 question_bank，在此处导入使本模块保持独立
+                from ratings import RatingIndex
+
+                index = self.rating_indexes[chapter_index] = RatingIndex(
+                    self.ratings, self.bank.chapters[chapter_index], state
+                )
+            picked = index.pick(state, self.ratings.target(), self.rng)
+            if picked is not None:
+                return picked
+        return state.pick(self.rng)
+
+    def chapter_progress(self, chapter_index):
+        """返回章节的 (已显示题数, 题目总数)，不为尚未进入的章节创建抽题状态"""
+        total = len(self.bank.chapters[chapter_index])
+        state = self.chapter_states.get(chapter_index)
+        if state is not None:
+            return state.shown_count, total
+        bits = self.saved_shown.get(chapter_index)
+        shown = int.from_bytes(bits, "little").bit_count() if bits else 0
+        return shown, total
+
+    def progress(self):
+        """返回当前章节的 (已答题数, 题目总数)"""
+        if self.chapter_index >= self.chapter_count:
+            return 0, 0
+        total = len(self.bank.chapters[self.chapter_index])
+        answered = min(self.answered_counts.get(self.chapter_index, 0), total)
+        return answered, total
+
+    # --- 命令 ---
+    def draw(self):
+        """抽取当前章节的下一题，返回 Event"""
+        chapter_index = self.chapter_index
+        if chapter_index >= self.chapter_count:
+            return Event(BANK_DONE, chapter_index)
+        questions = self.bank.chapters[chapter_index]
+        if not questions:
+            return Event(CHAPTER_EMPTY, chapter_index)
+
+        state = self.chapter_state(chapter_index)
+        # 优先使用仍然有效的预取题目
+        pending, self.pending = self.pending, None
+        if (
+            pending is not None
+            and pending[0] == chapter_index
+            and state.is_available(pending[1])
+        ):
+            index = pending[1]
+        elif state.remaining:
+            index = self.pick(chapter_index, state)
+        else:
+            return Event(CHAPTER_DONE, chapter_index)
+
+        state.take(index)
+        question = questions[index]
+        self.current_question = question
+        self.current_ref = (chapter_index, index)
+        self.awaiting_answer = True
+        self.revision += 1
+        self.type_counts[question["type"]] += 1
+        event = Event(QUESTION, chapter_index, question, index)
+        if self.listeners:
+            self.emit(event)
+        return event
+
+    def prefetch(self):
+        """预先选定下一题 (不标记为已显示)，返回该题数据；本章已无题目时返回 None"""
+        chapter_index = self.chapter_index
+        if chapter_index >= self.chapter_count:
+            return None
+        state = self.chapter_state(chapter_index)
+        if not state.remaining:
+            self.pending = None
+            return None
+        index = self.pick(chapter_index, state)
+        self.pending = (chapter_index, index)
+        return self.bank.chapters[chapter_index][index]
+
+    def answer(self, user_answer, response_time=None):
+        """提交当前题目的作答并判分，返回 Grade；空作答视为跳过并返回 None
+
+        response_time 为从题目完全显示到提交的秒数 (不计时时为 None)。
+        """
+        question = self.current_question
+        if question is None:
+            return None
+        if not user_answer:
+            self.skip()
+            return None
+
+        self.awaiting_answer = False
+        self.revision += 1
+        chapter_index = self.current_ref[0]
+        correct_answer = normalize_answer(question)
+        is_correct = user_answer == correct_answer
+
+        # 更新统计数据
+        chapter_stats = self.stats.get(chapter_index)
+        if chapter_stats is None:
+            chapter_stats = self.stats[chapter_index] = {}
+        type_stats = chapter_stats.get(question["type"])
+        if type_stats is None:
+            type_stats = chapter_stats[question["type"]] = {
+                "answered": 0,
+                "correct": 0,
+            }
+        type_stats["answered"] += 1
+        if is_correct:
+            type_stats["correct"] += 1
+        if self.ratings is not None:
+            self.ratings.update(question, is_correct)
+        if response_time is not None:
+            self.response_times.add(chapter_index, question["type"], response_time)
+        self.answered_counts[chapter_index] = (
+            self.answered_counts.get(chapter_index, 0) + 1
+        )
+
+        grade = Grade(chapter_index, question, user_answer, correct_answer, is_correct)
+        if self.listeners:
+            self.emit(Event(GRADED, chapter_index, question, grade))
+        return grade
+
+    def skip(self):
+        """跳过当前题目 (跳过也计入本章已答数)"""
+        if self.current_ref is not None:
+            self.awaiting_answer = False
+            self.revision += 1
+            chapter_index = self.current_ref[0]
+            self.answered_counts[chapter_index] = (
+                self.answered_counts.get(chapter_index, 0) + 1
+            )
+
+    def next_chapter(self):
+        """切换到下一章，返回是否切换成功"""
+        if self.chapter_index >= self.chapter_count - 1:
+            return False
+        self.chapter_index += 1
+        self.revision += 1
+        # 重置章节内状态
+        self.type_counts = new_type_counts()
+        self.answered_counts[self.chapter_index] = 0
+        self.emit(Event(CHAPTER_CHANGED, self.chapter_index))
+        return True
+
+    def prev_chapter(self):
+        """切换到上一章 (该章重新开始)，返回是否切换成功"""
+        if self.chapter_index <= 0:
+            return False
+        self.chapter_index -= 1
+        self.revision += 1
+        # 重置章节内状态，并清除该章的已显示记录以便重新开始
+        self.type_counts = new_type_counts()
+        self.answered_counts[self.chapter_index] = 0
+        self.chapter_states.pop(self.chapter_index, None)
+        self.rating_indexes.pop(self.chapter_index, None)
+        self.saved_shown.pop(self.chapter_index, None)
+        self.emit(Event(CHAPTER_CHANGED, self.chapter_index))
+        return True
+
+    def go_to_chapter(self, chapter_index, restart=False):
+        """直接切换到任意章节，返回是否切换成功
+
+        各章的抽题状态分别保存在 chapter_states 中，切换只改变当前章节索引，
+        耗时与章节数和题目数无关；回到做过一部分的章节时从上次的位置继续。
+        restart 为真或该章题目已全部显示时，该章重新开始。
+        """
+        if not 0 <= chapter_index < self.chapter_count:
+            return False
+        shown, total = self.chapter_progress(chapter_index)
+        if total and shown >= total:
+            restart = True
+        self.chapter_index = chapter_index
+        self.pending = None
+        self.revision += 1
+        self.type_counts = new_type_counts()
+        if restart:
+            self.answered_counts[chapter_index] = 0
+            self.chapter_states.pop(chapter_index, None)
+            self.rating_indexes.pop(chapter_index, None)
+            self.saved_shown.pop(chapter_index, None)
+        else:
+            self.answered_counts.setdefault(chapter_index, 0)
+        self.emit(Event(CHAPTER_CHANGED, chapter_index))
+        return True
+
+    def set_adaptive(self, enabled):
+        """切换自适应选题 (已预取的题目作废，下一题按新的方式选择)"""
+        self.adaptive = bool(enabled)
+        self.pending = None
+
+    def restart(self, keep_stats=False):
+        """从第一章重新开始 (默认同时清空统计)"""
+        stats, response_times = self.stats, self.response_times
+        self.reset()
+        if keep_stats:
+            self.stats = stats
+            self.response_times = response_times
+        else:
+            self.emit(Event(STATS_RESET, 0))
+        self.emit(Event(CHAPTER_CHANGED, 0))
+
+    def replace_bank(self, bank, chapter_map):
+        """换入重新加载的题库，返回当前题目是否仍然有效
+
+        chapter_map 为 {旧章节索引: 新章节索引}，只包含内容未变化的章节，
+        这些章节保留抽题状态、已答数和统计；其余章节从头开始。
+        """
+
+        def remap(by_chapter):
+            return {
+                chapter_map[index]: value
+                for index, value in by_chapter.items()
+                if index in chapter_map
+            }
+
+        self.bank = bank
+        self.pending = None
+        self.chapter_states = remap(self.chapter_states)
+        self.rating_indexes = remap(self.rating_indexes)
+        self.saved_shown = remap(self.saved_shown)
+        self.answered_counts = remap(self.answered_counts)
+        self.stats = remap(self.stats)
+        self.response_times.remap(chapter_map)
+
+        old_index = self.chapter_index
+        if old_index in chapter_map:
+            self.chapter_index = chapter_map[old_index]
+        else:
+            # 当前章节已修改或删除：停留在同一位置的章节，从头开始
+            self.chapter_index = min(old_index, max(self.chapter_count - 1, 0))
+            self.type_counts = new_type_counts()
+            self.answered_counts.setdefault(self.chapter_index, 0)
+
+        ref = self.current_ref
+        current_valid = ref is not None and ref[0] in chapter_map
+        if current_valid:
+            self.current_ref = (chapter_map[ref[0]], ref[1])
+            self.current_question = bank.chapters[self.current_ref[0]][ref[1]]
+        else:
+            self.current_ref = None
+            self.current_question = None
+            self.awaiting_answer = False
+        self.revision += 1
+        self.emit(Event(BANK_RELOADED, self.chapter_index))
+        return current_valid
+
+    # --- 进度快照 ---
+    def chapter_sizes(self):
+        """各章题目数 (用于确认快照与题库匹配)"""
+        return [len(questions) for questions in self.bank.chapters]
+
+    def snapshot(self):
+        """返回会话状态的紧凑表示 (每章已显示题目为位集)
+
+        返回值引用会话内部的数据，应立即序列化 (如 marshal.dumps)。
+        """
+        shown = dict(self.saved_shown)
+        for chapter_index, state in self.chapter_states.items():
+            shown[chapter_index] = state.shown
+        return {
+            "version": SNAPSHOT_VERSION,
+            "sizes": self.chapter_sizes(),
+            "chapter_index": self.chapter_index,
+            # 尚未作答的当前题目在恢复后重新显示
+            "current": self.current_ref if self.awaiting_answer else None,
+            "answered_counts": self.answered_counts,
+            "type_counts": self.type_counts,
+            "stats": self.stats,
+            "times": self.response_times.to_data(),
+            "shown": shown,
+        }
+
+    def restore(self, snapshot):
+        """从 snapshot() 的数据恢复会话，返回是否成功 (与题库不匹配时保持初始状态)
+
+        章节的抽题状态在首次进入该章时才根据位集重建，恢复耗时与章节数无关。
+        """
+        try:
+            sizes = self.chapter_sizes()
+            if (
+                snapshot.get("version") != SNAPSHOT_VERSION
+                or list(snapshot["sizes"]) != sizes
+            ):
+                return False
+            chapter_index = snapshot["chapter_index"]
+            shown = {
+                int(index): bytes(bits) for index, bits in snapshot["shown"].items()
+            }
+            if not 0 <= chapter_index < max(len(sizes), 1) or any(
+                not 0 <= index < len(sizes) or len(bits) != (sizes[index] + 7) // 8
+                for index, bits in shown.items()
+            ):
+                return False
+            current = snapshot.get("current")
+            # 较早保存的进度没有答题用时
+            response_times = ResponseTimes.from_data(snapshot.get("times") or {})
+        except (AttributeError, KeyError, TypeError, ValueError):
+            return False
+
+        self.reset()
+        self.chapter_index = chapter_index
+        self.saved_shown = shown
+        self.answered_counts = dict(snapshot["answered_counts"])
+        self.type_counts = dict(snapshot["type_counts"])
+        self.stats = snapshot["stats"]
+        self.response_times = response_times
+        if current is not None:
+            # 把中断时尚未作答的题目放回，并设为下一次 draw() 的题目
+            current_chapter, index = current
+            if current_chapter == chapter_index and 0 <= index < sizes[chapter_index]:
+                self.chapter_state(chapter_index).untake(index)
+                question_type = self.bank.chapters[chapter_index][index]["type"]
+                self.type_counts[question_type] = max(
+                    0, self.type_counts.get(question_type, 0) - 1
+                )
+                self.pending = (chapter_index, index)
+        self.revision += 1
+        return True
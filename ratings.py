@@ -0,0 +1,143 @@
+"""自适应难度：每道题的难度评分和学习者的能力评分 (Elo，相当于逐题更新的 1PL IRT)
+
+答对概率 P = 1 / (1 + 10 ** ((题目难度 - 学习者能力) / 400))。每次判分后两个评分
+按 K * (实际结果 - P) 相向调整，只涉及两个数，耗时 O(1)。K 随作答次数减小，
+新题和新学习者的评分收敛得快，之后趋于稳定。
+
+题目按 question_key (题型和题干的哈希) 记录，换题库文件、热重载后评分仍然有效。
+没有作答记录的题目使用默认评分。评分保存在程序目录下的 quizup_ratings.dat。
+
+自适应选题时，RatingIndex 把一章尚未显示的题目按评分分桶 (每桶 BUCKET_WIDTH 分)，
+从最接近目标难度 (答对概率约 TARGET_P) 的非空桶中随机抽取；桶数与题目数无关，
+大题库中抽题也是常数时间。
+"""
+
+import math
+import marshal
+import os
+
+from question_bank import question_key
+
+RATINGS_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "quizup_ratings.dat"
+)
+FORMAT_VERSION = 1
+
+DEFAULT_RATING = 1500.0
+K_MAX = 64.0  # 首次作答时的调整幅度
+K_MIN = 16.0  # 作答多次后的调整幅度下限
+K_HALF = 10  # 作答多少次后 K 减半
+TARGET_P = 0.7  # 自适应选题的目标答对概率
+BUCKET_WIDTH = 50.0  # 评分分桶宽度
+
+
+def expected_score(ability, difficulty):
+    """能力为 ability 的学习者答对难度为 difficulty 的题目的概率"""
+    return 1.0 / (1.0 + 10.0 ** ((difficulty - ability) / 400.0))
+
+
+def k_factor(count):
+    """已作答 count 次的评分调整幅度"""
+    return max(K_MIN, K_MAX / (1.0 + count / K_HALF))
+
+
+def bucket_of(rating):
+    return math.floor(rating / BUCKET_WIDTH)
+
+
+class Ratings:
+    """题目难度和学习者能力评分"""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.ability = DEFAULT_RATING
+        self.answered = 0  # 学习者的作答次数
+        self.questions = {}  # {题目标识: [难度评分, 作答次数]}
+        self.revision = 0  # 每次更新加一 (用于判断是否需要保存)
+        self.saved_revision = 0
+
+    @classmethod
+    def load(cls, path=RATINGS_PATH):
+        """读取保存的评分 (没有或已损坏时返回初始评分)"""
+        ratings = cls(path)
+        try:
+            with open(path, "rb") as f:
+                data = marshal.loads(f.read())
+            if data.get("version") != FORMAT_VERSION:
+                return ratings
+            ratings.ability = float(data["ability"])
+            ratings.answered = int(data["answered"])
+            ratings.questions = {
+                key: [float(rating), int(count)]
+                for key, (rating, count) in data["questions"].items()
+            }
+        except (OSError, EOFError, ValueError, TypeError, KeyError, AttributeError):
+            pass
+        return ratings
+
+    def difficulty(self, question):
+        """题目的难度评分 (没有作答记录时为默认评分)"""
+        entry = self.questions.get(question_key(question))
+        return entry[0] if entry else DEFAULT_RATING
+
+    def target(self):
+        """自适应选题的目标难度 (答对概率为 TARGET_P)"""
+        return self.ability - 400.0 * math.log10(TARGET_P / (1.0 - TARGET_P))
+
+    def update(self, question, is_correct):
+        """根据一次判分结果更新评分，返回作答前预测的答对概率"""
+        key = question_key(question)
+        entry = self.questions.get(key)
+        if entry is None:
+            entry = self.questions[key] = [DEFAULT_RATING, 0]
+        expected = expected_score(self.ability, entry[0])
+        delta = (1.0 if is_correct else 0.0) - expected
+        self.ability += k_factor(self.answered) * delta
+        entry[0] -= k_factor(entry[1]) * delta
+        self.answered += 1
+        entry[1] += 1
+        self.revision += 1
+        return expected
+
+    def serialize(self):
+        """序列化后的评分 (marshal)"""
+        return marshal.dumps(
+            {
+                "version": FORMAT_VERSION,
+                "ability": self.ability,
+                "answered": self.answered,
+                "questions": self.questions,
+            }
+        )
+
+
+class RatingIndex:
+    """一章尚未显示题目的评分分桶索引
+
+    桶中的题目在显示后不立即移除，抽到已显示的题目时再删除 (每题至多删除一次)；
+    索引只是选题的提示，抽题状态仍以 ChapterState 为准。
+    """
+
+    def __init__(self, ratings, questions, state):
+        self.buckets = {}  # {桶号: [题目索引, ...]}
+        for index, question in enumerate(questions):
+            if state.is_available(index):
+                bucket = bucket_of(ratings.difficulty(question))
+                self.buckets.setdefault(bucket, []).append(index)
+
+    def pick(self, state, target, rng):
+        """从最接近 target 的桶中随机选择一个尚未显示的题目 (不移除)，没有时返回 None"""
+        center = bucket_of(target)
+        while self.buckets:
+            bucket = min(self.buckets, key=lambda b: (abs(b - center), b))
+            members = self.buckets[bucket]
+            while members:
+                slot = rng.randrange(len(members))
+                index = members[slot]
+                if state.is_available(index):
+                    return index
+                # 已显示的题目：与末尾交换后弹出
+                members[slot] = members[-1]
+                members.pop()
+            del self.buckets[bucket]
+        return None
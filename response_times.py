@@ -0,0 +1,172 @@
+"""答题用时：每道题从完全显示到提交作答的秒数，按章节和题型累计到分位数草图
+
+QuantileSketch 按对数分桶计数，相邻桶边界相差 GAMMA 倍，估计的分位数相对误差
+不超过 ALPHA。计数存放在 array("I") 中，只覆盖出现过的桶的范围。用时限制在
+MIN_SECONDS 到 MAX_SECONDS 之间，因此每个草图至多约 570 个桶 (2 KB 多)，
+内存与作答次数无关，数百万次作答也不会增长。
+"""
+
+import math
+from array import array
+
+ALPHA = 0.01  # 分位数的相对误差
+GAMMA = (1 + ALPHA) / (1 - ALPHA)
+LOG_GAMMA = math.log(GAMMA)
+MIN_SECONDS = 0.05
+MAX_SECONDS = 3600.0  # 离开后回来作答的超长用时按一小时计
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+class QuantileSketch:
+    """对数分桶的分位数草图"""
+
+    __slots__ = ("offset", "counts", "count")
+
+    def __init__(self):
+        self.offset = 0  # counts[0] 对应的桶号
+        self.counts = array("I")
+        self.count = 0
+
+    def add(self, seconds):
+        seconds = min(max(seconds, MIN_SECONDS), MAX_SECONDS)
+        self.add_bucket(math.ceil(math.log(seconds) / LOG_GAMMA), 1)
+
+    def add_bucket(self, bucket, n):
+        """桶 bucket (覆盖 GAMMA**(bucket-1) 到 GAMMA**bucket) 计数加 n"""
+        counts = self.counts
+        if not counts:
+            self.offset = bucket
+            counts.append(0)
+        elif bucket < self.offset:
+            grow = self.offset - bucket
+            self.counts = counts = array("I", bytes(grow * counts.itemsize)) + counts
+            self.offset = bucket
+        elif bucket >= self.offset + len(counts):
+            grow = bucket - self.offset - len(counts) + 1
+            counts.frombytes(bytes(grow * counts.itemsize))
+        counts[bucket - self.offset] += n
+        self.count += n
+
+    def merge(self, other):
+        for i, n in enumerate(other.counts):
+            if n:
+                self.add_bucket(other.offset + i, n)
+
+    def quantile(self, q):
+        """估计的 q 分位数 (秒)，没有样本时返回 None"""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen > rank:
+                # 取桶的中点，使相对误差在桶的两端对称
+                return 2 * GAMMA ** (self.offset + i) / (GAMMA + 1)
+        return 2 * GAMMA ** (self.offset + len(self.counts) - 1) / (GAMMA + 1)
+
+    def quantiles(self, qs=QUANTILES):
+        return tuple(self.quantile(q) for q in qs)
+
+    def to_data(self):
+        """可用 marshal 序列化的表示"""
+        return self.offset, self.counts.tobytes()
+
+    @classmethod
+    def from_data(cls, data):
+        sketch = cls()
+        sketch.offset, raw = data
+        sketch.counts.frombytes(raw)
+        sketch.count = sum(sketch.counts)
+        return sketch
+
+
+class ResponseTimes:
+    """各章各题型的答题用时
+
+    sketches 为 {章节索引: {题型: QuantileSketch}}；另外按题型累计全部章节的合计，
+    统计窗口每答一题刷新总计时不必合并所有章节。
+    """
+
+    def __init__(self):
+        self.sketches = {}
+        self.totals = {}  # {题型: QuantileSketch}
+
+    def add(self, chapter_index, q_type, seconds):
+        chapter = self.sketches.get(chapter_index)
+        if chapter is None:
+            chapter = self.sketches[chapter_index] = {}
+        sketch = chapter.get(q_type)
+        if sketch is None:
+            sketch = chapter[q_type] = QuantileSketch()
+        sketch.add(seconds)
+        total = self.totals.get(q_type)
+        if total is None:
+            total = self.totals[q_type] = QuantileSketch()
+        total.add(seconds)
+
+    def chapter(self, chapter_index):
+        """一章所有题型合并后的草图"""
+        merged = QuantileSketch()
+        for sketch in self.sketches.get(chapter_index, {}).values():
+            merged.merge(sketch)
+        return merged
+
+    def total(self):
+        """全部章节所有题型合并后的草图"""
+        merged = QuantileSketch()
+        for sketch in self.totals.values():
+            merged.merge(sketch)
+        return merged
+
+    def remap(self, chapter_map):
+        """题库重新加载后按 {旧章节索引: 新章节索引} 保留未变化章节的用时"""
+        self.sketches = {
+            chapter_map[index]: chapter
+            for index, chapter in self.sketches.items()
+            if index in chapter_map
+        }
+        self.rebuild_totals()
+
+    def rebuild_totals(self):
+        self.totals = {}
+        for chapter in self.sketches.values():
+            for q_type, sketch in chapter.items():
+                self.totals.setdefault(q_type, QuantileSketch()).merge(sketch)
+
+    def to_data(self):
+        return {
+            chapter_index: {
+                q_type: sketch.to_data() for q_type, sketch in chapter.items()
+            }
+            for chapter_index, chapter in self.sketches.items()
+        }
+
+    @classmethod
+    def from_data(cls, data):
+        times = cls()
+        for chapter_index, chapter in data.items():
+            times.sketches[chapter_index] = {
+                q_type: QuantileSketch.from_data(sketch_data)
+                for q_type, sketch_data in chapter.items()
+            }
+        times.rebuild_totals()
+        return times
+
+
+def format_seconds(seconds):
+    """用时的简短显示 (如 8.4秒、2分05秒)"""
+    if seconds is None:
+        return "-"
+    if seconds < 60:
+        return f"{seconds:.1f}秒"
+    minutes, seconds = divmod(round(seconds), 60)
+    return f"{minutes}分{seconds:02d}秒"
+
+
+def describe(sketch):
+    """“中位 8.4秒 · P90 20.1秒 · P99 1分05秒”，没有样本时返回空字符串"""
+    if not sketch.count:
+        return ""
+    median, p90, p99 = (format_seconds(value) for value in sketch.quantiles())
+    return f"中位 {median} · P90 {p90} · P99 {p99}"
@@ -0,0 +1,71 @@
+"""共享界面时钟：一条 root.after 链以固定间隔驱动所有动画和倒计时
+
+各控件不再各自维持 after 定时链，而是向 Ticker 订阅回调 callback(now)，now 为本次
+时钟的 time.monotonic()。回调返回 False 时自动取消订阅；没有订阅者时时钟停止，
+空闲时不占用 CPU。每次时钟按计划时刻对齐调度，回调的耗时不会累积成漂移；在较慢
+的机器上落后超过一个间隔时直接从当前时刻重新对齐，不会连续补发积压的帧。
+"""
+
+import sys
+import time
+
+TICK_MS = 20  # 时钟间隔 (毫秒)，即淡入淡出动画的帧间隔
+
+
+class Ticker:
+    """以固定间隔调用所有订阅者的共享时钟"""
+
+    def __init__(self, root, interval_ms=TICK_MS):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.callbacks = []
+        self.job = None
+        self.due = 0.0  # 下一次时钟的计划时刻 (monotonic)
+
+    @property
+    def running(self):
+        return self.job is not None
+
+    def add(self, callback):
+        """订阅时钟 (已订阅时忽略)，时钟未运行时启动"""
+        if callback not in self.callbacks:
+            self.callbacks.append(callback)
+        if self.job is None:
+            self.due = time.monotonic() + self.interval_ms / 1000
+            self.job = self.root.after(self.interval_ms, self.tick)
+
+    def remove(self, callback):
+        """取消订阅 (未订阅时忽略)；最后一个订阅者取消后时钟在下一次停止"""
+        if callback in self.callbacks:
+            self.callbacks.remove(callback)
+
+    def stop(self):
+        """停止时钟并清除所有订阅者"""
+        if self.job is not None:
+            self.root.after_cancel(self.job)
+            self.job = None
+        self.callbacks.clear()
+
+    def tick(self):
+        self.job = None
+        now = time.monotonic()
+        for callback in list(self.callbacks):
+            if callback not in self.callbacks:
+                continue  # 被本次时钟中先执行的回调取消
+            try:
+                keep = callback(now)
+            except Exception:
+                # 出错的订阅者不影响其他订阅者；交给 Tk 报告异常
+                keep = False
+                self.root.report_callback_exception(*sys.exc_info())
+            if keep is False and callback in self.callbacks:
+                self.callbacks.remove(callback)
+        if not self.callbacks:
+            return
+
+        interval = self.interval_ms / 1000
+        self.due += interval
+        now = time.monotonic()
+        if self.due < now:
+            self.due = now + interval  # 落后时重新对齐，不补发积压的帧
+        self.job = self.root.after(max(1, round((self.due - now) * 1000)), self.tick)
@@ -0,0 +1,503 @@
+"""局域网答题服务器：加载一次题库，通过浏览器为多名学习者提供练习 (不依赖Tk)
+
+用法: python server.py 题库文件.txt [--host 0.0.0.0] [--port 8000]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import secrets
+import sys
+import time
+from array import array
+from urllib.parse import parse_qs, urlsplit
+
+from question_bank import QuestionBank
+from quiz_engine import QUESTION_TYPES, normalize_answer
+
+SESSION_TTL = 2 * 60 * 60  # 会话空闲超过此秒数后被清理
+MAX_BODY = 64 * 1024  # 请求体最大字节数
+
+STATUS_TEXT = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+}
+
+
+class HTTPError(Exception):
+    """带状态码的请求错误"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class SharedBank:
+    """所有会话共享的只读题库数据 (题目JSON在加载时序列化一次)"""
+
+    def __init__(self, question_bank):
+        self.title = question_bank.title
+        self.chapters = question_bank.chapters
+        self.titles = []
+        self.payloads = []  # 每章每题的公开JSON (不含答案) [[bytes, ...], ...]
+        self.answers = []  # 每章每题的标准答案 [[str, ...], ...]
+        self.type_ids = []  # 每章每题的题型编号 [bytes(n), ...]
+        for chapter_index, questions in enumerate(self.chapters):
+            default_title = f"第{chapter_index + 1}章"
+            self.titles.append(
+                questions[0].get("chapter", default_title)
+                if questions
+                else default_title
+            )
+            self.payloads.append(
+                [
+                    json.dumps(
+                        {
+                            "type": q["type"],
+                            "question": q["question"],
+                            "options": q.get("options", []),
+                        },
+                        ensure_ascii=False,
+                        separators=(",", ":"),
+                    ).encode("utf-8")
+                    for q in questions
+                ]
+            )
+            self.answers.append([normalize_answer(q) for q in questions])
+            self.type_ids.append(
+                bytes(QUESTION_TYPES.index(q["type"]) for q in questions)
+            )
+        self.info = encode_json(
+            {
+                "title": self.title,
+                "chapters": [
+                    {"title": title, "count": len(questions)}
+                    for title, questions in zip(self.titles, self.chapters)
+                ],
+            }
+        )
+
+    def chapter_size(self, chapter_index):
+        return len(self.chapters[chapter_index])
+
+
+class Session:
+    """单个学习者的会话状态
+
+    章节内的出题顺序是 (offset + position * stride) % size 的伪随机排列
+    (stride 与 size 互质)，因此每个会话只需保存几个整数，不必保存题目列表。
+    """
+
+    __slots__ = (
+        "id",
+        "chapter_index",
+        "position",
+        "stride",
+        "offset",
+        "current",
+        "stats",
+        "last_seen",
+    )
+
+    def __init__(self, session_id, bank, rng, chapter_index=0):
+        self.id = session_id
+        # 每章每种题型的 [已答, 正确] 计数，按 (章, 题型) 平铺
+        self.stats = array("I", bytes(4 * 2 * len(QUESTION_TYPES) * len(bank.chapters)))
+        self.last_seen = time.monotonic()
+        self.enter_chapter(bank, rng, chapter_index)
+
+    def enter_chapter(self, bank, rng, chapter_index):
+        """进入章节并重新打乱出题顺序"""
+        size = bank.chapter_size(chapter_index)
+        stride = 1
+        if size > 2:
+            stride = rng.randrange(1, size)
+            while math.gcd(stride, size) != 1:
+                stride = rng.randrange(1, size)
+        self.chapter_index = chapter_index
+        self.position = 0
+        self.stride = stride
+        self.offset = rng.randrange(size) if size else 0
+        self.current = -1  # 当前题目索引，-1 表示没有待作答的题目
+
+    def question_at(self, position, size):
+        return (self.offset + position * self.stride) % size
+
+
+class QuizServer:
+    """HTTP/1.1 服务器 (asyncio，支持长连接)
+
+    接口 (JSON):
+        GET  /api/bank                  题库标题和章节列表
+        POST /api/session  {chapter}    创建会话
+        POST /api/next     {session}    下一题
+        POST /api/answer   {session, answer}
+        POST /api/chapter  {session, chapter}
+        GET  /api/stats?session=...     会话统计
+    """
+
+    def __init__(self, question_bank, rng=None):
+        self.bank = SharedBank(question_bank)
+        self.rng = rng or random.Random()
+        self.sessions = {}
+        self.request_count = 0
+        self.routes = {
+            ("GET", "/"): self.handle_index,
+            ("GET", "/api/bank"): self.handle_bank,
+            ("POST", "/api/session"): self.handle_session,
+            ("POST", "/api/next"): self.handle_next,
+            ("POST", "/api/answer"): self.handle_answer,
+            ("POST", "/api/chapter"): self.handle_chapter,
+            ("GET", "/api/stats"): self.handle_stats,
+        }
+
+    # --- 会话 ---
+    def get_session(self, session_id):
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise HTTPError(404, "会话不存在或已过期")
+        session.last_seen = time.monotonic()
+        return session
+
+    def check_chapter(self, chapter_index):
+        if not isinstance(chapter_index, int) or not (
+            0 <= chapter_index < len(self.bank.chapters)
+        ):
+            raise HTTPError(400, "章节编号无效")
+        return chapter_index
+
+    def expire_sessions(self):
+        """清理空闲过久的会话"""
+        deadline = time.monotonic() - SESSION_TTL
+        for session_id in [
+            s.id for s in self.sessions.values() if s.last_seen < deadline
+        ]:
+            del self.sessions[session_id]
+
+    # --- 接口 ---
+    def handle_index(self, query, body):
+        return 200, INDEX_HTML, "text/html; charset=utf-8"
+
+    def handle_bank(self, query, body):
+        return 200, self.bank.info, None
+
+    def handle_session(self, query, body):
+        chapter_index = self.check_chapter(body.get("chapter", 0))
+        session_id = secrets.token_urlsafe(12)
+        self.sessions[session_id] = Session(
+            session_id, self.bank, self.rng, chapter_index
+        )
+        return 200, encode_json({"session": session_id}), None
+
+    def handle_next(self, query, body):
+        session = self.get_session(body.get("session"))
+        chapter_index = session.chapter_index
+        size = self.bank.chapter_size(chapter_index)
+        if session.position >= size:
+            session.current = -1
+            return (
+                200,
+                encode_json({"done": True, "chapter": chapter_index, "total": size}),
+                None,
+            )
+        index = session.question_at(session.position, size)
+        session.current = index
+        session.position += 1
+        # 拼接预先序列化好的题目JSON，避免每次请求重新编码
+        head = '{"chapter":%d,"index":%d,"position":%d,"total":%d,"question":' % (
+            chapter_index,
+            index,
+            session.position,
+            size,
+        )
+        return (
+            200,
+            head.encode() + self.bank.payloads[chapter_index][index] + b"}",
+            None,
+        )
+
+    def handle_answer(self, query, body):
+        session = self.get_session(body.get("session"))
+        index = session.current
+        if index < 0:
+            raise HTTPError(400, "当前没有待作答的题目")
+        user_answer = body.get("answer")
+        # 空作答视为缺少作答 (与 live_host 一致)，不计入统计，也不会与空答案相同而判对
+        if not isinstance(user_answer, str) or not user_answer:
+            raise HTTPError(400, "缺少作答")
+        chapter_index = session.chapter_index
+        user_answer = "".join(sorted(user_answer.upper()))
+        correct_answer = self.bank.answers[chapter_index][index]
+        is_correct = user_answer == correct_answer
+        slot = (
+            chapter_index * len(QUESTION_TYPES)
+            + self.bank.type_ids[chapter_index][index]
+        ) * 2
+        session.stats[slot] += 1
+        if is_correct:
+            session.stats[slot + 1] += 1
+        session.current = -1
+        return (
+            200,
+            encode_json({"correct": is_correct, "answer": correct_answer}),
+            None,
+        )
+
+    def handle_chapter(self, query, body):
+        session = self.get_session(body.get("session"))
+        chapter_index = self.check_chapter(body.get("chapter"))
+        session.enter_chapter(self.bank, self.rng, chapter_index)
+        return 200, encode_json({"chapter": chapter_index}), None
+
+    def handle_stats(self, query, body):
+        session = self.get_session(query.get("session", [None])[0])
+        chapters = []
+        stats = session.stats
+        for chapter_index, title in enumerate(self.bank.titles):
+            base = chapter_index * len(QUESTION_TYPES) * 2
+            types = {}
+            for type_index, q_type in enumerate(QUESTION_TYPES):
+                answered = stats[base + type_index * 2]
+                if answered:
+                    types[q_type] = {
+                        "answered": answered,
+                        "correct": stats[base + type_index * 2 + 1],
+                    }
+            if types:
+                chapters.append(
+                    {"chapter": chapter_index, "title": title, "types": types}
+                )
+        return 200, encode_json({"chapters": chapters}), None
+
+    # --- HTTP ---
+    def dispatch(self, method, target, body_bytes):
+        """处理一个请求，返回 (状态码, 响应体, Content-Type)"""
+        parts = urlsplit(target)
+        handler = self.routes.get((method, parts.path))
+        if handler is None:
+            if any(path == parts.path for _, path in self.routes):
+                raise HTTPError(405, "不支持的请求方法")
+            raise HTTPError(404, "接口不存在")
+        query = parse_qs(parts.query) if parts.query else {}
+        body = {}
+        if body_bytes:
+            try:
+                body = json.loads(body_bytes)
+            except ValueError:
+                raise HTTPError(400, "请求体不是有效的JSON")
+            if not isinstance(body, dict):
+                raise HTTPError(400, "请求体必须是JSON对象")
+        return handler(query, body)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    name, sep, value = line.partition(":")
+                    if sep:
+                        headers[name.strip().lower()] = value.strip()
+                keep_alive = (
+                    headers.get("connection", "").lower() != "close"
+                    if version == "HTTP/1.1"
+                    else headers.get("connection", "").lower() == "keep-alive"
+                )
+
+                length = int(headers.get("content-length", 0) or 0)
+                if length > MAX_BODY:
+                    status, payload, content_type = 413, b"", None
+                    keep_alive = False
+                else:
+                    body_bytes = await reader.readexactly(length) if length else b""
+                    try:
+                        status, payload, content_type = self.dispatch(
+                            method, target, body_bytes
+                        )
+                    except HTTPError as e:
+                        status = e.status
+                        payload = encode_json({"error": e.message})
+                        content_type = None
+                self.request_count += 1
+
+                writer.write(
+                    (
+                        f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+                        f"Content-Type: {content_type or 'application/json; charset=utf-8'}\r\n"
+                        f"Content-Length: {len(payload)}\r\n"
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                    ).encode("latin-1")
+                    + payload
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def expire_loop(self):
+        while True:
+            await asyncio.sleep(60)
+            self.expire_sessions()
+
+    async def serve(self, host="127.0.0.1", port=8000, ready=None):
+        """启动服务器并一直运行 (ready 为可选回调，服务器开始监听后调用)"""
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        expire_task = asyncio.create_task(self.expire_loop())
+        if ready:
+            ready(server)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            expire_task.cancel()
+
+
+def encode_json(data):
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def print_error(title, message):
+    print(f"{title}: {message}", file=sys.stderr)
+
+
+def run_server(question_bank, host="127.0.0.1", port=8000):
+    """在当前进程中运行服务器 (阻塞直到中断)"""
+    server = QuizServer(question_bank)
+    print(
+        f"题库: {question_bank.title}  章节: {len(question_bank.chapters)}  "
+        f"地址: http://{host}:{port}/"
+    )
+    try:
+        asyncio.run(server.serve(host, port))
+    except KeyboardInterrupt:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="QuizUp 局域网答题服务器")
+    parser.add_argument("bank", help="题库文件 (.txt)")
+    parser.add_argument("--host", default="0.0.0.0", help="监听地址")
+    parser.add_argument("--port", type=int, default=8000, help="监听端口")
+    args = parser.parse_args()
+
+    question_bank = QuestionBank(on_error=print_error)
+    if not question_bank.load_question_bank(args.bank):
+        print("题库中没有可用的章节", file=sys.stderr)
+        sys.exit(1)
+    run_server(question_bank, args.host, args.port)
+
+
+INDEX_HTML = """<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>QuizUp</title>
+<style>
+body { font-family: sans-serif; max-width: 720px; margin: 2em auto; padding: 0 1em;
+       background: #f5f6fa; color: #2d3436; }
+.card { background: #fff; border-radius: 10px; padding: 1.2em; margin: 1em 0; }
+.option { display: block; margin: .5em 0; cursor: pointer; }
+button { padding: .5em 1.4em; border: 0; border-radius: 6px; background: #0984e3;
+         color: #fff; font-size: 1em; cursor: pointer; }
+#feedback.correct { color: #00b894; } #feedback.wrong { color: #d63031; }
+</style>
+</head>
+<body>
+<h2 id="title">QuizUp</h2>
+<select id="chapter"></select>
+<div class="card">
+  <div id="progress"></div>
+  <p><b id="type"></b> <span id="question"></span></p>
+  <div id="options"></div>
+  <p id="feedback"></p>
+</div>
+<button id="submit">提交</button> <button id="next">下一题</button>
+<script>
+let session = null, current = null;
+async function api(path, body) {
+  const res = await fetch(path, body === undefined ? {} :
+    {method: "POST", body: JSON.stringify(body)});
+  return res.json();
+}
+function answer() {
+  return [...document.querySelectorAll("#options input:checked")]
+    .map(e => e.value).join("");
+}
+async function next() {
+  const data = await api("/api/next", {session});
+  document.getElementById("feedback").textContent = "";
+  const options = document.getElementById("options");
+  options.innerHTML = "";
+  if (data.done) {
+    current = null;
+    document.getElementById("type").textContent = "";
+    document.getElementById("question").textContent = "本章题目已全部完成";
+    return;
+  }
+  current = data;
+  const q = data.question;
+  document.getElementById("progress").textContent = data.position + " / " + data.total;
+  document.getElementById("type").textContent = "【" + q.type + "】";
+  document.getElementById("question").textContent = q.question;
+  const labels = q.type === "判断题" ? ["对", "错"] : q.options;
+  labels.forEach((text, i) => {
+    const letter = String.fromCharCode(65 + i);
+    const label = document.createElement("label");
+    label.className = "option";
+    const input = document.createElement("input");
+    input.type = q.type === "多选题" ? "checkbox" : "radio";
+    input.name = "answer";
+    input.value = letter;
+    label.append(input, " " + letter + ". " + text);
+    options.append(label);
+  });
+}
+async function submit() {
+  if (!current || !answer()) return;
+  const data = await api("/api/answer", {session, answer: answer()});
+  const feedback = document.getElementById("feedback");
+  feedback.className = data.correct ? "correct" : "wrong";
+  feedback.textContent = data.correct ? "回答正确" : "回答错误，正确答案：" + data.answer;
+  current = null;
+}
+async function start() {
+  const bank = await api("/api/bank");
+  document.getElementById("title").textContent = bank.title;
+  const select = document.getElementById("chapter");
+  bank.chapters.forEach((c, i) => select.add(new Option(c.title + " (" + c.count + ")", i)));
+  select.onchange = async () => {
+    await api("/api/chapter", {session, chapter: Number(select.value)});
+    next();
+  };
+  session = (await api("/api/session", {})).session;
+  next();
+}
+document.getElementById("submit").onclick = submit;
+document.getElementById("next").onclick = next;
+start();
+</script>
+</body>
+</html>
+""".encode("utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""答题进度保存：把 QuizEngine.snapshot() 的数据按题库保存，下次打开同一题库时恢复
+
+进度文件按题库文件的绝对路径命名，保存在程序目录下的 quizup_sessions/。
+QuizEngine 只能在 Tk 线程中访问，因此由 Tk 线程定时取快照并用 marshal 序列化
+(数千章的题库也只需几毫秒)，写文件交给后台线程；退出程序时在 Tk 线程中同步写出。
+"""
+
+import hashlib
+import marshal
+import os
+import threading
+
+SESSION_FOLDER = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "quizup_sessions"
+)
+AUTOSAVE_MS = 30000  # 定时保存间隔
+
+
+def session_path(bank_path, folder=None):
+    name = hashlib.blake2b(
+        os.path.abspath(bank_path).encode("utf-8"), digest_size=12
+    ).hexdigest()
+    return os.path.join(folder or SESSION_FOLDER, f"{name}.session")
+
+
+def write_session(path, data):
+    """写出序列化后的进度 (先写临时文件再替换)，失败时返回 False"""
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+        return True
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        return False
+
+
+def load_session(bank_path, folder=None):
+    """读取题库对应的进度，没有或已损坏时返回 None"""
+    try:
+        with open(session_path(bank_path, folder), "rb") as f:
+            snapshot = marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    return snapshot if isinstance(snapshot, dict) else None
+
+
+def delete_session(bank_path, folder=None):
+    try:
+        os.remove(session_path(bank_path, folder))
+    except OSError:
+        pass
+
+
+class SessionSaver:
+    """进度保存器：submit() 在调用线程序列化，后台线程写文件 (每个文件只写最新的一份)
+
+    submit_file() / save_file_now() 可写出其他已序列化的数据 (如难度评分)。
+    """
+
+    def __init__(self, folder=None):
+        self.folder = folder
+        self.condition = threading.Condition()
+        self.pending = {}  # 等待写出的数据 {文件路径: (序号, 文件路径, 数据)}
+        self.sequence = 0
+        self.write_lock = threading.Lock()
+        self.written = {}  # 每个文件已写出的最新序号 {文件路径: 序号}
+        self.thread = None
+        self.closed = False
+
+    def submit(self, bank_path, snapshot):
+        """提交一份进度由后台线程写出"""
+        self.submit_file(session_path(bank_path, self.folder), marshal.dumps(snapshot))
+
+    def save_now(self, bank_path, snapshot):
+        """在调用线程中立即写出进度 (退出程序时使用)，返回是否成功"""
+        return self.save_file_now(
+            session_path(bank_path, self.folder), marshal.dumps(snapshot)
+        )
+
+    def submit_file(self, path, data):
+        """提交一份已序列化的数据由后台线程写出"""
+        item = self.next_item(path, data)
+        with self.condition:
+            self.pending[path] = item
+            if self.thread is None:
+                self.thread = threading.Thread(
+                    target=self._run, name="session-saver", daemon=True
+                )
+                self.thread.start()
+            self.condition.notify()
+
+    def save_file_now(self, path, data):
+        """在调用线程中立即写出已序列化的数据，返回是否成功"""
+        item = self.next_item(path, data)
+        with self.condition:
+            # 已提交但尚未写出的旧数据不再需要
+            self.pending.pop(path, None)
+        return self.write(item)
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+
+    def next_item(self, path, data):
+        self.sequence += 1
+        return self.sequence, path, data
+
+    def write(self, item):
+        sequence, path, data = item
+        with self.write_lock:
+            # 较新的数据已经写出时跳过 (后台线程和退出保存可能交错)
+            if self.written.get(path, 0) > sequence:
+                return True
+            if not write_session(path, data):
+                return False
+            self.written[path] = sequence
+            return True
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.pending and not self.closed:
+                    self.condition.wait()
+                if not self.pending:
+                    return
+                items = list(self.pending.values())
+                self.pending.clear()
+            for item in items:
+                self.write(item)
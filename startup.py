@@ -0,0 +1,54 @@
+"""启动阶段计时：记录从 main.py 开始执行到各阶段完成的耗时
+
+main.py 最先导入本模块，此时记下起点。各阶段完成时调用 phase(名称)，
+首屏 (或首题) 显示后调用 finish()：各阶段耗时写入延迟指标 (startup_<名称>_ms)，
+设置环境变量 QUIZUP_STARTUP=1 时还会在控制台打印阶段耗时表。
+目标：自动继续上次题库时，首题显示 (startup_first_question_ms) 不超过 300 ms。
+"""
+
+import os
+import sys
+import time
+
+ENV_STARTUP = "QUIZUP_STARTUP"
+BUDGET_MS = 300  # 首题显示的耗时目标
+
+started = time.perf_counter()
+phases = []  # [(阶段名称, 距起点的毫秒数)]
+finished = False
+
+
+def phase(name):
+    """记录一个阶段完成的时间点"""
+    if not finished:
+        phases.append((name, (time.perf_counter() - started) * 1000))
+
+
+def finish(name):
+    """记录最后一个阶段并汇总 (只生效一次)"""
+    global finished
+    if finished:
+        return
+    phase(name)
+    finished = True
+
+    import metrics
+
+    for phase_name, elapsed in phases:
+        metrics.registry.observe(f"startup_{phase_name}_ms", elapsed)
+    if os.environ.get(ENV_STARTUP, "").strip() not in ("", "0"):
+        print(report(), file=sys.stderr)
+
+
+def report():
+    """阶段耗时表 (累计耗时和本阶段耗时)"""
+    lines = [f"{'启动阶段':<20}{'累计(ms)':>10}{'本阶段(ms)':>12}"]
+    previous = 0.0
+    for name, elapsed in phases:
+        lines.append(f"{name:<24}{elapsed:>10.1f}{elapsed - previous:>12.1f}")
+        previous = elapsed
+    if phases and phases[-1][0] == "first_question":
+        total = phases[-1][1]
+        verdict = "达标" if total <= BUDGET_MS else "超出目标"
+        lines.append(f"首题显示 {total:.1f} ms (目标 {BUDGET_MS} ms，{verdict})")
+    return "\n".join(lines)
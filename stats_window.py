@@ -0,0 +1,307 @@
+import tkinter as tk
+from tkinter import ttk
+from datetime import datetime
+from modern_ui import ModernUI
+from response_times import describe
+from virtual_list import VirtualList
+
+QUESTION_TYPES = ["判断题", "单选题", "多选题"]
+
+
+class StatsWindow:
+    """答题统计窗口 (非模态，按章节虚拟化显示，随答题增量更新)"""
+
+    ROW_HEIGHT = 64  # 每章一行的固定高度
+
+    def __init__(self, app):
+        self.app = app
+        self.totals = {}  # 每章合计 {chapter_index: [answered, correct]}
+        self.summary = [0, 0]  # 全部章节合计 [answered, correct]
+
+        # 创建统计信息窗口 (Toplevel)
+        self.window = tk.Toplevel(app.root)
+        self.window.title("答题情况统计")
+        self.window.geometry("700x550")  # 初始大小
+        self.window.configure(bg=ModernUI.get_theme_color("bg"))
+        self.window.minsize(600, 400)  # 最小尺寸
+
+        # --- 标题栏 ---
+        title_bar = ttk.Frame(self.window, style="Title.TFrame", padding="0 5")
+        title_bar.pack(fill=tk.X)
+        ttk.Label(
+            title_bar,
+            text="答题统计情况",
+            style="Title.TLabel",
+            padding=8,
+        ).pack()
+
+        # --- 题库信息 ---
+        info_frame = ttk.Frame(self.window, style="TFrame", padding="15 10 15 5")
+        info_frame.pack(fill=tk.X)
+        self.bank_label = ttk.Label(
+            info_frame,
+            style="TLabel",
+            font=("微软雅黑", 11, "bold"),
+        )
+        self.bank_label.pack(anchor=tk.W, pady=(0, 5))
+        self.time_label = ttk.Label(
+            info_frame,
+            style="Secondary.TLabel",  # 次要文字样式
+            font=("微软雅黑", 9),
+        )
+        self.time_label.pack(anchor=tk.W)
+
+        # --- 表头 ---
+        header = ttk.Frame(self.window, style="Card.TFrame", padding="15 6")
+        header.pack(fill=tk.X, padx=(5, 20), pady=(5, 0))
+        self._configure_columns(header)
+        for col, text in enumerate(["章节", "已答", "正确", "错误", "正确率"]):
+            ttk.Label(
+                header,
+                text=text,
+                font=("微软雅黑", 9, "bold"),
+                style="StatsHeader.TLabel",
+                anchor=("w" if col == 0 else "center"),
+            ).grid(row=0, column=col, sticky="ew")
+
+        # --- 底部关闭按钮 (先于列表打包，保证窗口缩小时仍然可见) ---
+        button_frame = ttk.Frame(self.window, style="TFrame", padding="0 10 10 10")
+        button_frame.pack(side=tk.BOTTOM, fill=tk.X)
+        button_frame.columnconfigure(0, weight=1)  # 居中按钮
+        self.close_button = ModernUI.create_rounded_button(
+            button_frame,
+            text="关闭",
+            command=self.close,
+            width=100,
+            height=35,
+            corner_radius=17,
+            color_role="neutral",
+            fg="white",
+        )
+        self.close_button.grid(row=0, column=0, pady=5)
+
+        # --- 总结部分 ---
+        summary_panel = ttk.Frame(self.window, style="Summary.TFrame", padding="15 10")
+        summary_panel.pack(side=tk.BOTTOM, fill=tk.X)
+        ttk.Label(
+            summary_panel,
+            text="总计",
+            style="SummaryHeader.TLabel",
+        ).grid(row=0, column=0, columnspan=4, sticky="w", pady=(0, 8))
+        summary_panel.columnconfigure(0, weight=1, uniform="sum_col")
+        summary_panel.columnconfigure(1, weight=1, uniform="sum_col")
+        summary_panel.columnconfigure(2, weight=1, uniform="sum_col")
+        summary_panel.columnconfigure(3, weight=2, uniform="sum_col")  # 正确率稍宽
+        self.summary_labels = []
+        for col, style in enumerate(
+            [
+                "Summary.TLabel",
+                "SummaryCorrect.TLabel",
+                "SummaryWrong.TLabel",
+                "SummaryRate.TLabel",
+            ]
+        ):
+            label = ttk.Label(summary_panel, style=style)
+            label.grid(row=1, column=col, sticky="w", padx=2)
+            self.summary_labels.append(label)
+        # 答题用时的中位数和 P90、P99 (全部章节)
+        self.times_label = ttk.Label(summary_panel, style="Summary.TLabel")
+        self.times_label.grid(row=2, column=0, columnspan=4, sticky="w", padx=2)
+
+        # --- 章节列表 (虚拟化，只创建可见行) ---
+        self.chapter_list = VirtualList(
+            self.window,
+            create_row=self._create_row,
+            bind_row=self._bind_row,
+            row_height=self.ROW_HEIGHT,
+        )
+        self.chapter_list.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        # 鼠标滚轮绑定到窗口本身 (子控件事件会经由窗口的绑定标签触发)
+        self.window.bind("<MouseWheel>", self._on_mousewheel)  # Windows/macOS
+        self.window.bind("<Button-4>", self._on_mousewheel)  # Linux 上滚
+        self.window.bind("<Button-5>", self._on_mousewheel)  # Linux 下滚
+        self.window.bind("<Escape>", lambda e: self.close())
+        self.window.bind("<<ThemeChanged>>", self._on_theme_changed)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.reload()
+        self._center_on_parent()
+        self.window.focus_set()
+
+    # --- 数据 ---
+    def reload(self):
+        """根据应用当前的统计数据重新计算合计 (题库切换或统计清空时调用)"""
+        bank = self.app.question_bank
+        self.bank_label.configure(text=f"题库: {bank.title if bank else 'N/A'}")
+        self.totals = {}
+        self.summary = [0, 0]
+        for chapter_index, chapter_stats in self.app.stats.items():
+            answered = sum(s["answered"] for s in chapter_stats.values())
+            correct = sum(s["correct"] for s in chapter_stats.values())
+            self.totals[chapter_index] = [answered, correct]
+            self.summary[0] += answered
+            self.summary[1] += correct
+
+        num_chapters = len(bank.chapters) if bank else 0
+        self.chapter_list.set_count(num_chapters)
+        self._update_summary()
+
+    def apply_delta(self, chapter_index, is_correct):
+        """应用一次答题结果，只刷新受影响的行和总计"""
+        totals = self.totals.setdefault(chapter_index, [0, 0])
+        totals[0] += 1
+        self.summary[0] += 1
+        if is_correct:
+            totals[1] += 1
+            self.summary[1] += 1
+        self.chapter_list.refresh_row(chapter_index)
+        self._update_summary()
+
+    def _update_summary(self):
+        answered, correct = self.summary
+        wrong = answered - correct
+        # 计算总正确率，避免除零错误
+        rate = f"{correct / answered * 100:.1f}%" if answered > 0 else "N/A"
+        for label, text in zip(
+            self.summary_labels,
+            [
+                f"总答题: {answered}",
+                f"总正确: {correct}",
+                f"总错误: {wrong}",
+                f"总正确率: {rate}",
+            ],
+        ):
+            label.configure(text=text)
+        times = self.app.response_times
+        self.times_label.configure(
+            text=f"答题用时: {(describe(times.total()) if times else '') or '暂无记录'}"
+        )
+        self.time_label.configure(
+            text=f"统计时间: {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+        )
+
+    # --- 行控件 ---
+    @staticmethod
+    def _configure_columns(frame):
+        frame.columnconfigure(0, weight=4, uniform="stats_col")  # 章节 (较宽)
+        frame.columnconfigure(1, weight=1, uniform="stats_col")  # 已答
+        frame.columnconfigure(2, weight=1, uniform="stats_col")  # 正确
+        frame.columnconfigure(3, weight=1, uniform="stats_col")  # 错误
+        frame.columnconfigure(4, weight=2, uniform="stats_col")  # 正确率 (稍宽)
+
+    def _create_row(self, parent):
+        """创建一个可复用的章节行控件"""
+        row = ttk.Frame(parent, style="Card.TFrame", padding="15 4")
+        self._configure_columns(row)
+        row.title = ttk.Label(row, style="StatsHeader.TLabel", anchor="w")
+        row.title.grid(row=0, column=0, sticky="ew")
+        row.values = []
+        for col, style in enumerate(
+            [
+                "StatsValue.TLabel",
+                "StatsCorrect.TLabel",
+                "StatsWrong.TLabel",
+                "StatsRate.TLabel",
+            ],
+            start=1,
+        ):
+            label = ttk.Label(row, style=style, anchor="center")
+            label.grid(row=0, column=col, sticky="ew")
+            row.values.append(label)
+        # 第二行：按题型细分
+        row.detail = ttk.Label(row, style="StatsMuted.TLabel", anchor="w")
+        row.detail.grid(row=1, column=0, columnspan=5, sticky="ew", pady=(2, 0))
+        return row
+
+    def _bind_row(self, row, chapter_index):
+        """把第 chapter_index 章的统计数据填入行控件"""
+        # 章节标题由会话核心读取：按需读取的 SQLite 题库直接使用章节目录中的标题，
+        # 不为显示标题而读取 (并缓存) 整页题目
+        row.title.configure(text=self.app.engine.chapter_title(chapter_index))
+
+        answered, correct = self.totals.get(chapter_index, (0, 0))
+        if answered > 0:
+            values = [
+                str(answered),
+                str(correct),
+                str(answered - correct),
+                f"{correct / answered * 100:.1f}%",
+            ]
+            chapter_stats = self.app.stats.get(chapter_index, {})
+            parts = []
+            for q_type in QUESTION_TYPES:
+                type_stats = chapter_stats.get(q_type)
+                if type_stats and type_stats["answered"] > 0:
+                    parts.append(
+                        f"{q_type} {type_stats['correct']}/{type_stats['answered']}"
+                    )
+            times = self.app.response_times
+            timing = describe(times.chapter(chapter_index)) if times else ""
+            if timing:
+                parts.append(f"用时 {timing}")
+            detail = "    ".join(parts)
+        else:
+            values = ["-", "-", "-", "-"]
+            detail = "本章无答题记录"
+        for label, text in zip(row.values, values):
+            label.configure(text=text)
+        row.detail.configure(text=detail)
+
+    # --- 窗口 ---
+    def exists(self):
+        """窗口是否仍然打开"""
+        try:
+            return bool(self.window.winfo_exists())
+        except tk.TclError:
+            return False
+
+    def show(self):
+        """把已打开的窗口提到最前"""
+        self.window.deiconify()
+        self.window.lift()
+        self.window.focus_set()
+
+    def close(self):
+        """关闭窗口并通知应用"""
+        if self.app.stats_window is self:
+            self.app.stats_window = None
+        self.window.destroy()
+
+    def _center_on_parent(self):
+        self.window.update_idletasks()  # 确保所有控件尺寸已计算
+        parent = self.app.root
+        x = (
+            parent.winfo_rootx()
+            + (parent.winfo_width() - self.window.winfo_width()) // 2
+        )
+        y = (
+            parent.winfo_rooty()
+            + (parent.winfo_height() - self.window.winfo_height()) // 2
+        )
+        y = max(y, 0)  # 防止窗口顶部超出屏幕
+        self.window.geometry(f"+{x}+{y}")
+
+    def _on_mousewheel(self, event):
+        delta = 0
+        if event.num == 4:
+            delta = -1  # Linux 上滚
+        elif event.num == 5:
+            delta = 1  # Linux 下滚
+        elif event.delta > 0:
+            delta = -1  # Windows/macOS 上滚
+        elif event.delta < 0:
+            delta = 1  # Windows/macOS 下滚
+        if delta != 0:
+            self.chapter_list.scroll_units(delta)
+
+    def _on_theme_changed(self, event=None):
+        if event is not None and event.widget is not self.window:
+            return
+        self.window.configure(bg=ModernUI.get_theme_color("bg"))
+        # 关闭按钮是Canvas控件，需要按角色重新取色
+        self.close_button.configure(bg=ModernUI.get_theme_color("bg"))
+        self.close_button.itemconfig(
+            self.close_button.shadow, fill=ModernUI.get_theme_color("bg")
+        )
+        self.close_button.set_state(tk.NORMAL)
@@ -0,0 +1,175 @@
+import tkinter as tk
+from bisect import bisect_right
+from tkinter import ttk
+from modern_ui import ModernUI
+
+
+class VirtualList(ttk.Frame):
+    """虚拟化列表：只为可见行创建控件，滚动时复用行控件
+
+    create_row(parent) 创建一个行控件 (只在池不够用时调用)；
+    bind_row(widget, index) 把第 index 行的数据填入行控件。
+    行高可以是固定值，也可以通过 set_count(n, heights) 给出每行高度。
+    """
+
+    def __init__(self, parent, create_row, bind_row, row_height=40, **kwargs):
+        kwargs.setdefault("style", "TFrame")
+        super().__init__(parent, **kwargs)
+        self.create_row = create_row
+        self.bind_row = bind_row
+        self.row_height = row_height
+        self.count = 0
+        self.offsets = None  # 可变行高时每行的起始y坐标 (长度为 count + 1)
+
+        self.visible = {}  # 当前可见行 {index: (widget, canvas_item)}
+        self.pool = []  # 空闲的行控件 [(widget, canvas_item)]
+        self._refresh_pending = False
+
+        self.canvas = tk.Canvas(
+            self,
+            bg=ModernUI.get_theme_color("bg"),
+            bd=0,
+            highlightthickness=0,
+            yscrollincrement=1,  # 按像素滚动，行高不必对齐
+        )
+        self.scrollbar = ttk.Scrollbar(
+            self,
+            orient="vertical",
+            command=self.canvas.yview,
+            style="Vertical.TScrollbar",
+        )
+        self.canvas.configure(yscrollcommand=self._on_view_changed)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.canvas.bind("<Configure>", self._on_canvas_configure)
+        self.bind("<<ThemeChanged>>", self._on_theme_changed)
+
+    # --- 数据 ---
+    def set_count(self, count, heights=None):
+        """设置总行数 (可选每行高度)，并重新绑定可见行"""
+        self.count = count
+        if heights is None:
+            self.offsets = None
+        else:
+            offsets = [0] * (count + 1)
+            total = 0
+            for i, h in enumerate(heights):
+                total += h
+                offsets[i + 1] = total
+            self.offsets = offsets
+        # 数据整体变化：回收全部可见行，下一次刷新时重新绑定
+        for index in list(self.visible):
+            self._release(index)
+        self._update_scrollregion()
+        self.refresh()
+
+    def total_height(self):
+        """全部行的总高度"""
+        if self.offsets is not None:
+            return self.offsets[-1]
+        return self.count * self.row_height
+
+    def row_top(self, index):
+        """第 index 行的起始y坐标"""
+        if self.offsets is not None:
+            return self.offsets[index]
+        return index * self.row_height
+
+    def row_height_of(self, index):
+        """第 index 行的高度"""
+        if self.offsets is not None:
+            return self.offsets[index + 1] - self.offsets[index]
+        return self.row_height
+
+    def index_at(self, y):
+        """返回y坐标所在的行号"""
+        if self.count == 0:
+            return 0
+        if self.offsets is not None:
+            index = bisect_right(self.offsets, y) - 1
+        else:
+            index = int(y // self.row_height)
+        return max(0, min(index, self.count - 1))
+
+    # --- 刷新 ---
+    def refresh(self):
+        """合并同一轮事件中的多次刷新请求"""
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self.after_idle(self._refresh_now)
+
+    def refresh_row(self, index):
+        """如果第 index 行可见，重新绑定它的数据"""
+        entry = self.visible.get(index)
+        if entry:
+            self.bind_row(entry[0], index)
+
+    def scroll_to(self, index):
+        """滚动使第 index 行位于顶部"""
+        total = self.total_height()
+        if total > 0 and 0 <= index < self.count:
+            self.canvas.yview_moveto(self.row_top(index) / total)
+
+    def scroll_units(self, delta):
+        """按行滚动 (delta 为正向下)"""
+        self.canvas.yview_scroll(delta * self.row_height, "units")
+
+    def _refresh_now(self):
+        self._refresh_pending = False
+        if not self.winfo_exists():
+            return
+        height = self.canvas.winfo_height()
+        width = self.canvas.winfo_width()
+        top = self.canvas.canvasy(0)
+        if self.count == 0 or height <= 1:
+            first, last = 0, -1
+        else:
+            first = self.index_at(top)
+            last = self.index_at(top + height)
+
+        # 回收滚出视野的行
+        for index in [i for i in self.visible if i < first or i > last]:
+            self._release(index)
+
+        # 为新进入视野的行取用 (或创建) 行控件
+        for index in range(first, last + 1):
+            if index in self.visible:
+                continue
+            if self.pool:
+                widget, item = self.pool.pop()
+                self.canvas.itemconfigure(item, state="normal")
+            else:
+                widget = self.create_row(self.canvas)
+                item = self.canvas.create_window(0, 0, window=widget, anchor="nw")
+            self.canvas.coords(item, 0, self.row_top(index))
+            self.canvas.itemconfigure(
+                item, width=width, height=self.row_height_of(index)
+            )
+            self.bind_row(widget, index)
+            self.visible[index] = (widget, item)
+
+    def _release(self, index):
+        widget, item = self.visible.pop(index)
+        # 同时移出可视区域：部分Tk版本的窗口项不遵循 hidden 状态
+        self.canvas.itemconfigure(item, state="hidden")
+        self.canvas.coords(item, 0, -10000)
+        self.pool.append((widget, item))
+
+    # --- 事件 ---
+    def _update_scrollregion(self):
+        width = max(self.canvas.winfo_width(), 1)
+        self.canvas.configure(scrollregion=(0, 0, width, self.total_height()))
+
+    def _on_view_changed(self, first, last):
+        self.scrollbar.set(first, last)
+        self.refresh()
+
+    def _on_canvas_configure(self, event):
+        self._update_scrollregion()
+        for _, item in list(self.visible.values()) + self.pool:
+            self.canvas.itemconfigure(item, width=event.width)
+        self.refresh()
+
+    def _on_theme_changed(self, event=None):
+        self.canvas.configure(bg=ModernUI.get_theme_color("bg"))
@@ -0,0 +1,184 @@
+"""Tk 事件循环响应监测：用 root.after 心跳测量事件循环延迟，记录卡顿及其调用栈
+
+心跳回调按固定间隔执行，实际执行时间比预期晚出的部分即为事件循环延迟。
+后台线程在心跳超时期间反复采样 Tk 线程 (主线程) 正在执行的 Python 调用栈，
+卡顿结束后把出现最多的调用栈归因为卡顿来源，写入日志 quizup_stalls.log。
+设置环境变量 QUIZUP_WATCHDOG=0 可关闭。
+"""
+
+import linecache
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque, namedtuple
+
+import metrics
+
+ENV_WATCHDOG = "QUIZUP_WATCHDOG"
+HEARTBEAT_MS = 100  # 心跳间隔
+STALL_THRESHOLD_MS = 250  # 事件循环延迟超过此值记为卡顿
+SAMPLE_INTERVAL = 0.02  # 卡顿期间的调用栈采样间隔 (秒)
+EARLY_SAMPLE = 0.05  # 心跳晚到超过此时间 (秒) 即开始采样
+MAX_SAMPLES = 500  # 单次卡顿最多保留的采样数
+MAX_LOG_BYTES = 1024 * 1024  # 日志超过此大小时轮换为 .1
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_LOG = os.path.join(APP_DIR, "quizup_stalls.log")
+
+Stall = namedtuple("Stall", "started duration_ms samples culprit stack")
+
+
+def is_app_frame(frame):
+    return frame[0].startswith(APP_DIR)
+
+
+def attribute(stack):
+    """返回调用栈的归因描述 "入口 -> 最内层程序函数" (只看本程序的代码)"""
+    app_frames = [
+        f for f in stack if is_app_frame(f) and f[2] not in ("<module>", "mainloop")
+    ]
+    if not app_frames:
+        return "Tk 内部或系统挂起 (没有采样到程序代码)"
+    entry, inner = app_frames[0], app_frames[-1]
+
+    def describe(frame):
+        return f"{frame[2]} ({os.path.basename(frame[0])}:{frame[1]})"
+
+    if entry is inner:
+        return describe(inner)
+    return f"{describe(entry)} -> {describe(inner)}"
+
+
+class Watchdog:
+    """事件循环看门狗 (须在 Tk 线程中创建)"""
+
+    def __init__(
+        self,
+        root,
+        threshold_ms=STALL_THRESHOLD_MS,
+        interval_ms=HEARTBEAT_MS,
+        log_path=DEFAULT_LOG,
+    ):
+        self.root = root
+        self.threshold_ms = threshold_ms
+        self.interval_ms = interval_ms
+        self.log_path = log_path
+        self.tk_thread_id = threading.get_ident()
+        self.stalls = deque(maxlen=50)  # 最近的卡顿记录
+        self.beat_job = None
+        self.expected = 0.0  # 下一次心跳的预期时间 (monotonic)
+
+        # 采样线程与心跳回调共享的数据
+        self.lock = threading.Lock()
+        self.samples = []  # 当前卡顿期间采样到的调用栈
+        self.stall_started = 0.0
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.expected = time.monotonic() + self.interval_ms / 1000
+        self.beat_job = self.root.after(self.interval_ms, self._beat)
+        self.thread = threading.Thread(
+            target=self._sample_loop, name="tk-watchdog", daemon=True
+        )
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.beat_job is not None:
+            try:
+                self.root.after_cancel(self.beat_job)
+            except Exception:
+                pass  # 窗口已销毁
+            self.beat_job = None
+
+    # --- Tk 线程 ---
+    def _beat(self):
+        now = time.monotonic()
+        delay_ms = max(0.0, (now - self.expected) * 1000)
+        metrics.registry.observe("event_loop_delay_ms", delay_ms)
+        if delay_ms >= self.threshold_ms:
+            with self.lock:
+                samples, self.samples = self.samples, []
+                started = self.stall_started or self.expected
+                self.stall_started = 0.0
+            self._record(started, delay_ms, samples)
+        elif self.samples:
+            # 延迟未达到阈值，丢弃期间的采样
+            with self.lock:
+                self.samples = []
+                self.stall_started = 0.0
+        self.expected = now + self.interval_ms / 1000
+        self.beat_job = self.root.after(self.interval_ms, self._beat)
+
+    def _record(self, started, delay_ms, samples):
+        metrics.registry.incr("stalls")
+        if samples:
+            stack, _ = Counter(samples).most_common(1)[0]
+        else:
+            stack = ()
+        stall = Stall(
+            time.time() - (time.monotonic() - started),
+            delay_ms,
+            len(samples),
+            attribute(stack),
+            stack,
+        )
+        self.stalls.append(stall)
+        self._write_log(stall)
+
+    def _write_log(self, stall):
+        lines = [
+            f"[{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(stall.started))}] "
+            f"卡顿 {stall.duration_ms:.0f} ms，采样 {stall.samples} 次，"
+            f"来源: {stall.culprit}"
+        ]
+        for filename, lineno, name in stall.stack:
+            lines.append(f'  File "{filename}", line {lineno}, in {name}')
+            source = linecache.getline(filename, lineno).strip()
+            if source:
+                lines.append(f"    {source}")
+        try:
+            if (
+                os.path.exists(self.log_path)
+                and os.path.getsize(self.log_path) > MAX_LOG_BYTES
+            ):
+                os.replace(self.log_path, self.log_path + ".1")
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n\n")
+        except OSError:
+            pass  # 日志写入失败不影响程序运行
+
+    # --- 采样线程 ---
+    def _sample_loop(self):
+        # 心跳晚到一小段时间即开始采样，使刚超过阈值的卡顿也有足够的采样
+        overdue = min(self.threshold_ms / 1000, EARLY_SAMPLE)
+        while not self.stop_event.wait(SAMPLE_INTERVAL):
+            now = time.monotonic()
+            if now - self.expected < overdue:
+                continue
+            # 心跳晚到：Tk 线程正忙，记录它当前的调用栈
+            frame = sys._current_frames().get(self.tk_thread_id)
+            if frame is None:
+                continue
+            stack = tuple(
+                (f.filename, f.lineno, f.name)
+                for f in traceback.extract_stack(frame, limit=40)
+            )
+            del frame
+            with self.lock:
+                if not self.stall_started:
+                    self.stall_started = self.expected
+                if len(self.samples) < MAX_SAMPLES:
+                    self.samples.append(stack)
+
+
+def start_watchdog(root):
+    """启动看门狗 (环境变量 QUIZUP_WATCHDOG=0 时不启动)，返回 Watchdog 或 None"""
+    if os.environ.get(ENV_WATCHDOG, "").strip() == "0":
+        return None
+    watchdog = Watchdog(root)
+    watchdog.start()
+    return watchdog